@@ -0,0 +1,6 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from .suite import SCENARIOS, Scenario, compare, run_suite
+
+__all__ = ['SCENARIOS', 'Scenario', 'compare', 'run_suite']
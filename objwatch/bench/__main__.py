@@ -0,0 +1,8 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import sys
+
+from .suite import main
+
+sys.exit(main())
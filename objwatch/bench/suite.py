@@ -0,0 +1,282 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import sys
+import json
+import time
+import atexit
+import logging
+import argparse
+import tempfile
+import importlib.util
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .. import wrappers
+from ..config import ObjWatchConfig
+from ..tracer import Tracer
+from ..runtime_info import runtime_info
+from . import workloads
+
+MODULE = workloads.__name__
+
+# Number of calls of the workloads at scale 1
+BASE_CALLS = 5000
+# Relative increase of the overhead over the baseline reported as a regression
+DEFAULT_THRESHOLD = 0.5
+# Untraced runs are this many times longer than traced runs, short runs give noisy times
+UNTRACED_SCALE = 20
+
+
+class Scenario(NamedTuple):
+    """
+    A traced run of a workload.
+
+    Fields:
+        name (str): Name of the scenario, 'feature/workload'.
+        workload (str): Name of the workload, see workloads.WORKLOADS.
+        targets (List[Union[str, ModuleType]]): Targets of the tracer.
+        options (Dict[str, Any]): Other configuration parameters, output_json=True stands for a temporary file
+            and wrappers are given by name.
+        requires (Optional[str]): Module required by the scenario, skipped when it is not installed.
+    """
+
+    name: str
+    workload: str
+    targets: List[Union[str, ModuleType]]
+    options: Dict[str, Any] = {}
+    requires: Optional[str] = None
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario('module/wide', 'wide', [MODULE]),
+    Scenario('module/deep', 'deep', [MODULE]),
+    Scenario('class/methods', 'methods', [f'{MODULE}:Worker']),
+    Scenario('function/wide', 'wide', [f'{MODULE}:leaf()']),
+    Scenario('locals/wide', 'wide', [MODULE], {'with_locals': True}),
+    Scenario('locals/deep', 'deep', [MODULE], {'with_locals': True}),
+    Scenario('globals/globals', 'globals', [f'{MODULE}::COUNTER'], {'with_globals': True}),
+    Scenario('json/wide', 'wide', [MODULE], {'output_json': True}),
+    Scenario('json/deep', 'deep', [MODULE], {'output_json': True}),
+    Scenario('BaseWrapper/methods', 'methods', [MODULE], {'wrapper': 'BaseWrapper'}),
+    Scenario('CPUMemoryWrapper/methods', 'methods', [MODULE], {'wrapper': 'CPUMemoryWrapper'}, 'psutil'),
+    Scenario('NumpyArrayWrapper/methods', 'methods', [MODULE], {'wrapper': 'NumpyArrayWrapper'}, 'numpy'),
+    Scenario('TensorShapeWrapper/methods', 'methods', [MODULE], {'wrapper': 'TensorShapeWrapper'}, 'torch'),
+    Scenario('TorchMemoryWrapper/methods', 'methods', [MODULE], {'wrapper': 'TorchMemoryWrapper'}, 'torch'),
+]
+
+
+@contextmanager
+def quiet_logger(name: str = 'objwatch') -> Iterator[None]:
+    """
+    Send the log lines to os.devnull while the benchmarks run, so that their formatting and writing
+    is measured without flooding the terminal.
+    """
+    logger = logging.getLogger(name)
+    handlers, level, propagate = logger.handlers[:], logger.level, logger.propagate
+    null_handler = logging.FileHandler(os.devnull)
+    null_handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.handlers = [null_handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    try:
+        yield
+    finally:
+        null_handler.close()
+        logger.handlers = handlers
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+def count_events(workload: Callable[[int], Any], calls: int) -> Tuple[int, int]:
+    """
+    Count the call and line events of a run of a workload.
+
+    Returns:
+        Tuple[int, int]: Number of calls and of executed lines.
+    """
+    counts = [0, 0]
+
+    def counter(frame, event, arg):
+        if frame.f_code.co_filename != workloads.__file__:
+            return None
+        if event == 'call':
+            counts[0] += 1
+        elif event == 'line':
+            counts[1] += 1
+        return counter
+
+    sys.settrace(counter)
+    try:
+        workload(calls)
+    finally:
+        sys.settrace(None)
+    return counts[0], counts[1]
+
+
+def time_untraced(workload: Callable[[int], Any], calls: int, repeat: int) -> float:
+    """
+    Best time in seconds of `repeat` untraced runs of a workload, measured over runs
+    `UNTRACED_SCALE` times longer.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload(calls * UNTRACED_SCALE)
+        best = min(best, time.perf_counter() - start)
+    return best / UNTRACED_SCALE
+
+
+def time_traced(scenario: Scenario, calls: int, repeat: int, directory: str) -> float:
+    """
+    Best time in seconds of `repeat` runs of the workload of a scenario under a new tracer.
+    Starting and stopping the tracer, which writes the outputs, is not included.
+    """
+    workload = workloads.WORKLOADS[scenario.workload]
+    options = dict(scenario.options)
+    if options.get('output_json'):
+        options['output_json'] = os.path.join(directory, 'trace.json')
+    if 'wrapper' in options:
+        options['wrapper'] = getattr(wrappers, options['wrapper'])
+    best = float('inf')
+    for _ in range(repeat):
+        tracer = Tracer(ObjWatchConfig(targets=scenario.targets, **options))
+        tracer.start()
+        try:
+            start = time.perf_counter()
+            workload(calls)
+            elapsed = time.perf_counter() - start
+        finally:
+            tracer.stop()
+            # The JSON output is saved, do not keep the events of every run until exit
+            atexit.unregister(tracer.event_handlers.save_json)
+        best = min(best, elapsed)
+    return best
+
+
+def run_suite(scale: float = 1.0, repeat: int = 3, select: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Run the benchmark scenarios.
+
+    Args:
+        scale (float): Scale of the workloads, 1 runs about 5000 calls per workload.
+        repeat (int): Number of runs of each scenario, the best one is reported.
+        select (Optional[Sequence[str]]): Prefixes of the names of the scenarios to run, all by default.
+
+    Returns:
+        Dict[str, Any]: The report, with the results of the scenarios by name. The overhead of a scenario
+        is its traced time divided by the untraced time of its workload.
+    """
+    calls = max(int(BASE_CALLS * scale), 1)
+    report: Dict[str, Any] = {
+        'version': runtime_info.version,
+        'python': runtime_info.python_version,
+        'system': runtime_info.system_info,
+        'scale': scale,
+        'repeat': repeat,
+        'results': {},
+    }
+    untraced: Dict[str, Tuple[int, int, float]] = {}
+    with quiet_logger(), tempfile.TemporaryDirectory() as directory:
+        for scenario in SCENARIOS:
+            if select and not any(scenario.name.startswith(prefix) for prefix in select):
+                continue
+            if scenario.requires and importlib.util.find_spec(scenario.requires) is None:
+                report['results'][scenario.name] = {'skipped': f"{scenario.requires} is not installed"}
+                continue
+            if scenario.workload not in untraced:
+                workload = workloads.WORKLOADS[scenario.workload]
+                call_count, line_count = count_events(workload, calls)
+                untraced_s = time_untraced(workload, calls, repeat)
+                untraced[scenario.workload] = (call_count, line_count, untraced_s)
+            call_count, line_count, untraced_s = untraced[scenario.workload]
+            traced_s = time_traced(scenario, calls, repeat, directory)
+            report['results'][scenario.name] = {
+                'workload': scenario.workload,
+                'calls': call_count,
+                'lines': line_count,
+                'untraced_s': untraced_s,
+                'traced_s': traced_s,
+                'untraced_calls_per_s': call_count / untraced_s,
+                'untraced_lines_per_s': line_count / untraced_s,
+                'calls_per_s': call_count / traced_s,
+                'lines_per_s': line_count / traced_s,
+                'overhead': traced_s / untraced_s,
+            }
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Compare the overheads of a report with those of a baseline report. Overheads are relative to
+    the untraced runs on the same machine, so reports of different machines remain comparable.
+
+    Args:
+        report (Dict[str, Any]): The report of run_suite.
+        baseline (Dict[str, Any]): The baseline report.
+        threshold (float): Relative increase of the overhead reported as a regression.
+
+    Returns:
+        List[str]: A description of each regression, empty if there is none.
+    """
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if 'overhead' not in result or not base or 'overhead' not in base:
+            continue
+        if result['overhead'] > base['overhead'] * (1 + threshold):
+            regressions.append(f"{name}: overhead {result['overhead']:.1f}x, baseline {base['overhead']:.1f}x")
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Format the results of a report as a table.
+    """
+    lines = [f"{'scenario':<28} {'calls/s':>12} {'lines/s':>12} {'untraced calls/s':>17} {'overhead':>9}"]
+    for name, result in report['results'].items():
+        if 'skipped' in result:
+            lines.append(f"{name:<28} skipped, {result['skipped']}")
+            continue
+        lines.append(
+            f"{name:<28} {result['calls_per_s']:>12.0f} {result['lines_per_s']:>12.0f} "
+            f"{result['untraced_calls_per_s']:>17.0f} {result['overhead']:>8.1f}x"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the benchmark suite from the command line, print the results and compare them with a baseline.
+
+    Returns:
+        int: 1 if a regression was found, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Measure the tracing overhead of ObjWatch')
+    parser.add_argument('-s', '--scale', type=float, default=1.0, help='Scale of the workloads, defaults to 1')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs of each scenario, the best is reported')
+    parser.add_argument('-k', '--select', nargs='+', help='Prefixes of the names of the scenarios to run')
+    parser.add_argument('-o', '--output', help='Path of the JSON report to write')
+    parser.add_argument('-b', '--baseline', help='Path of a baseline JSON report to compare with')
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=DEFAULT_THRESHOLD, help='Relative overhead increase failing the run'
+    )
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.scale, args.repeat, args.select)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+        print(f"No regression over {args.baseline}.")
+    return 0
@@ -0,0 +1,92 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+"""
+Workloads traced by the benchmark suite. They live in a module of their own, so that targets
+naming this module, its class or its functions cover the workloads and nothing else.
+"""
+
+COUNTER = 0
+
+
+def leaf(value):
+    result = value + 1
+    return result
+
+
+def wide(calls):
+    """
+    Call tree of a single level: `calls` calls of a leaf function.
+    """
+    total = 0
+    for _ in range(calls):
+        total = leaf(total)
+    return total
+
+
+def chain(depth):
+    if depth == 0:
+        return 0
+    return chain(depth - 1) + 1
+
+
+def deep(calls, depth=100):
+    """
+    Call trees of `depth` nested calls, about `calls` calls in total.
+    """
+    total = 0
+    for _ in range(max(calls // depth, 1)):
+        total += chain(depth - 1)
+    return total
+
+
+def bump():
+    global COUNTER
+    COUNTER += 1
+    return COUNTER
+
+
+def globals_updates(calls):
+    """
+    `calls` calls each updating a module global.
+    """
+    for _ in range(calls):
+        bump()
+    return COUNTER
+
+
+class Worker:
+    """
+    Object whose methods update a number attribute and a bounded list attribute.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.history = []
+
+    def step(self, value):
+        self.total += value
+        self.history.append(value)
+        if len(self.history) > 8:
+            self.history.pop(0)
+        return self.total
+
+    def run(self, calls):
+        for i in range(calls):
+            self.step(i)
+        return self.total
+
+
+def methods(calls):
+    """
+    `calls` method calls on one object.
+    """
+    return Worker().run(calls)
+
+
+WORKLOADS = {
+    'wide': wide,
+    'deep': deep,
+    'globals': globals_updates,
+    'methods': methods,
+}
@@ -0,0 +1,227 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import time
+import secrets
+import heapq
+import itertools
+import queue
+import marshal
+import argparse
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client, Connection, wait
+from typing import Optional, List, Dict, Deque, Set, Tuple, Any, TextIO
+
+from .constants import Constants
+from .events import EventRecord
+from .utils.logger import log_info, log_error, log_warn
+from .utils.util import collector_authkey
+
+
+class TraceCollector:
+    """
+    Central collector receiving event batches from traced processes over a local socket.
+
+    Every connected process sends time-ordered batches of event records (see CollectorSink).
+    The collector merges the per-process streams by timestamp and writes them as a single
+    log in the multi-process log structure, with each line tagged by the index of its process.
+
+    The merge is a k-way merge over the pending records of each connection. A record is only
+    written once every open connection has a later record pending, or once it has been held
+    back for longer than `max_delay_ns`, so that an idle process cannot stall the output.
+
+    Connections must authenticate with a shared secret, so that other local processes cannot
+    feed data to the collector.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        output: str,
+        max_delay_ns: int = Constants.COLLECTOR_MAX_DELAY_NS,
+        authkey: Optional[bytes] = None,
+    ) -> None:
+        """
+        Initialize the collector.
+
+        Args:
+            address (str): Address of the Unix domain socket to listen on.
+            output (str): File path for the merged log, must end with '.objwatch'.
+            max_delay_ns (int): Maximum time a record is held back waiting for other processes.
+            authkey (Optional[bytes]): Secret the traced processes authenticate with, defaults to
+                collector_authkey(), which processes started from this one share.
+        """
+        if not output.endswith('.objwatch'):
+            raise ValueError("output file must end with '.objwatch' for ObjWatch Log Viewer extension")
+        self.address = address
+        self.output = output
+        self.max_delay_ns = max_delay_ns
+        self.authkey: bytes = collector_authkey() if authkey is None else authkey
+        self.process: Optional[multiprocessing.Process] = None
+        # Pending packed records per connection, and a heap of (timestamp, connection) heads
+        self.pending: Dict[int, Deque[Tuple[Any, ...]]] = {}
+        self.heads: List[Tuple[int, int]] = []
+        # Number of open connections without pending records
+        self.starved: int = 0
+
+    def start(self) -> None:
+        """
+        Start serving in a background process and wait until the socket accepts connections.
+        """
+        self.process = multiprocessing.Process(target=self.serve, name='objwatch-collector')
+        self.process.start()
+        while not os.path.exists(self.address):
+            if not self.process.is_alive():
+                raise RuntimeError(f"Trace collector exited before listening on {self.address}")
+            time.sleep(0.01)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Ask the collector to shut down once all connected processes have disconnected,
+        and wait for it to write the remaining records.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait for the collector.
+        """
+        conn = Client(self.address, authkey=self.authkey)
+        conn.send_bytes(marshal.dumps(None))
+        conn.close()
+        if self.process is not None:
+            self.process.join(timeout)
+
+    def serve(self) -> None:
+        """
+        Accept connections and merge their event batches into the output log until shut down.
+        """
+        listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        accepted: 'queue.Queue[Connection]' = queue.Queue()
+        accept_thread = threading.Thread(target=self._accept, args=(listener, accepted), daemon=True)
+        accept_thread.start()
+        log_info(f"Trace collector listening on {self.address}")
+
+        connections: Dict[Connection, int] = {}
+        conn_ids = itertools.count()
+        shutting_down = False
+
+        with open(self.output, 'w', encoding='utf-8') as f:
+            while not (shutting_down and not connections):
+                while not accepted.empty():
+                    conn_id = next(conn_ids)
+                    connections[accepted.get()] = conn_id
+                    self.pending[conn_id] = deque()
+                    self.starved += 1
+
+                if not connections:
+                    time.sleep(0.05)
+                ready: List[Any] = wait(list(connections), timeout=0.05) if connections else []
+                for conn in ready:
+                    conn_id = connections[conn]
+                    try:
+                        batch = marshal.loads(conn.recv_bytes())
+                    except (EOFError, OSError):
+                        del connections[conn]
+                        conn.close()
+                        if not self.pending[conn_id]:
+                            self.starved -= 1
+                            del self.pending[conn_id]
+                        continue
+                    if batch is None:
+                        # Shutdown request, sent by stop() over its own connection
+                        shutting_down = True
+                        continue
+                    self._receive(conn_id, batch)
+
+                self._merge(f, time.time_ns() - self.max_delay_ns, set(connections.values()))
+            self._merge(f, None, set())
+
+        listener.close()
+        log_info(f"Trace collector saved merged log to {self.output}")
+
+    @staticmethod
+    def _accept(listener: Listener, accepted: 'queue.Queue[Connection]') -> None:
+        """
+        Accept incoming connections and hand them to the serving loop.
+
+        Args:
+            listener (Listener): The listening socket.
+            accepted (queue.Queue): Queue of accepted connections.
+        """
+        while True:
+            try:
+                accepted.put(listener.accept())
+            except (AuthenticationError, EOFError) as e:
+                log_warn(f"Trace collector rejected a connection: {e!r}")
+            except OSError:
+                return
+
+    def _receive(self, conn_id: int, batch: List[Tuple[Any, ...]]) -> None:
+        """
+        Queue a received batch behind the pending records of its connection.
+
+        Args:
+            conn_id (int): Identifier of the sending connection.
+            batch (List[Tuple[Any, ...]]): Packed event records in time order.
+        """
+        if not batch:
+            return
+        pending = self.pending[conn_id]
+        if not pending:
+            self.starved -= 1
+            heapq.heappush(self.heads, (batch[0][0], conn_id))
+        pending.extend(batch)
+
+    def _merge(self, f: TextIO, deadline: Optional[int], open_ids: Set[int]) -> None:
+        """
+        Write pending records in timestamp order as far as the merge allows.
+
+        Args:
+            f (TextIO): The output log file.
+            deadline (Optional[int]): Records older than this timestamp are written even if
+                some connection has nothing pending. None writes out everything.
+            open_ids (Set[int]): Identifiers of the open connections.
+        """
+        while self.heads:
+            timestamp, conn_id = self.heads[0]
+            if deadline is not None and self.starved > 0 and timestamp > deadline:
+                break
+            heapq.heappop(self.heads)
+            pending = self.pending[conn_id]
+            f.write(EventRecord.unpack(pending.popleft()).log_line() + '\n')
+            if pending:
+                heapq.heappush(self.heads, (pending[0][0], conn_id))
+            elif conn_id in open_ids:
+                self.starved += 1
+            else:
+                del self.pending[conn_id]
+
+
+def main() -> None:
+    """
+    Run a trace collector from the command line until it is interrupted.
+    """
+    parser = argparse.ArgumentParser(description='Collect and merge ObjWatch events from multiple processes')
+    parser.add_argument('-a', '--address', required=True, help='Path of the Unix domain socket to listen on')
+    parser.add_argument('-o', '--output', required=True, help='Path to the merged .objwatch log file')
+    args = parser.parse_args()
+
+    if not os.environ.get(Constants.COLLECTOR_AUTHKEY_ENV):
+        # The traced processes are not started from here, they need the secret from the environment
+        os.environ[Constants.COLLECTOR_AUTHKEY_ENV] = secrets.token_hex(16)
+        log_info(
+            f"Set {Constants.COLLECTOR_AUTHKEY_ENV}={os.environ[Constants.COLLECTOR_AUTHKEY_ENV]} "
+            "in the environment of the traced processes"
+        )
+
+    collector = TraceCollector(args.address, args.output)
+    try:
+        collector.serve()
+    except KeyboardInterrupt:
+        log_error("Trace collector interrupted.")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,9 @@ from types import ModuleType
 from dataclasses import dataclass
 from typing import Optional, Union, List, Dict, Any
 
+from .constants import Constants
+from .trigger import Trigger
+
 
 @dataclass(frozen=True)
 class ObjWatchConfig:
@@ -24,6 +27,42 @@ class ObjWatchConfig:
         wrapper (Optional[ABCWrapper]): Custom wrapper to extend tracing and logging functionality.
         framework (Optional[str]): The multi-process framework module to use.
         indexes (Optional[List[int]]): The indexes to track in a multi-process environment.
+        fork_safe (bool): Reset tracing state in forked child processes and write their outputs to per-process files.
+        collector (Optional[str]): Address of a trace collector socket to send events to instead of the logger.
+        with_timestamps (bool): Record wall-clock timestamps of events in the JSON output, used to merge per-process traces.
+        mode (Optional[str]): Tracing mode, 'flight_recorder' keeps only the most recent events in memory
+            and writes them out on an uncaught exception, a termination signal or request.
+        flight_recorder_size (int): Number of most recent events kept in 'flight_recorder' mode.
+        ring_buffer (Optional[str]): Path of a memory-mapped ring buffer file to write events to instead of the logger,
+            drained by an external reader.
+        ring_buffer_size (int): Size in bytes of the ring buffer.
+        chrome_trace (Optional[str]): JSON file path for streaming events in the Chrome Trace Event format.
+        output_sqlite (Optional[str]): SQLite database path for storing events for ad-hoc queries.
+        output_index (bool): Write a sidecar index of the function calls next to the `output` log, for random access.
+        fold_loops (bool): Fold consecutive repeated call subtrees in the log and sink outputs into one template,
+            a repeat count and the last repeat.
+        fold_window (int): Maximum number of events of a call subtree that is folded.
+        coalesce_updates (bool): Coalesce the updates of each variable within a call into one summary with the count,
+            the first old value, the last new value and the range of numeric values.
+        coalesce_buffer_size (int): Number of updates buffered within a call before their summaries are written.
+        max_depth (Optional[int]): Maximum nesting depth of traced calls, 1 traces only the outermost calls.
+            Deeper calls are not traced, their number is logged with the end of the enclosing call.
+        max_subtree_depth (Optional[Dict[str, int]]): Maximum depth traced below calls of functions, by qualified
+            name, e.g. {'pkg.module.Class.method': 2}. 0 traces the calls but none of their callees.
+        trigger (Optional[Trigger]): Start tracing only when the trigger fires, and stop after the window
+            of calls it configures.
+        control_socket (Optional[str]): Path of a Unix domain socket accepting commands to start, stop and flush
+            tracing from outside the process. SIGUSR1 and SIGUSR2 are then used by the control channel.
+        control_file (Optional[str]): Path of a file whose commands are executed when the process receives SIGUSR1.
+        max_elements (int): Maximum number of elements of a sequence displayed in logged values.
+        max_chars (Optional[int]): Characters after which no more elements of a sequence are displayed, and strings
+            within sequences are cut. None for no limit.
+        max_nesting (int): Levels of nested sequences displayed in logged values, 1 summarizes nested sequences
+            by their length.
+        detect_buffer_changes (bool): Detect in-place modifications of buffers, e.g. bytearrays and numpy arrays,
+            from a fingerprint of their memory, and log them as updates.
+        self_profile (bool): Measure the time ObjWatch spends in each stage of event processing, e.g. target
+            matching, change detection, formatting, logging and JSON building, logged and returned by stop().
     """
 
     targets: List[Union[str, ModuleType]]
@@ -37,6 +76,30 @@ class ObjWatchConfig:
     wrapper: Optional[Any] = None
     framework: Optional[str] = None
     indexes: Optional[List[int]] = None
+    fork_safe: bool = False
+    collector: Optional[str] = None
+    with_timestamps: bool = False
+    mode: Optional[str] = None
+    flight_recorder_size: int = Constants.FLIGHT_RECORDER_SIZE
+    ring_buffer: Optional[str] = None
+    ring_buffer_size: int = Constants.RING_BUFFER_SIZE
+    chrome_trace: Optional[str] = None
+    output_sqlite: Optional[str] = None
+    output_index: bool = False
+    fold_loops: bool = False
+    fold_window: int = Constants.FOLD_WINDOW
+    coalesce_updates: bool = False
+    coalesce_buffer_size: int = Constants.COALESCE_BUFFER_SIZE
+    max_depth: Optional[int] = None
+    max_subtree_depth: Optional[Dict[str, int]] = None
+    trigger: Optional[Trigger] = None
+    control_socket: Optional[str] = None
+    control_file: Optional[str] = None
+    max_elements: int = Constants.MAX_SEQUENCE_ELEMENTS
+    max_chars: Optional[int] = Constants.MAX_FORMAT_CHARS
+    max_nesting: int = Constants.MAX_FORMAT_NESTING
+    detect_buffer_changes: bool = False
+    self_profile: bool = False
 
     def __post_init__(self) -> None:
         """
@@ -51,9 +114,64 @@ class ObjWatchConfig:
         if self.output is not None and not self.output.endswith('.objwatch'):
             raise ValueError("output file must end with '.objwatch' for ObjWatch Log Viewer extension")
 
+        if self.output_index and self.output is None:
+            raise ValueError("output_index requires output to be specified")
+
         if self.output_json is not None and not self.output_json.endswith('.json'):
             raise ValueError("output_json file must end with '.json'")
 
+        if self.chrome_trace is not None and not self.chrome_trace.endswith('.json'):
+            raise ValueError("chrome_trace file must end with '.json'")
+
+        if self.mode not in (None, 'flight_recorder'):
+            raise ValueError(f"Invalid mode: {self.mode}")
+
+        if self.mode == 'flight_recorder':
+            outputs = {
+                'output_json': self.output_json,
+                'collector': self.collector,
+                'ring_buffer': self.ring_buffer,
+                'chrome_trace': self.chrome_trace,
+                'output_sqlite': self.output_sqlite,
+            }
+            for option, value in outputs.items():
+                if value is not None:
+                    raise ValueError(f"{option} cannot be specified in 'flight_recorder' mode")
+            if self.flight_recorder_size <= 0:
+                raise ValueError("flight_recorder_size must be positive")
+
+        if self.ring_buffer is not None and self.ring_buffer_size <= 0:
+            raise ValueError("ring_buffer_size must be positive")
+
+        if self.fold_loops and self.fold_window <= 0:
+            raise ValueError("fold_window must be positive")
+
+        if self.coalesce_updates and self.coalesce_buffer_size <= 0:
+            raise ValueError("coalesce_buffer_size must be positive")
+
+        self._validate_depth_limits()
+        self._validate_format_limits()
+
+    def _validate_depth_limits(self) -> None:
+        """
+        Validate the call depth limits
+        """
+        if self.max_depth is not None and self.max_depth <= 0:
+            raise ValueError("max_depth must be positive")
+
+        for name, depth in (self.max_subtree_depth or {}).items():
+            if depth < 0:
+                raise ValueError(f"max_subtree_depth of {name} cannot be negative")
+
+    def _validate_format_limits(self) -> None:
+        """
+        Validate the bounds of the formatting of logged values
+        """
+        for option in ('max_elements', 'max_chars', 'max_nesting'):
+            value = getattr(self, option)
+            if value is not None and value <= 0:
+                raise ValueError(f"{option} must be positive")
+
     def __str__(self) -> str:
         """
         Return a simple string representation of the configuration.
@@ -92,6 +210,8 @@ class ObjWatchConfig:
             elif field_name == 'level' and isinstance(field_value, int):
                 # For level field, include both numeric value and name
                 result[field_name] = logging.getLevelName(field_value)
+            elif isinstance(field_value, Trigger):
+                result[field_name] = str(field_value)
             else:
                 # For other types, add as is
                 result[field_name] = field_value
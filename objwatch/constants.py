@@ -20,10 +20,55 @@ class Constants:
 
     # Sequence formatting related constants
     MAX_SEQUENCE_ELEMENTS = 3  # Maximum number of elements to display when formatting sequences
+    MAX_FORMAT_CHARS = None  # Characters after which no more elements of a sequence are displayed, None for no limit
+    MAX_FORMAT_NESTING = 1  # Levels of nested sequences displayed, deeper ones are summarized by their length
+
+    # Array summary related constants
+    ARRAY_STATS_THRESHOLD = 1000000  # Maximum number of elements of an array whose statistics use all elements
+    ARRAY_SAMPLE_SIZE = 10000  # Number of elements sampled from larger arrays for their statistics
+
+    # Buffer change detection related constants
+    BUFFER_HASH_LIMIT = 65536  # Maximum size in bytes of the buffers hashed in full
+    BUFFER_SAMPLE_BLOCKS = 64  # Number of blocks hashed for larger buffers
+    BUFFER_BLOCK_SIZE = 256  # Size in bytes of the blocks hashed for larger buffers
+
+    # Object tracking related constants
+    MAX_UNREFERENCEABLE_OBJECTS = 4096  # Maximum number of tracked objects that do not support weak references
+    FUNCTION_INFO_CACHE_SIZE = 65536  # Maximum number of functions whose names are kept for their run and end events
 
     # Logging related constants
     LOG_INDENT_LEVEL = 2  # Default indentation level for JSON serialization
 
+    # Trace collector related constants
+    COLLECTOR_BATCH_SIZE = 1024  # Number of event records sent to the collector in one batch
+    COLLECTOR_FLUSH_INTERVAL_NS = 500_000_000  # Maximum age of a buffered record before its batch is sent
+    COLLECTOR_MAX_DELAY_NS = 2_000_000_000  # Maximum time the collector holds a record back while merging
+    COLLECTOR_AUTHKEY_ENV = 'OBJWATCH_COLLECTOR_AUTHKEY'  # Environment variable with the secret of the collector
+
+    # JSON streaming related constants
+    JSON_STREAM_CHUNK_SIZE = 65536  # Number of characters read from a JSON trace at a time
+
+    # Flight recorder related constants
+    FLIGHT_RECORDER_SIZE = 10000  # Number of most recent events kept by the flight recorder
+
+    # Ring buffer related constants
+    RING_BUFFER_SIZE = 64 * 1024 * 1024  # Size in bytes of the ring buffer drained by an external reader
+
+    # SQLite output related constants
+    SQLITE_BATCH_SIZE = 10000  # Number of rows inserted into the SQLite database in one transaction
+
+    # Loop folding related constants
+    FOLD_WINDOW = 1000  # Maximum number of events of a call subtree folded with its repeats
+
+    # Update coalescing related constants
+    COALESCE_BUFFER_SIZE = 10000  # Number of updates buffered within a call before their summaries are written
+
+    # Log index related constants
+    LOG_INDEX_BATCH_SIZE = 4096  # Number of call entries buffered before they are written to the log index
+
+    # Control channel related constants
+    CONTROL_TIMEOUT = 10.0  # Seconds a socket command waits for the main thread to execute it
+
     # Log element types
     # Define types that are directly loggable
     LOG_ELEMENT_TYPES = (
@@ -0,0 +1,254 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import sys
+import queue
+import atexit
+import signal
+import socket
+import argparse
+import threading
+from types import FrameType
+from typing import Any, Dict, Optional
+
+from .constants import Constants
+from .utils.logger import log_info, log_error
+
+
+class ControlRequest:
+    """
+    A socket command handed over to the main thread. It is executed by the main thread or dropped
+    by the thread waiting for it on timeout, whichever claims it first, so it never runs unawaited.
+    """
+
+    __slots__ = ('command', 'reply', 'done', 'claimed')
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.reply: str = ''
+        self.done = threading.Event()
+        self.claimed = threading.Lock()
+
+    def claim(self) -> bool:
+        """
+        Claim the request, to execute it or to drop it.
+
+        Returns:
+            bool: True if the request was not claimed before.
+        """
+        return self.claimed.acquire(blocking=False)
+
+
+class ControlChannel:
+    """
+    Opt-in control channel to drive a pre-constructed ObjWatch from outside the process, e.g. in a
+    long-running service where tracing stays disengaged, without any trace function installed, until needed.
+
+    Commands are read line by line from a Unix domain socket, or from a command file when the process
+    receives SIGUSR1. SIGUSR2 toggles tracing. Since the trace function only applies to the thread
+    installing it, socket commands are handed over to the main thread through SIGUSR1 and executed there.
+    The socket is only accessible to the user running the process.
+
+    Commands:
+        start: Start tracing, or resume it after stop.
+        stop: Pause tracing, the outputs stay open.
+        toggle: Stop tracing if it is running, start it otherwise.
+        flush: Write out buffered events and a snapshot of the JSON output.
+        add <target> ...: Add monitoring targets, in the syntax of `targets`.
+        remove <target> ...: Remove monitoring targets.
+        status: Report the tracing status.
+    """
+
+    def __init__(self, obj_watch: Any, socket_path: Optional[str] = None, command_file: Optional[str] = None) -> None:
+        """
+        Install the signal handlers and start listening on the socket.
+
+        Args:
+            obj_watch (ObjWatch): The ObjWatch instance to control.
+            socket_path (Optional[str]): Path of the Unix domain socket to listen on.
+            command_file (Optional[str]): Path of the file whose commands are executed on SIGUSR1.
+        """
+        if not hasattr(signal, 'SIGUSR1') or not hasattr(signal, 'pthread_kill'):
+            raise ValueError("The control channel requires POSIX signals")
+        if threading.current_thread() is not threading.main_thread():
+            raise ValueError("The control channel must be created in the main thread")
+
+        self.obj_watch = obj_watch
+        self.socket_path = socket_path
+        self.command_file = command_file
+        # Socket commands waiting for the main thread
+        self.requests: 'queue.SimpleQueue[ControlRequest]' = queue.SimpleQueue()
+        self.previous_handlers: Dict[int, Any] = {
+            signum: signal.signal(signum, self._signal_handler) for signum in (signal.SIGUSR1, signal.SIGUSR2)
+        }
+
+        self.server: Optional[socket.socket] = None
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(socket_path)
+            # Other users must not control tracing, connections are refused until the socket listens
+            os.chmod(socket_path, 0o600)
+            self.server.listen()
+            threading.Thread(target=self._serve, name='objwatch-control', daemon=True).start()
+            log_info(f"ObjWatch control channel listening on {socket_path}.")
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """
+        Stop listening and restore the previous signal handlers.
+        """
+        server, self.server = self.server, None
+        if server is not None:
+            try:
+                # Wake up the thread blocked in accept
+                server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            server.close()
+            if self.socket_path is not None and os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        if self.previous_handlers and threading.current_thread() is threading.main_thread():
+            for signum, handler in self.previous_handlers.items():
+                signal.signal(signum, handler)
+            self.previous_handlers = {}
+
+    def status(self) -> str:
+        """
+        Get the tracing status: 'idle' before tracing first started, then 'tracing' or 'paused'.
+        """
+        tracer = self.obj_watch.tracer
+        if not tracer.is_started:
+            return 'idle'
+        return 'tracing' if tracer.is_tracing else 'paused'
+
+    def execute(self, command: str) -> str:
+        """
+        Execute a command in the current thread, which must be the traced one.
+
+        Args:
+            command (str): The command line.
+
+        Returns:
+            str: 'ok <status>', or 'error <message>' if the command failed.
+        """
+        name, *args = command.split() or ['']
+        if name == 'toggle':
+            name = 'stop' if self.obj_watch.tracer.is_tracing else 'start'
+        try:
+            if name == 'start':
+                self.obj_watch.resume()
+            elif name == 'stop':
+                self.obj_watch.pause()
+            elif name == 'flush':
+                self.obj_watch.flush()
+            elif name == 'add':
+                self.obj_watch.add_targets(args)
+            elif name == 'remove':
+                self.obj_watch.remove_targets(args)
+            elif name != 'status':
+                return f"error unknown command: {command.strip()}"
+        except Exception as e:
+            log_error(f"Control command '{command.strip()}' failed: {e}")
+            return f"error {e}"
+        return f"ok {self.status()}"
+
+    def _signal_handler(self, signum: int, frame: Optional[FrameType]) -> None:
+        """
+        Execute the pending socket commands, the command file, or toggle tracing on SIGUSR2.
+        """
+        if signum == signal.SIGUSR2:
+            self.execute('toggle')
+            return
+        handled = False
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            handled = True
+            # Requests that timed out were dropped by their senders
+            if request.claim():
+                request.reply = self.execute(request.command)
+                request.done.set()
+        if not handled and self.command_file is not None:
+            try:
+                with open(self.command_file, encoding='utf-8') as f:
+                    commands = [line for line in f if line.strip()]
+            except OSError as e:
+                log_error(f"Cannot read control commands from {self.command_file}: {e}")
+                return
+            for command in commands:
+                self.execute(command)
+
+    def _serve(self) -> None:
+        """
+        Accept connections and answer each command line with its result, until the channel is closed.
+        """
+        server = self.server
+        if server is None:
+            return
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            with connection, connection.makefile('rw', encoding='utf-8') as stream:
+                for line in stream:
+                    if line.strip():
+                        stream.write(self._request(line.strip()) + '\n')
+                        stream.flush()
+
+    def _request(self, command: str) -> str:
+        """
+        Hand a command over to the main thread and wait for its result.
+        """
+        request = ControlRequest(command)
+        self.requests.put(request)
+        signal.pthread_kill(threading.main_thread().ident or 0, signal.SIGUSR1)
+        if not request.done.wait(Constants.CONTROL_TIMEOUT):
+            if request.claim():
+                return "error the main thread did not handle the command in time, it was dropped"
+            # The main thread started executing it meanwhile
+            request.done.wait()
+        return request.reply
+
+
+def send_command(socket_path: str, command: str) -> str:
+    """
+    Send a command to the control channel of a running process.
+
+    Args:
+        socket_path (str): Path of the Unix domain socket of the process.
+        command (str): The command line.
+
+    Returns:
+        str: The reply of the process.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        with client.makefile('rw', encoding='utf-8') as stream:
+            stream.write(command + '\n')
+            stream.flush()
+            return stream.readline().strip()
+
+
+def main() -> None:
+    """
+    Send a control command from the command line and print the reply.
+    """
+    parser = argparse.ArgumentParser(description='Control a running ObjWatch through its control socket')
+    parser.add_argument('socket', help='Path of the control socket')
+    parser.add_argument('command', nargs='+', help='start, stop, toggle, flush, status, add <target>..., remove <target>...')
+    args = parser.parse_args()
+
+    reply = send_command(args.socket, ' '.join(args.command))
+    print(reply)
+    if reply.startswith('error'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,13 @@
 
 import logging
 from types import ModuleType
-from typing import Optional, Union, List, Any
+from typing import Optional, Union, List, Dict, Any
 
 from .config import ObjWatchConfig
+from .constants import Constants
 from .tracer import Tracer
+from .trigger import Trigger
+from .control import ControlChannel
 from .wrappers import ABCWrapper
 from .utils.logger import create_logger, log_info
 from .runtime_info import runtime_info
@@ -30,6 +33,30 @@ class ObjWatch:
         wrapper: Optional[ABCWrapper] = None,
         framework: Optional[str] = None,
         indexes: Optional[List[int]] = None,
+        fork_safe: bool = False,
+        collector: Optional[str] = None,
+        with_timestamps: bool = False,
+        mode: Optional[str] = None,
+        flight_recorder_size: int = Constants.FLIGHT_RECORDER_SIZE,
+        ring_buffer: Optional[str] = None,
+        ring_buffer_size: int = Constants.RING_BUFFER_SIZE,
+        chrome_trace: Optional[str] = None,
+        output_sqlite: Optional[str] = None,
+        output_index: bool = False,
+        fold_loops: bool = False,
+        fold_window: int = Constants.FOLD_WINDOW,
+        coalesce_updates: bool = False,
+        coalesce_buffer_size: int = Constants.COALESCE_BUFFER_SIZE,
+        max_depth: Optional[int] = None,
+        max_subtree_depth: Optional[Dict[str, int]] = None,
+        trigger: Optional[Trigger] = None,
+        control_socket: Optional[str] = None,
+        control_file: Optional[str] = None,
+        max_elements: int = Constants.MAX_SEQUENCE_ELEMENTS,
+        max_chars: Optional[int] = Constants.MAX_FORMAT_CHARS,
+        max_nesting: int = Constants.MAX_FORMAT_NESTING,
+        detect_buffer_changes: bool = False,
+        self_profile: bool = False,
     ) -> None:
         """
         Initialize the ObjWatch instance with configuration parameters.
@@ -46,16 +73,45 @@ class ObjWatch:
             wrapper (Optional[ABCWrapper]): Custom wrapper to extend tracing and logging functionality.
             framework (Optional[str]): The multi-process framework module to use.
             indexes (Optional[List[int]]): The indexes to track in a multi-process environment.
+            fork_safe (bool): Reset tracing state in forked child processes and write their outputs to per-process files.
+            collector (Optional[str]): Address of a trace collector socket to send events to instead of the logger.
+            with_timestamps (bool): Record wall-clock timestamps of events in the JSON output.
+            mode (Optional[str]): Tracing mode, 'flight_recorder' keeps only the most recent events in memory.
+            flight_recorder_size (int): Number of most recent events kept in 'flight_recorder' mode.
+            ring_buffer (Optional[str]): Path of a memory-mapped ring buffer file to write events to instead of the logger.
+            ring_buffer_size (int): Size in bytes of the ring buffer.
+            chrome_trace (Optional[str]): JSON file path for streaming events in the Chrome Trace Event format.
+            output_sqlite (Optional[str]): SQLite database path for storing events for ad-hoc queries.
+            output_index (bool): Write a sidecar index of the function calls next to the `output` log, for random access.
+            fold_loops (bool): Fold consecutive repeated call subtrees in the log and sink outputs.
+            fold_window (int): Maximum number of events of a call subtree that is folded.
+            coalesce_updates (bool): Coalesce the updates of each variable within a call into one summary.
+            coalesce_buffer_size (int): Number of updates buffered within a call before their summaries are written.
+            max_depth (Optional[int]): Maximum nesting depth of traced calls, deeper calls are only counted.
+            max_subtree_depth (Optional[Dict[str, int]]): Maximum depth traced below calls of functions, by qualified name.
+            trigger (Optional[Trigger]): Start tracing only when the trigger fires, for a window of calls.
+            control_socket (Optional[str]): Path of a Unix domain socket accepting commands to start, stop and flush tracing.
+            control_file (Optional[str]): Path of a file whose commands are executed when the process receives SIGUSR1.
+            max_elements (int): Maximum number of elements of a sequence displayed in logged values.
+            max_chars (Optional[int]): Characters after which no more elements of a sequence are displayed, None for no limit.
+            max_nesting (int): Levels of nested sequences displayed in logged values.
+            detect_buffer_changes (bool): Detect in-place modifications of buffers from a fingerprint of their memory.
+            self_profile (bool): Measure the time ObjWatch spends per stage of event processing, returned by stop().
         """
         # Create configuration parameters for ObjWatch
         config = ObjWatchConfig(**{k: v for k, v in locals().items() if k != 'self'})
 
         # Create and configure the logger based on provided parameters
-        create_logger(output=config.output, level=config.level, simple=config.simple)
+        create_logger(output=config.output, level=config.level, simple=config.simple, index=config.output_index)
 
         # Initialize the Tracer with the given configuration
         self.tracer = Tracer(config=config)
 
+        # Listen for commands starting and stopping tracing from outside the process
+        self.control: Optional[ControlChannel] = None
+        if config.control_socket is not None or config.control_file is not None:
+            self.control = ControlChannel(self, config.control_socket, config.control_file)
+
     def start(self) -> None:
         """
         Start the ObjWatch tracing process.
@@ -64,12 +120,79 @@ class ObjWatch:
         runtime_info.update()
         self.tracer.start()
 
-    def stop(self) -> None:
+    def stop(self) -> Optional[Dict[str, Dict[str, float]]]:
         """
         Stop the ObjWatch tracing process.
+
+        Returns:
+            Optional[Dict[str, Dict[str, float]]]: The time spent per stage of event processing with `self_profile`,
+            see StageProfiler.report, None otherwise.
         """
         log_info("Stopping ObjWatch tracing.")
-        self.tracer.stop()
+        profile = self.tracer.stop()
+        if self.control is not None:
+            self.control.close()
+        return profile
+
+    def pause(self) -> None:
+        """
+        Pause tracing without closing the outputs, see resume.
+        """
+        if self.tracer.is_tracing:
+            log_info("Pausing ObjWatch tracing.")
+            self.tracer.pause()
+
+    def resume(self) -> None:
+        """
+        Resume tracing after pause, or start it if it was not started yet.
+        """
+        if not self.tracer.is_started:
+            self.start()
+        elif not self.tracer.is_tracing:
+            log_info("Resuming ObjWatch tracing.")
+            self.tracer.resume()
+
+    def flush(self) -> None:
+        """
+        Write out the buffered events and a snapshot of the JSON output while tracing goes on.
+        """
+        if self.tracer.is_started:
+            self.tracer.event_handlers.flush_outputs()
+
+    def dump_flight_recorder(self) -> None:
+        """
+        Write out the events kept by the flight recorder, in 'flight_recorder' mode.
+        """
+        self.tracer.event_handlers.dump_flight_recorder("requested")
+
+    def add_targets(
+        self,
+        targets: List[Union[str, ModuleType]],
+        exclude_targets: Optional[List[Union[str, ModuleType]]] = None,
+    ) -> None:
+        """
+        Widen the trace with more targets, also while tracing.
+
+        Args:
+            targets (List[Union[str, ModuleType]]): Files, modules, classes, functions or variables to monitor.
+            exclude_targets (Optional[List[Union[str, ModuleType]]]): Files, modules, classes, functions or
+                variables to exclude from monitoring.
+        """
+        self.tracer.add_targets(targets, exclude_targets)
+
+    def remove_targets(
+        self,
+        targets: List[Union[str, ModuleType]],
+        exclude_targets: Optional[List[Union[str, ModuleType]]] = None,
+    ) -> None:
+        """
+        Narrow the trace by removing targets, also while tracing.
+
+        Args:
+            targets (List[Union[str, ModuleType]]): Targets to stop monitoring, as they were added.
+            exclude_targets (Optional[List[Union[str, ModuleType]]]): Exclusions to lift.
+        """
+        self.tracer.remove_targets(targets, exclude_targets)
 
     def __enter__(self) -> 'ObjWatch':
         """
@@ -105,6 +228,30 @@ def watch(
     wrapper: Optional[ABCWrapper] = None,
     framework: Optional[str] = None,
     indexes: Optional[List[int]] = None,
+    fork_safe: bool = False,
+    collector: Optional[str] = None,
+    with_timestamps: bool = False,
+    mode: Optional[str] = None,
+    flight_recorder_size: int = Constants.FLIGHT_RECORDER_SIZE,
+    ring_buffer: Optional[str] = None,
+    ring_buffer_size: int = Constants.RING_BUFFER_SIZE,
+    chrome_trace: Optional[str] = None,
+    output_sqlite: Optional[str] = None,
+    output_index: bool = False,
+    fold_loops: bool = False,
+    fold_window: int = Constants.FOLD_WINDOW,
+    coalesce_updates: bool = False,
+    coalesce_buffer_size: int = Constants.COALESCE_BUFFER_SIZE,
+    max_depth: Optional[int] = None,
+    max_subtree_depth: Optional[Dict[str, int]] = None,
+    trigger: Optional[Trigger] = None,
+    control_socket: Optional[str] = None,
+    control_file: Optional[str] = None,
+    max_elements: int = Constants.MAX_SEQUENCE_ELEMENTS,
+    max_chars: Optional[int] = Constants.MAX_FORMAT_CHARS,
+    max_nesting: int = Constants.MAX_FORMAT_NESTING,
+    detect_buffer_changes: bool = False,
+    self_profile: bool = False,
 ) -> ObjWatch:
     """
     Initialize and start an ObjWatch instance.
@@ -121,6 +268,30 @@ def watch(
         wrapper (Optional[ABCWrapper]): Custom wrapper to extend tracing and logging functionality.
         framework (Optional[str]): The multi-process framework module to use.
         indexes (Optional[List[int]]): The indexes to track in a multi-process environment.
+        fork_safe (bool): Reset tracing state in forked child processes and write their outputs to per-process files.
+        collector (Optional[str]): Address of a trace collector socket to send events to instead of the logger.
+        with_timestamps (bool): Record wall-clock timestamps of events in the JSON output.
+        mode (Optional[str]): Tracing mode, 'flight_recorder' keeps only the most recent events in memory.
+        flight_recorder_size (int): Number of most recent events kept in 'flight_recorder' mode.
+        ring_buffer (Optional[str]): Path of a memory-mapped ring buffer file to write events to instead of the logger.
+        ring_buffer_size (int): Size in bytes of the ring buffer.
+        chrome_trace (Optional[str]): JSON file path for streaming events in the Chrome Trace Event format.
+        output_sqlite (Optional[str]): SQLite database path for storing events for ad-hoc queries.
+        output_index (bool): Write a sidecar index of the function calls next to the `output` log, for random access.
+        fold_loops (bool): Fold consecutive repeated call subtrees in the log and sink outputs.
+        fold_window (int): Maximum number of events of a call subtree that is folded.
+        coalesce_updates (bool): Coalesce the updates of each variable within a call into one summary.
+        coalesce_buffer_size (int): Number of updates buffered within a call before their summaries are written.
+        max_depth (Optional[int]): Maximum nesting depth of traced calls, deeper calls are only counted.
+        max_subtree_depth (Optional[Dict[str, int]]): Maximum depth traced below calls of functions, by qualified name.
+        trigger (Optional[Trigger]): Start tracing only when the trigger fires, for a window of calls.
+        control_socket (Optional[str]): Path of a Unix domain socket accepting commands to start, stop and flush tracing.
+        control_file (Optional[str]): Path of a file whose commands are executed when the process receives SIGUSR1.
+        max_elements (int): Maximum number of elements of a sequence displayed in logged values.
+        max_chars (Optional[int]): Characters after which no more elements of a sequence are displayed, None for no limit.
+        max_nesting (int): Levels of nested sequences displayed in logged values.
+        detect_buffer_changes (bool): Detect in-place modifications of buffers from a fingerprint of their memory.
+        self_profile (bool): Measure the time ObjWatch spends per stage of event processing, returned by stop().
 
     Returns:
         ObjWatch: The initialized and started ObjWatch instance.
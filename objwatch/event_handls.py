@@ -3,17 +3,23 @@
 
 import sys
 import json
+import time
 import signal
 import atexit
+import threading
 from functools import lru_cache
-from types import FunctionType
+from types import FrameType, FunctionType
 from typing import Any, Optional, Dict, List
 
 from .config import ObjWatchConfig
-from .constants import Constants
-from .events import EventType
+from .events import EventType, EventRecord, FunctionInfo
+from .formatters import FormatLimits, format_sequence, format_value
+from .loop_folder import LoopFolder
+from .update_coalescer import UpdateCoalescer, UpdateSummary
+from .sinks.abc_sink import ABCSink
+from .sinks.flight_recorder_sink import FlightRecorderSink
 from .utils.util import target_handler
-from .utils.logger import log_error, log_debug, log_info
+from .utils.logger import flush_log_index, log_error, log_debug, log_info, log_warn
 from .runtime_info import runtime_info
 
 
@@ -32,8 +38,47 @@ class EventHandls:
         """
         self.config = config
         self.output_json = self.config.output_json
+        # Bounds of the formatting of logged sequences, also used by the wrapper
+        self.format_limits = FormatLimits(self.config.max_elements, self.config.max_chars, self.config.max_nesting)
+        # Events are not written to the logger when they are sent to a trace collector,
+        # written to a ring buffer or kept by the flight recorder
+        self.log_events: bool = (
+            self.config.collector is None and self.config.ring_buffer is None and self.config.mode != 'flight_recorder'
+        )
+        # Run and end events are tagged for the sidecar index of the log file
+        self.index_calls: bool = self.config.output_index
+        # Output sinks consuming compact event records, and the process index to tag them with
+        self.sinks: List[ABCSink] = []
+        self.process_index: int = 0
+        # Log lines written from records are tagged with the process index once the tracer has detected it,
+        # like the lines it writes itself
+        self.log_index: bool = False
+        # Events pass the loop folder before they are written to the logger and the sinks
+        self.loop_folder: Optional[LoopFolder] = None
+        if self.config.fold_loops:
+            self.loop_folder = LoopFolder(self._write_record, self.config.fold_window)
+        # Updates of the same variable within a call are buffered and written as one summary
+        self.update_coalescer: Optional[UpdateCoalescer] = None
+        if self.config.coalesce_updates:
+            self.update_coalescer = UpdateCoalescer(self._write_update_summary, self.config.coalesce_buffer_size)
+        # Buffered events are written out on exit, like the buffers of sinks
+        self.close_registered: bool = self.loop_folder is not None or self.update_coalescer is not None
+        if self.close_registered:
+            atexit.register(self.close_sinks)
+        self.flight_recorder: Optional[FlightRecorderSink] = None
+        if self.config.mode == 'flight_recorder':
+            self.flight_recorder = FlightRecorderSink(self.config.flight_recorder_size)
+            self.add_sink(self.flight_recorder)
+            # Write out the recorded events when the program fails
+            self._sys_excepthook = sys.excepthook
+            self._threading_excepthook = threading.excepthook
+            sys.excepthook = self._excepthook
+            threading.excepthook = self._thread_excepthook
+            self._register_signal_handlers()
         if self.output_json:
             self.is_json_saved: bool = False
+            # Wall-clock timestamps of JSON events, used to merge per-process traces
+            self.with_timestamps: bool = self.config.with_timestamps
             # Event ID counter for unique event identification
             self.event_id: int = 1
             # JSON structure with runtime info, config and events stack
@@ -47,20 +92,28 @@ class EventHandls:
             self.current_node: List[Any] = [self.stack_root['ObjWatch']['events']]
             # Register for normal exit handling
             atexit.register(self.save_json)
-            # Register signal handlers for abnormal exits
-            signal_types = [
-                signal.SIGTERM,  # Termination signal (default)
-                signal.SIGINT,  # Interrupt from keyboard (Ctrl + C)
-                signal.SIGABRT,  # Abort signal from program (e.g., abort() call)
-                signal.SIGHUP,  # Hangup signal (usually for daemon processes)
-                signal.SIGQUIT,  # Quit signal (generates core dump)
-                signal.SIGUSR1,  # User-defined signal 1
-                signal.SIGUSR2,  # User-defined signal 2
-                signal.SIGALRM,  # Alarm signal (usually for timers)
-                signal.SIGSEGV,  # Segmentation fault (access violation)
-            ]
-            for signal_type in signal_types:
-                signal.signal(signal_type, self.signal_handler)
+            self._register_signal_handlers()
+
+    def _register_signal_handlers(self) -> None:
+        """
+        Register signal handlers writing out the outputs on abnormal exits.
+        """
+        signal_types = [
+            signal.SIGTERM,  # Termination signal (default)
+            signal.SIGINT,  # Interrupt from keyboard (Ctrl + C)
+            signal.SIGABRT,  # Abort signal from program (e.g., abort() call)
+            signal.SIGHUP,  # Hangup signal (usually for daemon processes)
+            signal.SIGQUIT,  # Quit signal (generates core dump)
+            signal.SIGUSR1,  # User-defined signal 1
+            signal.SIGUSR2,  # User-defined signal 2
+            signal.SIGALRM,  # Alarm signal (usually for timers)
+            signal.SIGSEGV,  # Segmentation fault (access violation)
+        ]
+        if self.config.control_socket is not None or self.config.control_file is not None:
+            # Taken by the control channel
+            signal_types = [s for s in signal_types if s not in (signal.SIGUSR1, signal.SIGUSR2)]
+        for signal_type in signal_types:
+            signal.signal(signal_type, self.signal_handler)
 
     @staticmethod
     @lru_cache(maxsize=sys.maxsize)
@@ -77,7 +130,15 @@ class EventHandls:
         """
         return f"{lineno:>5} " + "  " * call_depth
 
-    def _log_event(self, lineno: int, event_type: EventType, message: str, call_depth: int, index_info: str) -> None:
+    def _log_event(
+        self,
+        lineno: int,
+        event_type: EventType,
+        message: str,
+        call_depth: int,
+        index_info: str,
+        qualified_name: Optional[str] = None,
+    ) -> None:
         """
         Log an event with consistent formatting.
 
@@ -87,27 +148,199 @@ class EventHandls:
             message (str): The message to log.
             call_depth (int): Current depth of the call stack.
             index_info (str): Information about the index to track in a multi-process environment.
+            qualified_name (Optional[str]): Qualified name of the function, for run and end events.
+        """
+        if self.log_events and self.loop_folder is None:
+            prefix = self._generate_prefix(lineno, call_depth)
+            if self.index_calls and qualified_name is not None:
+                log_debug(
+                    f"{index_info}{prefix}{event_type.label} {message}",
+                    extra={'objwatch_call': (event_type.label, call_depth, qualified_name)},
+                )
+            else:
+                log_debug(f"{index_info}{prefix}{event_type.label} {message}")
+
+    def add_sink(self, sink: ABCSink) -> None:
+        """
+        Add an output sink receiving a compact record of every event.
+
+        Args:
+            sink (ABCSink): The sink to add.
+        """
+        if not self.close_registered:
+            atexit.register(self.close_sinks)
+            self.close_registered = True
+        self.sinks.append(sink)
+
+    def _emit_record(
+        self, event_type: EventType, lineno: int, call_depth: int, name: str, old: Any, new: Any, kind: Optional[str]
+    ) -> None:
+        """
+        Build a compact event record and hand it to all sinks, through the loop folder if enabled.
+
+        Args:
+            event_type (EventType): The type of event.
+            lineno (int): The line number where the event occurred.
+            call_depth (int): Current depth of the call stack.
+            name (str): Qualified name of the function or name of the variable.
+            old (Any): Old value or length.
+            new (Any): New value, length or wrapper message.
+            kind (Optional[str]): Symbol type or element container type.
+        """
+        record = EventRecord(time.time_ns(), self.process_index, event_type, lineno, call_depth, name, old, new, kind)
+        if self.loop_folder is not None:
+            self.loop_folder.emit(record)
+            return
+        for sink in self.sinks:
+            sink.emit(record)
+
+    def _write_record(self, record: EventRecord) -> None:
+        """
+        Write a record that remains after loop folding to the logger and all sinks.
+
+        Args:
+            record (EventRecord): The event record.
+        """
+        if self.log_events:
+            line = record.log_line(self.log_index)
+            if self.index_calls and (record.event_type is EventType.RUN or record.event_type is EventType.END):
+                log_debug(line, extra={'objwatch_call': (record.event_type.label, record.call_depth, record.name)})
+            else:
+                log_debug(line)
+        for sink in self.sinks:
+            sink.emit(record)
+
+    def flush_sinks(self) -> None:
+        """
+        Write out the records buffered by all sinks.
+        """
+        for sink in self.sinks:
+            sink.flush()
+
+    def close_sinks(self) -> None:
+        """
+        Write out the buffered updates and the events collected by the loop folder, then flush and close all sinks
+        and write the buffered entries of the call index of the log.
+        """
+        self.flush_updates()
+        if self.loop_folder is not None:
+            self.loop_folder.flush()
+        sinks, self.sinks = self.sinks, []
+        for sink in sinks:
+            sink.close()
+        flush_log_index()
+        if self.flight_recorder is not None:
+            self._restore_excepthooks()
+
+    def dump_flight_recorder(self, reason: str) -> None:
+        """
+        Write the events kept by the flight recorder to the logger, from oldest to newest.
+
+        Args:
+            reason (str): Why the events are written out.
         """
-        prefix = self._generate_prefix(lineno, call_depth)
-        log_debug(f"{index_info}{prefix}{event_type.label} {message}")
+        if self.flight_recorder is None:
+            log_warn("Flight recorder is not enabled, set mode='flight_recorder' to use it.")
+            return
+        self.flush_updates()
+        if self.loop_folder is not None:
+            self.loop_folder.flush()
+        records = self.flight_recorder.records()
+        log_warn(f"Flight recorder dump ({reason}): last {len(records)} of {self.flight_recorder.total} events.")
+        for record in records:
+            log_debug(record.log_line(self.log_index))
+
+    def _excepthook(self, exc_type, exc_value, exc_tb) -> None:
+        """
+        Dump the flight recorder on an uncaught exception, then run the previous hook.
+        """
+        self.dump_flight_recorder(f"uncaught {exc_type.__name__}")
+        self._sys_excepthook(exc_type, exc_value, exc_tb)
+
+    def _thread_excepthook(self, args) -> None:
+        """
+        Dump the flight recorder on an uncaught exception in a thread, then run the previous hook.
+        """
+        self.dump_flight_recorder(f"uncaught {args.exc_type.__name__} in thread")
+        self._threading_excepthook(args)
 
-    def _add_json_event(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _restore_excepthooks(self) -> None:
         """
-        Create a JSON event object with the given data and add it to the current node.
+        Restore the exception hooks replaced in 'flight_recorder' mode.
+        """
+        if sys.excepthook == self._excepthook:
+            sys.excepthook = self._sys_excepthook
+        if threading.excepthook == self._thread_excepthook:
+            threading.excepthook = self._threading_excepthook
+
+    def abandon(self) -> None:
+        """
+        Drop the outputs inherited from a parent process without writing them.
+        Called in forked child processes, which set up their own outputs.
+        """
+        if self.output_json:
+            self.is_json_saved = True
+        self.sinks = []
+        self.loop_folder = None
+        self.update_coalescer = None
+        if self.flight_recorder is not None:
+            self._restore_excepthooks()
+
+    def _new_json_event(self, event_type: str) -> Dict[str, Any]:
+        """
+        Create a JSON event object with a unique ID. The caller fills in its fields and adds it
+        to the current node with _add_json_event, so that each event is a single dict.
 
         Args:
             event_type (str): Type of the event to create.
-            data (dict): Dictionary of data to include in the event.
 
         Returns:
             dict: The created event dictionary.
         """
         # Add unique event ID and increment counter
-        event = {'id': self.event_id, 'type': event_type, **data}
+        event = {'id': self.event_id, 'type': event_type}
         self.event_id += 1
-        self.current_node[-1].append(event)
         return event
 
+    def _add_json_event(self, event: Dict[str, Any]) -> None:
+        """
+        Add a JSON event object to the current node.
+
+        Args:
+            event (dict): The event created by _new_json_event.
+        """
+        self.current_node[-1].append(event)
+
+    def _json_timestamp(self, event: Dict[str, Any], key: str) -> None:
+        """
+        Set the timestamp field of a JSON event if timestamps are enabled.
+
+        Args:
+            event (dict): The event to stamp.
+            key (str): Name of the timestamp field, set to the current wall-clock time in nanoseconds.
+        """
+        if self.with_timestamps:
+            event[key] = time.time_ns()
+
+    def set_clock(self, index: Optional[int], sync_ns: int) -> None:
+        """
+        Record the clock reference of this process in the JSON output.
+
+        The reference is the wall-clock time at which the process left the start barrier,
+        which all processes leave at about the same moment. The difference between the
+        references of two processes is the offset between their clocks.
+
+        Args:
+            index (Optional[int]): Index of the current process.
+            sync_ns (int): Wall-clock time in nanoseconds right after the start barrier.
+        """
+        if self.output_json and self.with_timestamps:
+            root = self.stack_root['ObjWatch']
+            # Keep the events last, so that streaming readers see the clock before them
+            events = root.pop('events')
+            root['clock'] = {'index': index, 'sync_ns': sync_ns}
+            root['events'] = events
+
     def _handle_collection_change(
         self,
         lineno: int,
@@ -139,79 +372,155 @@ class EventHandls:
 
         self._log_event(lineno, event_type, logger_msg, call_depth, index_info)
 
+        if self.sinks or self.loop_folder is not None:
+            self._emit_record(
+                event_type, lineno, call_depth, f"{class_name}.{key}", old_value_len, current_value_len, value_type.__name__
+            )
+
         if self.output_json:
-            self._add_json_event(
-                event_type.label,
-                {
-                    'name': f"{class_name}.{key}",
-                    'line': lineno,
-                    'old': {'type': value_type.__name__, 'len': old_value_len},
-                    'new': {'type': value_type.__name__, 'len': current_value_len},
-                    'call_depth': call_depth,
-                },
+            self._add_json_collection_change(
+                event_type, lineno, f"{class_name}.{key}", value_type.__name__, old_value_len, current_value_len, call_depth
             )
 
+    def _add_json_collection_change(
+        self,
+        event_type: EventType,
+        lineno: int,
+        name: str,
+        type_name: str,
+        old_value_len: Optional[int],
+        current_value_len: Optional[int],
+        call_depth: int,
+    ) -> None:
+        """
+        Add the JSON event of a collection change (APD or POP) to the current node.
+        """
+        event = self._new_json_event(event_type.label)
+        event['name'] = name
+        event['line'] = lineno
+        event['old'] = {'type': type_name, 'len': old_value_len}
+        event['new'] = {'type': type_name, 'len': current_value_len}
+        event['call_depth'] = call_depth
+        self._json_timestamp(event, 'ts')
+        self._add_json_event(event)
+
     def handle_run(
-        self, lineno: int, func_info: dict, abc_wrapper: Optional[Any], call_depth: int, index_info: str
+        self,
+        lineno: int,
+        func_info: FunctionInfo,
+        abc_wrapper: Optional[Any],
+        call_depth: int,
+        index_info: str,
+        frame: Optional[FrameType] = None,
     ) -> None:
         """
         Handle the 'run' event indicating the start of a function or method execution.
-        """
-        logger_msg = func_info['qualified_name']
 
-        func_data = {
-            'module': func_info['module'],
-            'symbol': func_info['symbol'],
-            'symbol_type': func_info['symbol_type'] or 'function',
-            'run_line': lineno,
-            'qualified_name': func_info['qualified_name'],
-            'events': [],
-        }
+        Args:
+            frame (Optional[FrameType]): The frame of the call, passed to the wrapper.
+        """
+        logger_msg = func_info.qualified_name
+        call_msg: Optional[str] = None
 
         if abc_wrapper:
-            call_msg = abc_wrapper.wrap_call(func_info['symbol'], func_info.get('frame'))
-            func_data['call_msg'] = call_msg
+            call_msg = abc_wrapper.wrap_call(func_info.symbol, frame)
             logger_msg += ' <- ' + call_msg
 
-        self._log_event(lineno, EventType.RUN, logger_msg, call_depth, index_info)
+        self._log_event(lineno, EventType.RUN, logger_msg, call_depth, index_info, func_info.qualified_name)
+
+        if self.sinks or self.loop_folder is not None:
+            self._emit_record(
+                EventType.RUN, lineno, call_depth, func_info.qualified_name, None, call_msg, func_info.symbol_type
+            )
 
         if self.output_json:
-            function_event = self._add_json_event('Function', func_data)
-            # Push the function's events list to the stack to maintain hierarchy
-            self.current_node.append(function_event['events'])
+            self._add_json_run(lineno, func_info, call_msg)
+
+    def _add_json_run(self, lineno: int, func_info: FunctionInfo, call_msg: Optional[str]) -> None:
+        """
+        Add the JSON event of a function to the current node, and make its nested events the current node.
+        """
+        function_event = self._new_json_event('Function')
+        function_event['module'] = func_info.module
+        function_event['symbol'] = func_info.symbol
+        function_event['symbol_type'] = func_info.symbol_type or 'function'
+        function_event['run_line'] = lineno
+        function_event['qualified_name'] = func_info.qualified_name
+        if call_msg is not None:
+            function_event['call_msg'] = call_msg
+        self._json_timestamp(function_event, 'ts')
+        self._add_json_event(function_event)
+        # Nested events are kept after all other fields, so that streaming readers
+        # see the complete function header before its nested events
+        events: List[Any] = []
+        function_event['events'] = events
+        # Push the function's events list to the stack to maintain hierarchy
+        self.current_node.append(events)
 
     def handle_end(
         self,
         lineno: int,
-        func_info: dict,
+        func_info: FunctionInfo,
         abc_wrapper: Optional[Any],
         call_depth: int,
         index_info: str,
         result: Any,
+        elided: int = 0,
     ) -> None:
         """
         Handle the 'end' event indicating the end of a function or method execution.
+
+        Args:
+            elided (int): Number of calls below the function that were not traced because of the depth limits.
         """
-        logger_msg = func_info['qualified_name']
+        if self.update_coalescer is not None:
+            # Summaries of the updates within the call precede its end
+            self.update_coalescer.flush(call_depth + 1)
+
+        logger_msg = func_info.qualified_name
         return_msg = ""
 
         if abc_wrapper:
-            return_msg = abc_wrapper.wrap_return(func_info['symbol'], result)
+            return_msg = abc_wrapper.wrap_return(func_info.symbol, result)
             logger_msg += ' -> ' + return_msg
-
-        self._log_event(lineno, EventType.END, logger_msg, call_depth, index_info)
+        if elided:
+            logger_msg += f" [{elided} calls elided]"
+
+        self._log_event(lineno, EventType.END, logger_msg, call_depth, index_info, func_info.qualified_name)
+
+        if self.sinks or self.loop_folder is not None:
+            self._emit_record(
+                EventType.END,
+                lineno,
+                call_depth,
+                func_info.qualified_name,
+                elided or None,
+                return_msg if abc_wrapper else None,
+                func_info.symbol_type,
+            )
 
         if self.output_json and len(self.current_node) > 1:
-            # Find the corresponding function event in the parent node
-            parent_node = self.current_node[-2]
-            # Assuming the last event in the parent node is the current function
-            for event in reversed(parent_node):
-                if event.get('type') == 'Function' and event.get('symbol') == func_info['symbol']:
-                    event['return_msg'] = return_msg
-                    event['end_line'] = lineno
-                    break
-            # Pop the function's events list from the stack
-            self.current_node.pop()
+            self._add_json_end(lineno, func_info, return_msg, elided)
+
+    def _add_json_end(self, lineno: int, func_info: FunctionInfo, return_msg: str, elided: int) -> None:
+        """
+        Complete the JSON event of a returning function, and make its parent node the current node again.
+        """
+        # Find the corresponding function event in the parent node
+        parent_node = self.current_node[-2]
+        # Assuming the last event in the parent node is the current function
+        for event in reversed(parent_node):
+            if event.get('type') == 'Function' and event.get('symbol') == func_info.symbol:
+                event['return_msg'] = return_msg
+                event['end_line'] = lineno
+                if elided:
+                    event['elided_calls'] = elided
+                self._json_timestamp(event, 'end_ts')
+                # Move the nested events behind the fields added on return
+                event['events'] = event.pop('events')
+                break
+        # Pop the function's events list from the stack
+        self.current_node.pop()
 
     def handle_upd(
         self,
@@ -242,26 +551,109 @@ class EventHandls:
             if upd_msg is not None:
                 old_msg, current_msg = upd_msg
         else:
-            old_msg = self._format_value(old_value)
-            current_msg = self._format_value(current_value)
+            old_msg = self._format_value(old_value, self.format_limits)
+            current_msg = self._format_value(current_value, self.format_limits)
+
+        if self.update_coalescer is not None:
+            self.update_coalescer.add(
+                call_depth, lineno, class_name, key, old_msg, current_msg, index_info, old_value, current_value
+            )
+            return
+
+        self._write_update(lineno, class_name, key, old_msg, current_msg, call_depth, index_info)
+
+    def _write_update(
+        self,
+        lineno: int,
+        class_name: str,
+        key: str,
+        old_msg: str,
+        current_msg: str,
+        call_depth: int,
+        index_info: str,
+        summary: Optional[UpdateSummary] = None,
+    ) -> None:
+        """
+        Write an 'upd' event, or the summary of coalesced updates, to all outputs.
 
+        Args:
+            lineno (int): The line number where the event is called.
+            class_name (str): Name of the class containing the variable.
+            key (str): Variable name.
+            old_msg (str): The formatted old value.
+            current_msg (str): The formatted new value.
+            call_depth (int): Current depth of the call stack.
+            index_info (str): Information about the index to track in a multi-process environment.
+            summary (Optional[UpdateSummary]): The coalesced updates, if there were several.
+        """
+        summary_msg = summary.summary() if summary is not None else None
         diff_msg = f" {old_msg} -> {current_msg}"
         logger_msg = f"{class_name}.{key}{diff_msg}"
+        if summary_msg is not None:
+            logger_msg += f" ({summary_msg})"
 
         self._log_event(lineno, EventType.UPD, logger_msg, call_depth, index_info)
 
-        if self.output_json:
-            self._add_json_event(
-                EventType.UPD.label,
-                {
-                    'name': f"{class_name}.{key}",
-                    'line': lineno,
-                    'old': old_msg,
-                    'new': current_msg,
-                    'call_depth': call_depth,
-                },
+        if self.sinks or self.loop_folder is not None:
+            self._emit_record(
+                EventType.UPD, lineno, call_depth, f"{class_name}.{key}", old_msg, current_msg, summary_msg
             )
 
+        if self.output_json:
+            self._add_json_update(lineno, f"{class_name}.{key}", old_msg, current_msg, call_depth, summary)
+
+    def _add_json_update(
+        self,
+        lineno: int,
+        name: str,
+        old_msg: str,
+        current_msg: str,
+        call_depth: int,
+        summary: Optional[UpdateSummary],
+    ) -> None:
+        """
+        Add the JSON event of an update, or of the summary of coalesced updates, to the current node.
+        """
+        event = self._new_json_event(EventType.UPD.label)
+        event['name'] = name
+        event['line'] = lineno
+        event['old'] = old_msg
+        event['new'] = current_msg
+        event['call_depth'] = call_depth
+        self._json_timestamp(event, 'ts')
+        if summary is not None and summary.count > 1:
+            event['count'] = summary.count
+            if summary.minimum is not None:
+                event['min'] = summary.minimum
+                event['max'] = summary.maximum
+        self._add_json_event(event)
+
+    def _write_update_summary(self, call_depth: int, summary: UpdateSummary) -> None:
+        """
+        Write the coalesced updates of a variable.
+
+        Args:
+            call_depth (int): Call depth of the updates.
+            summary (UpdateSummary): The coalesced updates.
+        """
+        self._write_update(
+            summary.lineno,
+            summary.class_name,
+            summary.key,
+            summary.old,
+            summary.new,
+            call_depth,
+            summary.index_info,
+            summary,
+        )
+
+    def flush_updates(self) -> None:
+        """
+        Write the summaries of all buffered updates.
+        """
+        if self.update_coalescer is not None:
+            self.update_coalescer.flush()
+
     def handle_apd(
         self,
         lineno: int,
@@ -337,93 +729,71 @@ class EventHandls:
         return None
 
     @staticmethod
-    def format_sequence(
-        seq: Any, max_elements: int = Constants.MAX_SEQUENCE_ELEMENTS, func: Optional[FunctionType] = None
-    ) -> str:
+    def format_sequence(seq: Any, max_elements: Optional[int] = None, func: Optional[FunctionType] = None) -> str:
         """
         Format a sequence to display a limited number of elements.
 
         Args:
             seq (Any): The sequence to format.
-            max_elements (int): Maximum number of elements to display.
+            max_elements (Optional[int]): Maximum number of elements to display, defaults to the configured limit.
             func (Optional[FunctionType]): Optional function to process elements.
 
         Returns:
             str: The formatted sequence string.
         """
-        len_seq = len(seq)
-        if len_seq == 0:
-            return f'({type(seq).__name__})[]'
-        display: Optional[list] = None
-        if isinstance(seq, list):
-            if all(isinstance(x, Constants.LOG_ELEMENT_TYPES) for x in seq[:max_elements]):
-                display = seq[:max_elements]
-            elif func is not None:
-                display = func(seq[:max_elements])
-        elif isinstance(seq, (set, tuple)):
-            seq_list = list(seq)[:max_elements]
-            if all(isinstance(x, Constants.LOG_ELEMENT_TYPES) for x in seq_list):
-                display = seq_list
-            elif func is not None:
-                display = func(seq_list)
-        elif isinstance(seq, dict):
-            seq_keys = list(seq.keys())[:max_elements]
-            seq_values = list(seq.values())[:max_elements]
-            if all(isinstance(x, Constants.LOG_ELEMENT_TYPES) for x in seq_keys) and all(
-                isinstance(x, Constants.LOG_ELEMENT_TYPES) for x in seq_values
-            ):
-                display = list(seq.items())[:max_elements]
-            elif func is not None:
-                display_values = func(seq_values)
-                if display_values:
-                    display = []
-                    for k, v in zip(seq_keys, display_values):
-                        display.append((k, v))
-
-        if display is not None:
-            if len_seq > max_elements:
-                remaining = len_seq - max_elements
-                display.append(f"... ({remaining} more elements)")
-            return f'({type(seq).__name__})' + str(display)
-        else:
-            return f"({type(seq).__name__})[{len(seq)} elements]"
+        return format_sequence(seq, max_elements=max_elements, func=func)
 
     @staticmethod
-    def _format_value(value: Any) -> str:
+    def _format_value(value: Any, limits: Optional[FormatLimits] = None) -> str:
         """
         Format individual values for the 'upd' event when no wrapper is provided.
 
         Args:
             value (Any): The value to format.
+            limits (Optional[FormatLimits]): Bounds of the formatting of sequences, defaults to the default limits.
 
         Returns:
             str: The formatted value string.
         """
-        if isinstance(value, Constants.LOG_ELEMENT_TYPES):
-            return f"{value}"
-        elif isinstance(value, Constants.LOG_SEQUENCE_TYPES):
-            return EventHandls.format_sequence(value)
-        else:
-            try:
-                return f"(type){value.__name__}"
-            except Exception:
-                return f"(type){type(value).__name__}"
+        return format_value(value, limits)
 
     def save_json(self) -> None:
         """
         Save the accumulated events to a JSON file upon program exit with optimized size.
         """
         if self.output_json and not self.is_json_saved:
+            self.flush_updates()
             log_info(f"Starting to save JSON to {self.output_json}.")
-            # Use compact JSON format to reduce file size
-            with open(self.output_json, 'w', encoding='utf-8') as f:
-                json.dump(
-                    self.stack_root, f, ensure_ascii=False, indent=None, separators=(',', ':'), default=target_handler
-                )
+            self._write_json(self.output_json)
             log_info(f"JSON saved successfully to {self.output_json}.")
 
             self.is_json_saved = True
 
+    def _write_json(self, path: str) -> None:
+        """
+        Write the accumulated events to a JSON file.
+
+        Args:
+            path (str): Path of the JSON file.
+        """
+        # Use compact JSON format to reduce file size
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.stack_root, f, ensure_ascii=False, indent=None, separators=(',', ':'), default=target_handler)
+
+    def flush_outputs(self) -> None:
+        """
+        Write out everything buffered so far while tracing goes on: coalesced updates, events collected
+        by the loop folder, records buffered by the sinks, the call index of the log and a snapshot of
+        the JSON output.
+        """
+        self.flush_updates()
+        if self.loop_folder is not None:
+            self.loop_folder.flush()
+        self.flush_sinks()
+        flush_log_index()
+        if self.output_json and not self.is_json_saved:
+            self._write_json(self.output_json)
+
     def signal_handler(self, signum, frame):
         """
         Signal handler for abnormal program termination.
@@ -433,6 +803,10 @@ class EventHandls:
             signum (int): The signal number.
             frame (frame): The current stack frame.
         """
+        if self.flight_recorder is not None:
+            log_error(f"Received signal {signum}, dumping flight recorder before exiting.")
+            self.dump_flight_recorder(f"signal {signum}")
+            exit(1)
         if not self.is_json_saved:
             log_error(f"Received signal {signum}, saving JSON before exiting.")
             self.save_json()
@@ -2,6 +2,7 @@
 # Copyright (c) 2025 aeeeeeep
 
 from enum import Enum
+from typing import Any, NamedTuple, Optional, Tuple
 
 
 class EventType(Enum):
@@ -24,6 +25,130 @@ class EventType(Enum):
     # Marks the removal of elements from data structures like lists, tuple, sets, or dictionaries.
     POP = 5
 
+    # Stands for repeated call subtrees omitted by loop folding.
+    FLD = 6
+
     def __init__(self, value):
-        labels = {1: 'run', 2: 'end', 3: 'upd', 4: 'apd', 5: 'pop'}
+        labels = {1: 'run', 2: 'end', 3: 'upd', 4: 'apd', 5: 'pop', 6: 'fld'}
         self.label = labels[value]
+
+
+class FunctionInfo:
+    """
+    Names of a traced function, built once and shared by all its run and end events.
+
+    Attributes:
+        module (str): Name of the module of the function.
+        symbol (str): Name of the function, 'Class.method' for methods.
+        symbol_type (Optional[str]): 'method' or 'function' for targeted functions, None otherwise.
+        qualified_name (str): Name of the function prefixed with its module.
+    """
+
+    __slots__ = ('module', 'symbol', 'symbol_type', 'qualified_name')
+
+    def __init__(self, module: str, symbol: str, symbol_type: Optional[str]) -> None:
+        self.module: str = module
+        self.symbol: str = symbol
+        self.symbol_type: Optional[str] = symbol_type
+        self.qualified_name: str = f"{module}.{symbol}" if module else symbol
+
+    def __repr__(self) -> str:
+        return f"FunctionInfo({self.qualified_name!r}, symbol_type={self.symbol_type!r})"
+
+
+class EventRecord(NamedTuple):
+    """
+    Compact record of a single formatted event, handed to output sinks.
+
+    Fields:
+        timestamp (int): Wall-clock time of the event in nanoseconds.
+        process_index (int): Index of the process that produced the event.
+        event_type (EventType): The type of event.
+        lineno (int): The line number where the event occurred.
+        call_depth (int): Current depth of the call stack.
+        name (str): Qualified name for run/end/fld events, 'Class.key' for upd/apd/pop events.
+        old (Any): Formatted old value for upd events, old length for apd/pop events and the number of
+            calls elided by the depth limits for end events, None when no call was elided.
+        new (Any): Call message for run, return message for end, formatted new value for upd
+            new length for apd/pop events and the number of omitted units for fld events.
+            None when no wrapper message is available.
+        kind (Optional[str]): Symbol type for run events, element container type for apd/pop events and
+            the summary of coalesced updates for upd events.
+    """
+
+    timestamp: int
+    process_index: int
+    event_type: EventType
+    lineno: int
+    call_depth: int
+    name: str
+    old: Any
+    new: Any
+    kind: Optional[str]
+
+    def message(self) -> str:
+        """
+        Build the log message of the event, as written after the event label.
+
+        Returns:
+            str: The formatted message.
+        """
+        if self.event_type is EventType.RUN:
+            return self.name if self.new is None else f"{self.name} <- {self.new}"
+        if self.event_type is EventType.END:
+            message = self.name if self.new is None else f"{self.name} -> {self.new}"
+            return message if self.old is None else f"{message} [{self.old} calls elided]"
+        if self.event_type is EventType.UPD:
+            if self.kind is not None:
+                return f"{self.name} {self.old} -> {self.new} ({self.kind})"
+            return f"{self.name} {self.old} -> {self.new}"
+        if self.event_type is EventType.FLD:
+            return f"{self.name} x{self.new} folded"
+        return f"{self.name} ({self.kind})(len){self.old} -> {self.new}"
+
+    def log_line(self, with_index: bool = True) -> str:
+        """
+        Format the record as a log line.
+
+        Args:
+            with_index (bool): Tag the line with the process index, as in multi-process logs.
+
+        Returns:
+            str: The formatted log line.
+        """
+        index_info = f"[#{self.process_index}] " if with_index else ""
+        indent = "  " * self.call_depth
+        return f"{index_info}{self.lineno:>5} {indent}{self.event_type.label} {self.message()}"
+
+    def pack(self) -> Tuple[Any, ...]:
+        """
+        Convert the record to a plain tuple of builtin values for compact encoding.
+
+        Returns:
+            Tuple[Any, ...]: The packed record.
+        """
+        return (
+            self.timestamp,
+            self.process_index,
+            self.event_type.value,
+            self.lineno,
+            self.call_depth,
+            self.name,
+            self.old,
+            self.new,
+            self.kind,
+        )
+
+    @classmethod
+    def unpack(cls, packed: Tuple[Any, ...]) -> 'EventRecord':
+        """
+        Rebuild a record from its packed tuple form.
+
+        Args:
+            packed (Tuple[Any, ...]): A tuple produced by pack().
+
+        Returns:
+            EventRecord: The rebuilt record.
+        """
+        timestamp, process_index, event_type, lineno, call_depth, name, old, new, kind = packed
+        return cls(timestamp, process_index, EventType(event_type), lineno, call_depth, name, old, new, kind)
@@ -0,0 +1,79 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import zlib
+import weakref
+from typing import Any, Optional
+
+from .constants import Constants
+
+# Whether the values of a type export a buffer worth fingerprinting, weakly keyed by type so that
+# classes created at runtime can still be freed
+_buffer_types: 'weakref.WeakKeyDictionary[type, bool]' = weakref.WeakKeyDictionary()
+_buffer_types.update({bytes: False, str: False})
+
+
+def is_buffer(value: Any) -> bool:
+    """
+    Check whether a value exports a mutable buffer, e.g. a bytearray, an array.array or a numpy array.
+    The result is cached by type, so values of other types cost a single cache lookup.
+
+    Args:
+        value (Any): The value to check.
+
+    Returns:
+        bool: True if the value is fingerprinted.
+    """
+    cls = type(value)
+    try:
+        return _buffer_types[cls]
+    except KeyError:
+        pass
+    try:
+        with memoryview(value):
+            buffer = True
+    except Exception:
+        buffer = False
+    _buffer_types[cls] = buffer
+    return buffer
+
+
+def fingerprint(
+    value: Any, full_limit: int = Constants.BUFFER_HASH_LIMIT, blocks: int = Constants.BUFFER_SAMPLE_BLOCKS
+) -> Optional[int]:
+    """
+    Fingerprint the memory of a buffer to detect in-place modifications.
+
+    Buffers up to `full_limit` bytes are hashed in full. Larger buffers are hashed from `blocks` blocks of
+    `Constants.BUFFER_BLOCK_SIZE` bytes spread evenly over their memory, including the first and the last
+    block, so the cost is bounded whatever the size of the buffer; modifications falling between the
+    sampled blocks are not detected.
+
+    Args:
+        value (Any): The value to fingerprint.
+        full_limit (int): Maximum size in bytes of the buffers hashed in full.
+        blocks (int): Number of blocks hashed for larger buffers.
+
+    Returns:
+        Optional[int]: The fingerprint, None if the value is not a buffer or its memory is not C-contiguous.
+    """
+    if not is_buffer(value):
+        return None
+    try:
+        with memoryview(value) as view:
+            if not view.c_contiguous:
+                return None
+            with view.cast('B') as raw:
+                nbytes = raw.nbytes
+                if nbytes <= full_limit:
+                    return zlib.crc32(raw) ^ (nbytes << 32)
+                block_size = Constants.BUFFER_BLOCK_SIZE
+                last = nbytes - block_size
+                checksum = 0
+                for i in range(blocks):
+                    start = i * last // (blocks - 1) if blocks > 1 else 0
+                    end = start + block_size
+                    checksum = zlib.crc32(raw[start:end], checksum)
+                return checksum ^ (nbytes << 32)
+    except (TypeError, ValueError, BufferError):
+        return None
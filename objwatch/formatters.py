@@ -0,0 +1,347 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import sys
+import weakref
+import itertools
+from types import BuiltinFunctionType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .constants import Constants
+
+# Formatter of a value: takes the value and returns its log representation
+Formatter = Callable[[Any], str]
+
+# Function processing the displayed elements of a sequence, returning None if they do not apply
+SequenceFunc = Callable[[List[Any]], Optional[List[Any]]]
+
+# Flag of the types allocated at runtime, e.g. classes defined in Python, which can be freed
+_HEAP_TYPE = 1 << 9
+
+# Bumped by every registration, to invalidate the dispatch caches of all registries at once
+_generation = itertools.count()
+_current_generation = next(_generation)
+
+
+def format_element(value: Any) -> str:
+    """
+    Format a directly loggable value.
+    """
+    return f"{value}"
+
+
+def format_type_name(value: Any) -> str:
+    """
+    Format a class or builtin function by its name.
+    """
+    return f"(type){value.__name__}"
+
+
+def format_fallback(value: Any) -> str:
+    """
+    Format a value without a registered formatter by its name, or by the name of its type.
+    """
+    try:
+        return f"(type){value.__name__}"
+    except Exception:
+        return f"(type){type(value).__name__}"
+
+
+class FormatLimits:
+    """
+    Bounds of the formatting of sequences, so that the cost of a formatted value does not grow
+    with the size of the container. Each tracer formats with the limits of its own configuration.
+    """
+
+    def __init__(
+        self,
+        max_elements: int = Constants.MAX_SEQUENCE_ELEMENTS,
+        max_chars: Optional[int] = Constants.MAX_FORMAT_CHARS,
+        max_nesting: int = Constants.MAX_FORMAT_NESTING,
+    ) -> None:
+        """
+        Initialize the limits.
+
+        Args:
+            max_elements (int): Maximum number of elements displayed per sequence.
+            max_chars (Optional[int]): Characters after which no more elements are displayed, and long strings
+                are cut, None for no limit.
+            max_nesting (int): Levels of nested sequences displayed, 1 summarizes the nested sequences by their length.
+        """
+        self.max_elements = max_elements
+        self.max_chars = max_chars
+        self.max_nesting = max_nesting
+
+
+# Limits of the values formatted without the limits of a configuration
+default_limits = FormatLimits()
+
+
+def format_sequence(
+    seq: Any,
+    max_elements: Optional[int] = None,
+    func: Optional[SequenceFunc] = None,
+    max_chars: Optional[int] = None,
+    max_nesting: Optional[int] = None,
+    limits: Optional[FormatLimits] = None,
+) -> str:
+    """
+    Format a sequence to display a limited number of elements.
+
+    Only the displayed elements are visited, so the cost is bounded by the limits whatever the size
+    of the sequence.
+
+    Args:
+        seq (Any): The sequence to format.
+        max_elements (Optional[int]): Maximum number of elements to display, defaults to `limits`.
+        func (Optional[SequenceFunc]): Optional function to process elements.
+        max_chars (Optional[int]): Characters after which no more elements are displayed, defaults to `limits`.
+        max_nesting (Optional[int]): Levels of nested sequences displayed, defaults to `limits`.
+        limits (Optional[FormatLimits]): Limits of the arguments left to None, defaults to `default_limits`.
+
+    Returns:
+        str: The formatted sequence string.
+    """
+    if limits is None:
+        limits = default_limits
+    if max_chars is None:
+        max_chars = limits.max_chars
+    return _format_sequence(
+        seq,
+        limits.max_elements if max_elements is None else max_elements,
+        func,
+        sys.maxsize if max_chars is None else max_chars,
+        limits.max_nesting if max_nesting is None else max_nesting,
+    )
+
+
+def _format_sequence(seq: Any, max_elements: int, func: Optional[SequenceFunc], max_chars: int, nesting: int) -> str:
+    """
+    Format a sequence within the given limits.
+    """
+    len_seq = len(seq)
+    name = type(seq).__name__
+    if len_seq == 0:
+        return f'({name})[]'
+
+    def element(value: Any) -> Optional[str]:
+        if isinstance(value, str) and len(value) > max_chars:
+            return repr(value[:max_chars]) + '...'
+        if isinstance(value, Constants.LOG_ELEMENT_TYPES):
+            return repr(value)
+        if nesting > 1 and isinstance(value, Constants.LOG_SEQUENCE_TYPES):
+            return _format_sequence(value, max_elements, func, max_chars, nesting - 1)
+        return None
+
+    display: Optional[str] = None
+    if isinstance(seq, dict):
+        items = list(itertools.islice(seq.items(), max_elements))
+        display = _join((_pair(element(k), element(v)) for k, v in items), len_seq, max_chars)
+        if display is None and func is not None:
+            values = func([v for _, v in items])
+            if values:
+                keys = [k for k, _ in items]
+                display = _join((_pair(repr(k), repr(v)) for k, v in zip(keys, values)), len_seq, max_chars)
+    elif isinstance(seq, (list, set, tuple)):
+        head = list(itertools.islice(seq, max_elements))
+        display = _join((element(x) for x in head), len_seq, max_chars)
+        if display is None and func is not None:
+            values = func(head)
+            if values is not None:
+                display = _join((repr(x) for x in values), len_seq, max_chars)
+
+    if display is not None:
+        return f'({name})' + display
+    return f"({name})[{len_seq} elements]"
+
+
+def _pair(key: Optional[str], value: Optional[str]) -> Optional[str]:
+    """
+    Format a displayed key-value pair of a dict, None if the key or the value cannot be displayed.
+    """
+    if key is None or value is None:
+        return None
+    return f"({key}, {value})"
+
+
+def _join(texts: Iterable[Optional[str]], length: int, max_chars: int) -> Optional[str]:
+    """
+    Join the texts of the displayed elements until the character budget is spent.
+
+    Returns:
+        Optional[str]: The displayed elements, None if one of them cannot be displayed.
+    """
+    parts: List[str] = []
+    used = 0
+    for text in texts:
+        if text is None:
+            return None
+        if parts and used + len(text) > max_chars:
+            break
+        parts.append(text)
+        used += len(text) + 2
+    if len(parts) < length:
+        parts.append(repr(f"... ({length - len(parts)} more elements)"))
+    return '[' + ', '.join(parts) + ']'
+
+
+class FormatterRegistry:
+    """
+    Formatters of logged values, dispatched on the exact type of the value.
+
+    The formatter of a type is resolved once along its MRO, so subclasses share the formatter of their
+    closest registered base, and cached. Builtin and extension types, which are never freed, are cached
+    in a plain dict, so that later lookups of them are a single dict access. Other types are cached weakly,
+    so that the cache does not keep classes created at runtime alive.
+    A registry may fall back to a parent registry for the types it does not handle itself, which lets
+    a wrapper format some types differently without copying the global formatters.
+    """
+
+    def __init__(self, parent: Optional['FormatterRegistry'] = None) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            parent (Optional[FormatterRegistry]): Registry resolving the types without a formatter here.
+        """
+        self.parent = parent
+        self.formatters: Dict[type, Formatter] = {}
+        # Resolved formatter of every builtin and extension type seen so far
+        self.static_dispatch: Dict[type, Formatter] = {}
+        # Resolved formatter of every other type seen so far, weakly keyed so that runtime classes can still be freed
+        self.dispatch: 'weakref.WeakKeyDictionary[type, Formatter]' = weakref.WeakKeyDictionary()
+        self.generation = _current_generation
+
+    def register(self, cls: type, formatter: Formatter) -> None:
+        """
+        Register the formatter of a type and its subclasses, replacing any previous one.
+
+        Args:
+            cls (type): The type to format.
+            formatter (Formatter): Callable taking the value and returning its log representation.
+        """
+        self.formatters[cls] = formatter
+        _invalidate()
+
+    def unregister(self, cls: type) -> None:
+        """
+        Remove the formatter of a type, its values are then formatted like those of its bases.
+
+        Args:
+            cls (type): The type whose formatter is removed.
+        """
+        if self.formatters.pop(cls, None) is not None:
+            _invalidate()
+
+    def resolve(self, cls: type) -> Formatter:
+        """
+        Get the formatter of a type.
+
+        Args:
+            cls (type): The type of the value to format.
+
+        Returns:
+            Formatter: The formatter registered for the closest class in the MRO of the type.
+        """
+        if self.generation != _current_generation:
+            self.static_dispatch.clear()
+            self.dispatch.clear()
+            self.generation = _current_generation
+        try:
+            return self.static_dispatch[cls]
+        except KeyError:
+            pass
+        try:
+            return self.dispatch[cls]
+        except KeyError:
+            pass
+        formatter = self._lookup(cls)
+        if cls.__flags__ & _HEAP_TYPE:
+            self.dispatch[cls] = formatter
+        else:
+            self.static_dispatch[cls] = formatter
+        return formatter
+
+    def _lookup(self, cls: type) -> Formatter:
+        """
+        Walk the MRO of a type for a registered formatter, then ask the parent registry.
+        """
+        for base in cls.__mro__:
+            if base in self.formatters:
+                return self.formatters[base]
+        if self.parent is not None:
+            return self.parent.resolve(cls)
+        return format_fallback
+
+    def format(self, value: Any, func: Optional[SequenceFunc] = None, limits: Optional[FormatLimits] = None) -> str:
+        """
+        Format a value with the formatter of its type.
+
+        Args:
+            value (Any): The value to format.
+            func (Optional[SequenceFunc]): Optional function to process the elements of sequences.
+            limits (Optional[FormatLimits]): Bounds of the formatting of sequences, defaults to `default_limits`.
+
+        Returns:
+            str: The formatted value string.
+        """
+        formatter = self.resolve(type(value))
+        if formatter is format_sequence:
+            return format_sequence(value, func=func, limits=limits)
+        return formatter(value)
+
+
+def _invalidate() -> None:
+    """
+    Start a new generation, so that every registry resolves its types again.
+    """
+    global _current_generation
+    _current_generation = next(_generation)
+
+
+# Global registry, used by the default output and by all wrappers
+registry = FormatterRegistry()
+_defaults: Tuple[Tuple[Tuple[type, ...], Formatter], ...] = (
+    (Constants.LOG_ELEMENT_TYPES, format_element),
+    (Constants.LOG_SEQUENCE_TYPES, format_sequence),
+    ((type, BuiltinFunctionType), format_type_name),
+)
+for _types, _formatter in _defaults:
+    for _cls in _types:
+        registry.register(_cls, _formatter)
+
+
+def register_formatter(cls: type, formatter: Formatter) -> None:
+    """
+    Register the formatter of a type and its subclasses in the global registry, used by the default
+    output and by all wrappers, e.g. to log a summary of numpy arrays or pandas frames.
+
+    Args:
+        cls (type): The type to format.
+        formatter (Formatter): Callable taking the value and returning its log representation.
+    """
+    registry.register(cls, formatter)
+
+
+def unregister_formatter(cls: type) -> None:
+    """
+    Remove the formatter of a type from the global registry.
+
+    Args:
+        cls (type): The type whose formatter is removed.
+    """
+    registry.unregister(cls)
+
+
+def format_value(value: Any, limits: Optional[FormatLimits] = None) -> str:
+    """
+    Format a value with the global registry.
+
+    Args:
+        value (Any): The value to format.
+        limits (Optional[FormatLimits]): Bounds of the formatting of sequences, defaults to `default_limits`.
+
+    Returns:
+        str: The formatted value string.
+    """
+    return registry.format(value, limits=limits)
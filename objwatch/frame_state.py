@@ -0,0 +1,26 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from typing import Dict, Optional
+
+from .snapshots import Snapshot
+
+
+class FrameState:
+    """
+    Tracking state of one traced frame.
+
+    The state is only referenced by the local trace function of its frame, so it is freed together with
+    the frame: when the frame returns, but also when it is unwound by an exception or belongs to an
+    abandoned generator, whose return is never seen.
+    """
+
+    __slots__ = ('lineno', 'locals', 'locals_lens', 'locals_fingerprints')
+
+    def __init__(self) -> None:
+        # Line number of the previous line event, changes are reported on the line that made them
+        self.lineno: Optional[int] = None
+        # Snapshots, lengths and buffer fingerprints of the local variables, when locals are tracked
+        self.locals: Dict[str, Snapshot] = {}
+        self.locals_lens: Dict[str, int] = {}
+        self.locals_fingerprints: Dict[str, int] = {}
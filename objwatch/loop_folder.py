@@ -0,0 +1,213 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from typing import Any, Callable, List, Optional, Tuple
+
+from .constants import Constants
+from .events import EventType, EventRecord
+
+
+class _Level:
+    """
+    Folding state of the units at one nesting level: the units directly inside a call, or at the top.
+    """
+
+    __slots__ = ('unit', 'shape', 'repeats', 'last')
+
+    def __init__(self) -> None:
+        # Unit whose call has ended, extended by the events following the call until the next call
+        self.unit: Optional[List[EventRecord]] = None
+        # Shape of the last written unit, and the number and last one of the units repeating it
+        self.shape: Optional[Tuple[Any, ...]] = None
+        self.repeats: int = 0
+        self.last: Optional[List[EventRecord]] = None
+
+
+class _Call:
+    """
+    A call that has not ended yet, with its collected events.
+    """
+
+    __slots__ = ('records', 'level', 'passthrough')
+
+    def __init__(self, record: EventRecord) -> None:
+        self.records: List[EventRecord] = [record]
+        self.level = _Level()
+        # Set once the call has outgrown the window, its events are then written as they arrive
+        self.passthrough: bool = False
+
+
+class LoopFolder:
+    """
+    Online compaction of repeated call subtrees, e.g. a method called in a hot loop.
+
+    A unit is a call with all its nested events, followed by the variable updates and collection
+    changes at the same level up to the next call. Consecutive units with the same shape (event
+    types, line numbers and names, but not values) are folded: the first unit is written as a
+    template, then a FLD record with the number of omitted units, then the last unit with the
+    final values. Nested loops are folded first, so the units of an outer loop compare equal when
+    their inner loops ran the same number of times.
+
+    Calls are collected until they end to compare their shape. A call with more than `window`
+    events is not folded, it is written out as its events arrive, so memory stays bounded.
+    """
+
+    def __init__(self, write: Callable[[EventRecord], None], window: int = Constants.FOLD_WINDOW) -> None:
+        """
+        Initialize the folder.
+
+        Args:
+            write (Callable[[EventRecord], None]): Receives the records that remain after folding, in order.
+            window (int): Maximum number of events of a call subtree that is folded.
+        """
+        self.write = write
+        self.window = window
+        self.root = _Level()
+        self.calls: List[_Call] = []
+
+    def emit(self, record: EventRecord) -> None:
+        """
+        Add the next event record.
+
+        Args:
+            record (EventRecord): The event record.
+        """
+        event_type = record.event_type
+        if event_type is EventType.RUN:
+            top = len(self.calls) - 1
+            self._complete_unit(top)
+            self.calls.append(_Call(record))
+        elif event_type is EventType.END:
+            top = len(self.calls) - 1
+            self._close_level(top)
+            if top < 0:
+                # A call entered before tracing started
+                self.write(record)
+                return
+            call = self.calls.pop()
+            if call.passthrough:
+                self.write(record)
+            else:
+                call.records.append(record)
+                self._level(top - 1).unit = call.records
+        else:
+            top = len(self.calls) - 1
+            level = self._level(top)
+            if level.unit is None:
+                self._output(top, [record])
+            else:
+                level.unit.append(record)
+                if len(level.unit) > self.window:
+                    # Too many events follow the call, write the unit without folding it
+                    unit, level.unit = level.unit, None
+                    self._flush_repeats(top)
+                    level.shape = None
+                    self._output(top, unit)
+
+    def flush(self) -> None:
+        """
+        Write out all collected events, e.g. when tracing stops. Calls that have not ended
+        are no longer folded afterwards.
+        """
+        if self.calls:
+            self._passthrough(len(self.calls) - 1)
+        self._close_level(len(self.calls) - 1)
+
+    def _level(self, position: int) -> _Level:
+        """
+        Get the level of the units inside the call at a position of the stack, -1 for the top level.
+        """
+        return self.root if position < 0 else self.calls[position].level
+
+    @staticmethod
+    def _shape(unit: List[EventRecord]) -> Tuple[Any, ...]:
+        """
+        Get the shape of a unit, which is equal for units that only differ in their values.
+        """
+        return tuple(
+            (record.event_type, record.lineno, record.name, record.kind, record.new)
+            if record.event_type is EventType.FLD
+            else (record.event_type, record.lineno, record.name, record.kind)
+            for record in unit
+        )
+
+    def _output(self, position: int, records: List[EventRecord]) -> None:
+        """
+        Output records at the level of a call: collect them in the call, or write them if it is not folded.
+        """
+        if position < 0 or self.calls[position].passthrough:
+            for record in records:
+                self.write(record)
+            return
+        call = self.calls[position]
+        call.records.extend(records)
+        if len(call.records) > self.window:
+            self._passthrough(position)
+
+    def _passthrough(self, position: int) -> None:
+        """
+        Stop folding a call and all calls enclosing it, and write out what they collected.
+        """
+        for index in range(position + 1):
+            call = self.calls[index]
+            if call.passthrough:
+                continue
+            # The call can no longer be compared to the units preceding it
+            self._flush_repeats(index - 1)
+            self._level(index - 1).shape = None
+            call.passthrough = True
+            records, call.records = call.records, []
+            for record in records:
+                self.write(record)
+
+    def _complete_unit(self, position: int) -> None:
+        """
+        Fold the unit of a level into the preceding units if it has the same shape, otherwise output it.
+        """
+        level = self._level(position)
+        unit = level.unit
+        if unit is None:
+            return
+        level.unit = None
+        shape = self._shape(unit)
+        if shape == level.shape:
+            level.repeats += 1
+            level.last = unit
+            return
+        self._flush_repeats(position)
+        level.shape = shape
+        self._output(position, unit)
+
+    def _flush_repeats(self, position: int) -> None:
+        """
+        Output the folded units of a level: the number of omitted units and the last unit.
+        """
+        level = self._level(position)
+        last = level.last
+        if last is None:
+            return
+        if level.repeats > 1:
+            first = last[0]
+            fold = EventRecord(
+                first.timestamp,
+                first.process_index,
+                EventType.FLD,
+                first.lineno,
+                first.call_depth,
+                first.name,
+                None,
+                level.repeats - 1,
+                None,
+            )
+            self._output(position, [fold])
+        level.repeats = 0
+        level.last = None
+        self._output(position, last)
+
+    def _close_level(self, position: int) -> None:
+        """
+        Output everything pending at a level, when its call ends or the folder is flushed.
+        """
+        self._complete_unit(position)
+        self._flush_repeats(position)
+        self._level(position).shape = None
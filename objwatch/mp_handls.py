@@ -1,8 +1,9 @@
 # MIT License
 # Copyright (c) 2025 aeeeeeep
 
+import time
 from types import FunctionType
-from typing import Callable, Optional, Union
+from typing import Any, Callable, Optional, Union
 
 from .utils.logger import log_error, log_info
 
@@ -30,6 +31,10 @@ class MPHandls:
         self.initialized: bool = False
         self.index: Optional[int] = None
         self.sync_fn: Optional[Union[FunctionType, Callable]] = None
+        # Wall-clock time in nanoseconds at which the last synchronization completed
+        self.sync_time_ns: Optional[int] = None
+        # Connection to the central trace collector, if any
+        self.collector: Optional[Any] = None
         self._check_initialized()
 
     def _check_initialized(self) -> None:
@@ -59,6 +64,57 @@ class MPHandls:
         """
         if self.initialized and self.sync_fn is not None:
             self.sync_fn()
+            # All processes leave the barrier at about the same moment, which gives them a
+            # common reference point for aligning their clocks
+            self.sync_time_ns = time.time_ns()
+
+    def reset(self) -> None:
+        """
+        Forget the detected process index so that it is detected again lazily.
+        Called in forked child processes, which inherit the parent's state.
+        """
+        self.initialized = False
+        self.index = None
+        self.sync_fn = None
+        self.sync_time_ns = None
+        # The inherited collector connection is shared with the parent, a child opens its own
+        self.collector = None
+
+    def connect_collector(self, address: str, authkey: bytes) -> None:
+        """
+        Connect to a central trace collector listening on a local socket.
+
+        Args:
+            address (str): Address of the collector socket.
+            authkey (bytes): Secret shared with the collector.
+        """
+        from multiprocessing.connection import Client
+
+        self.collector = Client(address, authkey=authkey)
+        log_info(f"Connected to trace collector at {address}")
+
+    def send_events(self, payload: bytes) -> None:
+        """
+        Send an encoded batch of event records to the trace collector.
+
+        Args:
+            payload (bytes): The encoded batch.
+        """
+        if self.collector is None:
+            return
+        try:
+            self.collector.send_bytes(payload)
+        except (OSError, EOFError) as e:
+            log_error(f"Lost connection to trace collector: {e}")
+            self.collector = None
+
+    def close_collector(self) -> None:
+        """
+        Close the connection to the trace collector.
+        """
+        if self.collector is not None:
+            self.collector.close()
+            self.collector = None
 
     def get_index(self) -> Optional[int]:
         """
@@ -0,0 +1,101 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+from .constants import Constants
+from .snapshots import Snapshot
+
+
+class ObjectState:
+    """
+    Tracking state of one traced object: the snapshots, lengths and buffer fingerprints of its attributes.
+    """
+
+    __slots__ = ('ref', 'obj_type', 'attrs', 'attrs_lens', 'attrs_fingerprints')
+
+    def __init__(self, obj_type: type) -> None:
+        # Weak reference to the object, None if it does not support weak references
+        self.ref: Optional[weakref.KeyedRef] = None
+        self.obj_type: type = obj_type
+        self.attrs: Dict[str, Snapshot] = {}
+        self.attrs_lens: Dict[str, int] = {}
+        self.attrs_fingerprints: Dict[str, int] = {}
+
+
+class ObjectStates:
+    """
+    Tracking states of the traced objects, by object identity.
+
+    A state holds a single weak reference to its object and is dropped once the object is freed, so looking
+    up the state of an object costs one dict lookup. Objects that do not support weak references, e.g.
+    instances of classes with __slots__ including __dict__ but not __weakref__, are tracked by id and type
+    only: their states can not follow the lifetime of the objects, so at most `max_unreferenceable` of them
+    are kept, the oldest being dropped first.
+    """
+
+    def __init__(self, max_unreferenceable: int = Constants.MAX_UNREFERENCEABLE_OBJECTS) -> None:
+        """
+        Args:
+            max_unreferenceable (int): Maximum number of states of objects without weak reference support.
+        """
+        self.states: Dict[int, ObjectState] = {}
+        # Ids of the objects without weak reference support, oldest first
+        self.unreferenceable: Dict[int, None] = {}
+        self.max_unreferenceable: int = max_unreferenceable
+        self._remove: Callable[[weakref.KeyedRef], None] = self._make_remove(weakref.ref(self))
+
+    @staticmethod
+    def _make_remove(selfref: weakref.ref) -> Callable[[weakref.KeyedRef], None]:
+        # The callback only holds a weak reference to the states, so they are not kept alive by their objects
+        def remove(ref: weakref.KeyedRef) -> None:
+            self = selfref()
+            if self is not None:
+                state = self.states.get(ref.key)
+                if state is not None and state.ref is ref:
+                    del self.states[ref.key]
+
+        return remove
+
+    def get(self, obj: Any) -> Optional[ObjectState]:
+        """
+        Get the tracking state of an object.
+
+        Args:
+            obj (Any): The traced object.
+
+        Returns:
+            Optional[ObjectState]: The state of the object, None if it is not tracked.
+        """
+        state = self.states.get(id(obj))
+        if state is None or state.obj_type is not type(obj):
+            return None
+        return state
+
+    def add(self, obj: Any) -> ObjectState:
+        """
+        Start tracking an object, replacing its previous state if any.
+
+        Args:
+            obj (Any): The traced object.
+
+        Returns:
+            ObjectState: The new, empty state of the object.
+        """
+        key = id(obj)
+        state = ObjectState(type(obj))
+        self.unreferenceable.pop(key, None)
+        try:
+            state.ref = weakref.KeyedRef(obj, self._remove, key)
+        except TypeError:
+            self.unreferenceable[key] = None
+            if len(self.unreferenceable) > self.max_unreferenceable:
+                oldest = next(iter(self.unreferenceable))
+                del self.unreferenceable[oldest]
+                self.states.pop(oldest, None)
+        self.states[key] = state
+        return state
+
+    def __len__(self) -> int:
+        return len(self.states)
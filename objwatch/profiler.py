@@ -0,0 +1,138 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional
+
+# Stages of event processing, in the order they are reported
+STAGES = (
+    'trace:call',
+    'trace:line',
+    'trace:return',
+    'trace:exception',
+    'targets',
+    'changes',
+    'format',
+    'wrapper',
+    'log',
+    'sinks',
+    'json',
+    'event:run',
+    'event:end',
+    'event:upd',
+    'event:apd',
+    'event:pop',
+)
+
+
+class StageProfiler:
+    """
+    Time and number of passes ObjWatch spends in each stage of event processing, for self-profiling.
+
+    Stages are timed by replacing methods of the tracer, the event handlers and the wrapper with timing
+    functions set as instance attributes, so nothing is measured or paid for without self-profiling.
+    Stages nest: 'trace:<event>' is the whole time of the trace function for each kind of event,
+    the other stages run within it, and 'event:<type>' is the time of handling each type of logged event.
+    """
+
+    def __init__(self) -> None:
+        # Number of passes and total time in nanoseconds, by stage
+        self.stages: Dict[str, List[int]] = {stage: [0, 0] for stage in STAGES}
+
+    def instrument(self, obj: Any, name: str, stage: str) -> None:
+        """
+        Time the calls of a method of an object as a stage. A method already instrumented is instrumented
+        again from its class, so an object is never timed twice.
+
+        Args:
+            obj (Any): The object.
+            name (str): Name of the method.
+            stage (str): Name of the stage.
+        """
+        obj.__dict__.pop(name, None)
+        setattr(obj, name, self.timed(stage, getattr(obj, name)))
+
+    def timed(self, stage: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a function so that its calls are timed as a stage.
+
+        Args:
+            stage (str): Name of the stage.
+            func (Callable[..., Any]): The function.
+
+        Returns:
+            Callable[..., Any]: The timed function.
+        """
+        totals = self.stages.setdefault(stage, [0, 0])
+
+        def timed_func(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[0] += 1
+                totals[1] += perf_counter_ns() - start
+
+        return timed_func
+
+    def timed_trace(self, trace_func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap the trace function so that its calls are timed by kind of event, as 'trace:<event>' stages.
+
+        Args:
+            trace_func (Callable[..., Any]): The trace function.
+
+        Returns:
+            Callable[..., Any]: The timed trace function.
+        """
+        stages = self.stages
+
+        def timed_trace_func(frame: Any, event: str, arg: Any, state: Optional[Any] = None) -> Any:
+            start = perf_counter_ns()
+            result = trace_func(frame, event, arg, state)
+            totals = stages.get('trace:' + event)
+            if totals is None:
+                totals = stages['trace:' + event] = [0, 0]
+            totals[0] += 1
+            totals[1] += perf_counter_ns() - start
+            return result
+
+        return timed_trace_func
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the breakdown of the stages that were run.
+
+        Returns:
+            Dict[str, Dict[str, float]]: By stage, the number of passes 'count', the total time 'total_ms',
+            the mean time per pass 'mean_us' and the share of the time of the trace function 'share'.
+        """
+        traced_ns = sum(totals[1] for stage, totals in self.stages.items() if stage.startswith('trace:'))
+        return {
+            stage: {
+                'count': count,
+                'total_ms': elapsed / 1e6,
+                'mean_us': elapsed / count / 1e3,
+                'share': elapsed / traced_ns if traced_ns else 0.0,
+            }
+            for stage, (count, elapsed) in self.stages.items()
+            if count
+        }
+
+    def format(self) -> str:
+        """
+        Format the breakdown of the stages as a table.
+
+        Returns:
+            str: The formatted breakdown.
+        """
+        lines = [
+            "ObjWatch self-profile, stages nest within trace:<event>:",
+            f"{'stage':<16} {'count':>10} {'total ms':>10} {'mean us':>9} {'share':>7}",
+        ]
+        for stage, stats in self.report().items():
+            lines.append(
+                f"{stage:<16} {stats['count']:>10.0f} {stats['total_ms']:>10.2f} "
+                f"{stats['mean_us']:>9.2f} {stats['share']:>6.1%}"
+            )
+        return '\n'.join(lines)
@@ -0,0 +1,11 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from .abc_sink import ABCSink
+from .collector_sink import CollectorSink
+from .chrome_trace_sink import ChromeTraceSink
+from .flight_recorder_sink import FlightRecorderSink
+from .ring_buffer_sink import RingBufferSink
+from .sqlite_sink import SQLiteSink
+
+__all__ = ['ABCSink', 'CollectorSink', 'ChromeTraceSink', 'FlightRecorderSink', 'RingBufferSink', 'SQLiteSink']
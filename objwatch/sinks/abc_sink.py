@@ -0,0 +1,34 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from abc import ABC, abstractmethod
+
+from ..events import EventRecord
+
+
+class ABCSink(ABC):
+    """
+    Abstract base class for output sinks consuming compact event records.
+    """
+
+    @abstractmethod
+    def emit(self, record: EventRecord) -> None:
+        """
+        Consume a single event record.
+
+        Args:
+            record (EventRecord): The event record to consume.
+        """
+        pass
+
+    def flush(self) -> None:
+        """
+        Write out any buffered records.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Flush buffered records and release the resources held by the sink.
+        """
+        self.flush()
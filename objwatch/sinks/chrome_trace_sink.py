@@ -0,0 +1,135 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import json
+import math
+import threading
+from typing import Any, Dict, Optional
+
+from ..events import EventType, EventRecord
+from .abc_sink import ABCSink
+
+
+class ChromeTraceSink(ABCSink):
+    """
+    ChromeTraceSink streams event records to a file in the Chrome Trace Event format,
+    which can be opened in Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+
+    Function calls become duration events (B/E) with the process index as pid. Numeric variable
+    updates and collection lengths become counter events (C), other variable updates and calls
+    omitted by loop folding become instant events (i). Events are written as they arrive, nothing is kept in memory.
+    """
+
+    def __init__(self, path: str, tid: Optional[int] = None) -> None:
+        """
+        Initialize the sink and open the output file.
+
+        Args:
+            path (str): Path to the Chrome Trace JSON file.
+            tid (Optional[int]): Thread id for all events, defaults to the id of the emitting thread.
+        """
+        self.path = path
+        self.tid = tid
+        self.file: Any = open(path, 'w', encoding='utf-8')
+        self.file.write('[')
+        self.separator = '\n'
+
+    @staticmethod
+    def _number(value: Any) -> Optional[float]:
+        """
+        Interpret a formatted value as a number, for counter events.
+
+        Args:
+            value (Any): The formatted value.
+
+        Returns:
+            Optional[float]: The number, or None if the value is not numeric or not finite,
+                NaN and infinities cannot be written as JSON numbers.
+        """
+        if isinstance(value, bool) or value is None:
+            return None
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        return number if math.isfinite(number) else None
+
+    @staticmethod
+    def _arg(value: Any) -> Any:
+        """
+        Make a value of an instant event argument valid JSON.
+
+        Args:
+            value (Any): The formatted value.
+
+        Returns:
+            Any: The value, or its text for NaN and infinities.
+        """
+        if isinstance(value, float) and not math.isfinite(value):
+            return str(value)
+        return value
+
+    def to_trace_event(self, record: EventRecord) -> Dict[str, Any]:
+        """
+        Convert a record to a trace event.
+
+        Args:
+            record (EventRecord): The event record.
+
+        Returns:
+            Dict[str, Any]: The trace event.
+        """
+        event: Dict[str, Any] = {
+            'name': record.name,
+            'ph': 'i',
+            'ts': record.timestamp / 1000,
+            'pid': record.process_index,
+            'tid': threading.get_ident() if self.tid is None else self.tid,
+        }
+        if record.event_type is EventType.RUN or record.event_type is EventType.END:
+            event['ph'] = 'B' if record.event_type is EventType.RUN else 'E'
+            event['cat'] = record.kind or 'function'
+            if record.new is not None:
+                event['args'] = {'call_msg' if record.event_type is EventType.RUN else 'return_msg': record.new}
+            if record.event_type is EventType.END and record.old is not None:
+                event.setdefault('args', {})['elided_calls'] = record.old
+        elif record.event_type is EventType.UPD:
+            number = self._number(record.new)
+            if number is None:
+                event['s'] = 't'
+                event['args'] = {'old': self._arg(record.old), 'new': self._arg(record.new)}
+            else:
+                event['ph'] = 'C'
+                event['args'] = {'value': number}
+        elif record.event_type is EventType.FLD:
+            event['s'] = 't'
+            event['cat'] = 'fold'
+            event['args'] = {'repeats': record.new}
+        else:
+            event['ph'] = 'C'
+            event['args'] = {'len': record.new}
+        return event
+
+    def emit(self, record: EventRecord) -> None:
+        """
+        Write a record as a trace event.
+
+        Args:
+            record (EventRecord): The event record to write.
+        """
+        self.file.write(self.separator + json.dumps(self.to_trace_event(record), ensure_ascii=False, default=str))
+        self.separator = ',\n'
+
+    def flush(self) -> None:
+        """
+        Flush the written events to the file.
+        """
+        self.file.flush()
+
+    def close(self) -> None:
+        """
+        Terminate the event array and close the file.
+        """
+        if not self.file.closed:
+            self.file.write('\n]\n')
+            self.file.close()
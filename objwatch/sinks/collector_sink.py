@@ -0,0 +1,92 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import marshal
+import threading
+from typing import List, Tuple, Any
+
+from ..constants import Constants
+from ..events import EventRecord
+from ..mp_handls import MPHandls
+from ..utils.util import collector_authkey
+from .abc_sink import ABCSink
+
+
+class CollectorSink(ABCSink):
+    """
+    CollectorSink batches event records and sends them to a central TraceCollector process.
+
+    Records are packed into plain tuples and a batch is encoded with marshal, which keeps the
+    encoding compact and cheap. A batch is sent when it is full or when its oldest record
+    is older than the flush interval, so that the collector can keep its merged stream moving.
+    A background thread also sends the batch every flush interval, so that the records of an
+    idle process do not wait for its next event.
+    The connection is authenticated with the secret of the collector, see collector_authkey.
+    """
+
+    def __init__(
+        self,
+        mp_handlers: MPHandls,
+        address: str,
+        batch_size: int = Constants.COLLECTOR_BATCH_SIZE,
+        flush_interval_ns: int = Constants.COLLECTOR_FLUSH_INTERVAL_NS,
+    ) -> None:
+        """
+        Initialize the sink and connect to the collector.
+
+        Args:
+            mp_handlers (MPHandls): The multi-process handler owning the collector connection.
+            address (str): Address of the collector socket.
+            batch_size (int): Number of records sent in one batch.
+            flush_interval_ns (int): Maximum age of a buffered record before the batch is sent.
+        """
+        self.mp_handlers = mp_handlers
+        self.batch_size = batch_size
+        self.flush_interval_ns = flush_interval_ns
+        self.batch: List[Tuple[Any, ...]] = []
+        self.batch_start: int = 0
+        # Guards the batch and the connection against the flushing thread, reentrant since signal
+        # handlers flushing the outputs may interrupt the traced thread while it emits a record
+        self.lock = threading.RLock()
+        self.closed = threading.Event()
+        self.mp_handlers.connect_collector(address, collector_authkey())
+        threading.Thread(target=self._flush_periodically, name='objwatch-collector-flush', daemon=True).start()
+
+    def emit(self, record: EventRecord) -> None:
+        """
+        Add a record to the current batch, sending the batch when it is due.
+
+        Args:
+            record (EventRecord): The event record to send.
+        """
+        with self.lock:
+            if not self.batch:
+                self.batch_start = record.timestamp
+            self.batch.append(record.pack())
+            if len(self.batch) >= self.batch_size or record.timestamp - self.batch_start > self.flush_interval_ns:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Send the buffered batch to the collector.
+        """
+        with self.lock:
+            if self.batch:
+                self.mp_handlers.send_events(marshal.dumps(self.batch))
+                self.batch = []
+
+    def _flush_periodically(self) -> None:
+        """
+        Send the buffered batch every flush interval until the sink is closed.
+        """
+        while not self.closed.wait(self.flush_interval_ns / 1e9):
+            self.flush()
+
+    def close(self) -> None:
+        """
+        Stop the flushing thread, send the remaining records and close the connection to the collector.
+        """
+        self.closed.set()
+        with self.lock:
+            self.flush()
+            self.mp_handlers.close_collector()
@@ -0,0 +1,51 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from typing import Any, List
+
+from ..constants import Constants
+from ..events import EventRecord
+from .abc_sink import ABCSink
+
+
+class FlightRecorderSink(ABCSink):
+    """
+    FlightRecorderSink keeps the most recent event records in a fixed-size ring buffer.
+
+    The ring is preallocated, so memory stays constant no matter how long tracing runs,
+    and nothing is written until the records are explicitly read out.
+    """
+
+    def __init__(self, size: int = Constants.FLIGHT_RECORDER_SIZE) -> None:
+        """
+        Initialize the sink with a preallocated ring.
+
+        Args:
+            size (int): Number of most recent records to keep.
+        """
+        self.size = size
+        self.ring: List[Any] = [None] * size
+        # Number of records emitted so far, the next slot is total % size
+        self.total: int = 0
+
+    def emit(self, record: EventRecord) -> None:
+        """
+        Store a record, overwriting the oldest one once the ring is full.
+
+        Args:
+            record (EventRecord): The event record to store.
+        """
+        self.ring[self.total % self.size] = record
+        self.total += 1
+
+    def records(self) -> List[EventRecord]:
+        """
+        Get the stored records from oldest to newest.
+
+        Returns:
+            List[EventRecord]: The stored records.
+        """
+        if self.total <= self.size:
+            return self.ring[:self.total]
+        start = self.total % self.size
+        return self.ring[start:] + self.ring[:start]
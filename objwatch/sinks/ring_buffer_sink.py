@@ -0,0 +1,48 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import marshal
+
+from ..constants import Constants
+from ..events import EventRecord
+from ..utils.ring_buffer import RingBuffer
+from ..utils.logger import log_info, log_warn
+from .abc_sink import ABCSink
+
+
+class RingBufferSink(ABCSink):
+    """
+    RingBufferSink writes event records into a memory-mapped ring buffer drained by another process.
+
+    Every record is packed into a plain tuple and encoded with marshal, the traced process does
+    no file I/O and no formatting of the final output. Records are dropped when the reader falls
+    behind and the ring buffer is full, so that tracing never blocks the application.
+    """
+
+    def __init__(self, path: str, capacity: int = Constants.RING_BUFFER_SIZE) -> None:
+        """
+        Initialize the sink and create the ring buffer.
+
+        Args:
+            path (str): Path of the ring buffer file, preferably on a memory-backed filesystem.
+            capacity (int): Size of the ring buffer in bytes.
+        """
+        self.ring = RingBuffer.create(path, capacity)
+        log_info(f"Writing events to ring buffer {path}")
+
+    def emit(self, record: EventRecord) -> None:
+        """
+        Write a record into the ring buffer.
+
+        Args:
+            record (EventRecord): The event record to write.
+        """
+        self.ring.write(marshal.dumps(record.pack()))
+
+    def close(self) -> None:
+        """
+        Mark the ring buffer as closed for the reader and unmap it.
+        """
+        if self.ring.dropped:
+            log_warn(f"Ring buffer {self.ring.path} was full, {self.ring.dropped} events were dropped.")
+        self.ring.close(mark_closed=True)
@@ -0,0 +1,250 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import sqlite3
+from typing import Any, List, Optional, Tuple
+
+from ..constants import Constants
+from ..events import EventType, EventRecord
+from .abc_sink import ABCSink
+
+# Events are numbered by their order of occurrence (seq), which orders events of the same process
+# even when their timestamps are equal
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY,
+    parent_id INTEGER,
+    rank INTEGER NOT NULL,
+    qualified_name TEXT NOT NULL,
+    symbol_type TEXT,
+    depth INTEGER NOT NULL,
+    run_line INTEGER NOT NULL,
+    end_line INTEGER,
+    start_seq INTEGER NOT NULL,
+    end_seq INTEGER,
+    start_ns INTEGER NOT NULL,
+    end_ns INTEGER,
+    call_msg TEXT,
+    return_msg TEXT,
+    elided_calls INTEGER
+);
+CREATE TABLE IF NOT EXISTS updates (
+    seq INTEGER PRIMARY KEY,
+    rank INTEGER NOT NULL,
+    call_id INTEGER,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    old TEXT,
+    new TEXT,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS collection_changes (
+    seq INTEGER PRIMARY KEY,
+    rank INTEGER NOT NULL,
+    call_id INTEGER,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    element_type TEXT,
+    old_len INTEGER,
+    new_len INTEGER
+);
+CREATE TABLE IF NOT EXISTS folds (
+    seq INTEGER PRIMARY KEY,
+    rank INTEGER NOT NULL,
+    call_id INTEGER,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    repeats INTEGER NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_calls_name ON calls (qualified_name, start_seq);
+CREATE INDEX IF NOT EXISTS idx_calls_rank ON calls (rank);
+CREATE INDEX IF NOT EXISTS idx_calls_time ON calls (start_ns);
+CREATE INDEX IF NOT EXISTS idx_updates_name ON updates (name, seq);
+CREATE INDEX IF NOT EXISTS idx_updates_rank ON updates (rank);
+CREATE INDEX IF NOT EXISTS idx_updates_time ON updates (ts);
+CREATE INDEX IF NOT EXISTS idx_updates_call ON updates (call_id);
+CREATE INDEX IF NOT EXISTS idx_changes_name ON collection_changes (name, seq);
+CREATE INDEX IF NOT EXISTS idx_changes_rank ON collection_changes (rank);
+CREATE INDEX IF NOT EXISTS idx_changes_time ON collection_changes (ts);
+CREATE INDEX IF NOT EXISTS idx_folds_name ON folds (name, seq);
+"""
+
+
+class SQLiteSink(ABCSink):
+    """
+    SQLiteSink stores event records in a SQLite database for ad-hoc queries.
+
+    Function calls, variable updates, collection changes and calls omitted by loop folding
+    go to separate tables. A call is
+    stored as one row once it returns. Rows are inserted in batches, each in a single
+    transaction, and the indexes are built when the sink is closed, which is much faster
+    than maintaining them during the inserts. See objwatch.trace_query for querying.
+    """
+
+    def __init__(self, path: str, batch_size: int = Constants.SQLITE_BATCH_SIZE) -> None:
+        """
+        Initialize the sink and create a new database, replacing any existing one.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            batch_size (int): Number of rows inserted in one transaction.
+        """
+        for stale in (path, f"{path}-wal", f"{path}-shm", f"{path}-journal"):
+            if os.path.exists(stale):
+                os.remove(stale)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        # Durability is not needed for a trace, losing the last batch on a crash is acceptable
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=OFF')
+        self.connection.executescript(SCHEMA)
+        self.batch_size = batch_size
+        self.calls: List[Tuple[Any, ...]] = []
+        self.updates: List[Tuple[Any, ...]] = []
+        self.changes: List[Tuple[Any, ...]] = []
+        self.folds: List[Tuple[Any, ...]] = []
+        # Calls that have not returned yet: (call id, parent id, start seq, run record)
+        self.open_calls: List[Tuple[int, Optional[int], int, EventRecord]] = []
+        self.next_call_id: int = 1
+        self.seq: int = 0
+
+    def emit(self, record: EventRecord) -> None:
+        """
+        Queue a record for insertion, inserting the queued rows when the batch is full.
+
+        Args:
+            record (EventRecord): The event record to store.
+        """
+        self.seq += 1
+        event_type = record.event_type
+        if event_type is EventType.RUN:
+            parent_id = self.open_calls[-1][0] if self.open_calls else None
+            self.open_calls.append((self.next_call_id, parent_id, self.seq, record))
+            self.next_call_id += 1
+            return
+        if event_type is EventType.END:
+            if self.open_calls:
+                self._add_call(self.open_calls.pop(), record)
+        else:
+            call_id = self.open_calls[-1][0] if self.open_calls else None
+            if event_type is EventType.UPD:
+                self.updates.append(
+                    (
+                        self.seq,
+                        record.process_index,
+                        call_id,
+                        record.name,
+                        record.lineno,
+                        record.call_depth,
+                        record.timestamp,
+                        record.old,
+                        record.new,
+                        record.kind,
+                    )
+                )
+            elif event_type is EventType.FLD:
+                self.folds.append(
+                    (
+                        self.seq,
+                        record.process_index,
+                        call_id,
+                        record.name,
+                        record.lineno,
+                        record.call_depth,
+                        record.timestamp,
+                        record.new,
+                    )
+                )
+            else:
+                self.changes.append(
+                    (
+                        self.seq,
+                        record.process_index,
+                        call_id,
+                        record.name,
+                        record.lineno,
+                        record.call_depth,
+                        record.timestamp,
+                        event_type.label,
+                        record.kind,
+                        record.old,
+                        record.new,
+                    )
+                )
+        if len(self.calls) + len(self.updates) + len(self.changes) + len(self.folds) >= self.batch_size:
+            self.flush()
+
+    def _add_call(self, call: Tuple[int, Optional[int], int, EventRecord], end: Optional[EventRecord]) -> None:
+        """
+        Queue the row of a call.
+
+        Args:
+            call (Tuple[int, Optional[int], int, EventRecord]): Id, parent id, start seq and run record of the call.
+            end (Optional[EventRecord]): The end record, None if the call has not returned.
+        """
+        call_id, parent_id, start_seq, run = call
+        self.calls.append(
+            (
+                call_id,
+                parent_id,
+                run.process_index,
+                run.name,
+                run.kind,
+                run.call_depth,
+                run.lineno,
+                end.lineno if end else None,
+                start_seq,
+                self.seq if end else None,
+                run.timestamp,
+                end.timestamp if end else None,
+                run.new,
+                end.new if end else None,
+                end.old if end else None,
+            )
+        )
+
+    def flush(self) -> None:
+        """
+        Insert the queued rows in a single transaction.
+        """
+        with self.connection:
+            if self.calls:
+                self.connection.executemany('INSERT INTO calls VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)', self.calls)
+            if self.updates:
+                self.connection.executemany('INSERT INTO updates VALUES (?,?,?,?,?,?,?,?,?,?)', self.updates)
+            if self.changes:
+                self.connection.executemany(
+                    'INSERT INTO collection_changes VALUES (?,?,?,?,?,?,?,?,?,?,?)', self.changes
+                )
+            if self.folds:
+                self.connection.executemany('INSERT INTO folds VALUES (?,?,?,?,?,?,?,?)', self.folds)
+        self.calls = []
+        self.updates = []
+        self.changes = []
+        self.folds = []
+
+    def close(self) -> None:
+        """
+        Store the remaining rows and calls that have not returned, build the indexes and close the database.
+        """
+        while self.open_calls:
+            self._add_call(self.open_calls.pop(), None)
+        self.flush()
+        self.connection.executescript(INDEXES)
+        try:
+            # Leave a single file that can also be opened read-only where no -wal and -shm files can be created
+            self.connection.execute('PRAGMA journal_mode=DELETE')
+        except sqlite3.OperationalError:
+            # The database is being queried, it stays in WAL mode
+            pass
+        self.connection.close()
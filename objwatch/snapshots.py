@@ -0,0 +1,96 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import weakref
+from typing import Any, Callable, Optional
+
+from .constants import Constants
+
+
+class FormattedValue(str):
+    """
+    Text of a value formatted when its snapshot was taken, logged as it is in place of the value.
+    """
+
+
+class Snapshot:
+    """
+    What change detection needs to know about the value of a tracked variable, without keeping the value alive.
+
+    Directly loggable values, e.g. numbers and strings, are immutable and kept as they are. Other values,
+    e.g. tensors, arrays and large lists, are replaced by their identity, a weak reference if they support
+    it, and their text preformatted with the bounded formatting of logged values, so that a replaced value
+    is freed as soon as the program drops it.
+    """
+
+    __slots__ = ('value_id', 'value_type', 'value', 'ref', 'text')
+
+    def __init__(self, value: Any, formatter: Callable[[Any], str]) -> None:
+        """
+        Take the snapshot of a value.
+
+        Args:
+            value (Any): The value of the variable.
+            formatter (Callable[[Any], str]): Formats the values that are not kept.
+        """
+        self.value_id: int = id(value)
+        self.value_type: type = type(value)
+        self.value: Any = None
+        self.ref: Optional[weakref.ref] = None
+        self.text: Optional[str] = None
+        if isinstance(value, Constants.LOG_ELEMENT_TYPES):
+            self.value = value
+            return
+        try:
+            self.ref = weakref.ref(value)
+        except TypeError:
+            pass
+        self.text = formatter(value)
+
+    def is_value(self, value: Any) -> bool:
+        """
+        Check whether the variable still refers to the object of the snapshot.
+
+        Without a weak reference, the object is recognized by its id and type: an object allocated
+        at the address of a freed one of the same type within the same line is taken for it.
+
+        Args:
+            value (Any): The current value of the variable.
+
+        Returns:
+            bool: True if the value is the object of the snapshot.
+        """
+        if self.text is None:
+            return self.value is value
+        if self.ref is not None:
+            referent = self.ref()
+            return referent is not None and referent is value
+        return self.value_id == id(value) and self.value_type is type(value)
+
+    def old_value(self) -> Any:
+        """
+        Get the value to log as the old value of an update.
+
+        Returns:
+            Any: The kept value, or its preformatted text.
+        """
+        if self.text is None:
+            return self.value
+        return FormattedValue(self.text)
+
+
+def snapshot_value(snapshot: Optional[Snapshot]) -> Any:
+    """
+    Get the value to log as the old value of an update from an optional snapshot, None without a snapshot.
+    """
+    return snapshot.old_value() if snapshot is not None else None
+
+
+def is_same_value(snapshot: Optional[Snapshot], value: Any) -> bool:
+    """
+    Check whether a variable still refers to the object of its snapshot, None standing for a variable without
+    a snapshot.
+    """
+    if snapshot is None:
+        return value is None
+    return snapshot.is_value(value)
@@ -66,6 +66,72 @@ def deep_merge(source: dict, update: dict) -> dict:
     return source
 
 
+def merge_targets(targets: dict, update: dict) -> Set[str]:
+    """Add processed targets to a processed target dictionary in place.
+
+    Unlike deep_merge, a class tracked as a whole stays tracked as a whole
+    when some of its members are added.
+
+    Args:
+        targets: Processed targets to update, as returned by Targets.get_targets()
+        update: Processed targets to add
+
+    Returns:
+        Set[str]: Names of the modules whose targets were updated
+    """
+    for module, details in update.items():
+        current = targets.setdefault(module, {'classes': {}, 'functions': [], 'globals': []})
+        classes = current.setdefault('classes', {})
+        for cls_name, cls_info in details.get('classes', {}).items():
+            current_info = classes.setdefault(cls_name, {'methods': [], 'attributes': [], 'track_all': False})
+            current_info['track_all'] = current_info.get('track_all', False) or cls_info.get('track_all', False)
+            for key in ('methods', 'attributes'):
+                current_info[key] = list(dict.fromkeys(current_info.get(key, []) + cls_info.get(key, [])))
+        for key in ('functions', 'globals'):
+            current[key] = list(dict.fromkeys(current.get(key, []) + details.get(key, [])))
+    return set(update)
+
+
+def subtract_targets(targets: dict, removal: dict) -> Set[str]:
+    """Remove processed targets from a processed target dictionary in place.
+
+    Classes given as a whole are removed with all their members, members of a class
+    tracked as a whole are left to exclude_targets. Modules left without any target are removed.
+
+    Args:
+        targets: Processed targets to update, as returned by Targets.get_targets()
+        removal: Processed targets to remove
+
+    Returns:
+        Set[str]: Names of the modules whose targets were updated
+    """
+    changed = set()
+    for module, details in removal.items():
+        current = targets.get(module)
+        if current is None:
+            continue
+        changed.add(module)
+        classes = current.get('classes', {})
+        for cls_name, cls_info in details.get('classes', {}).items():
+            current_info = classes.get(cls_name)
+            if current_info is None:
+                continue
+            if cls_info.get('track_all', False):
+                del classes[cls_name]
+                continue
+            for key in ('methods', 'attributes'):
+                removed = set(cls_info.get(key, []))
+                current_info[key] = [name for name in current_info.get(key, []) if name not in removed]
+            if not (current_info.get('track_all', False) or current_info['methods'] or current_info['attributes']):
+                del classes[cls_name]
+        for key in ('functions', 'globals'):
+            removed = set(details.get(key, []))
+            current[key] = [name for name in current.get(key, []) if name not in removed]
+        if not (classes or current['functions'] or current['globals']):
+            del targets[module]
+    return changed
+
+
 class Targets:
     """
     Target processor for monitoring file changes and module structures.
@@ -0,0 +1,287 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import re
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .sinks.sqlite_sink import INDEXES
+
+# Names of the indexes built by the sink when it is closed
+INDEX_NAMES = frozenset(re.findall(r'CREATE INDEX IF NOT EXISTS (\w+)', INDEXES))
+
+
+class TraceQuery:
+    """
+    Query API over a SQLite trace database written with `output_sqlite`.
+
+    All lookups by name, process index (rank), time or event order are served by indexes,
+    so they stay fast on databases with hundreds of millions of events.
+
+    The database is opened read-only, so it can be queried while a traced process is still
+    writing it, and from read-only files.
+    """
+
+    def __init__(self, path: str, build_indexes: bool = False) -> None:
+        """
+        Open a trace database.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            build_indexes (bool): Build the indexes if they are missing, because tracing did not stop cleanly.
+                This opens the database for writing, which must not be done while it is still being written.
+        """
+        if build_indexes:
+            connection = sqlite3.connect(path)
+            try:
+                if self._missing_indexes(connection):
+                    connection.executescript(INDEXES)
+            finally:
+                connection.close()
+        self.connection = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+        self.connection.row_factory = sqlite3.Row
+
+    @staticmethod
+    def _missing_indexes(connection: sqlite3.Connection) -> bool:
+        """
+        Check whether indexes of the trace tables are missing.
+
+        Args:
+            connection (sqlite3.Connection): Connection to the database.
+
+        Returns:
+            bool: True if at least one index is missing.
+        """
+        rows = connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return not INDEX_NAMES.issubset(row[0] for row in rows)
+
+    def has_indexes(self) -> bool:
+        """
+        Check whether all indexes of the trace tables exist. They are built when tracing stops;
+        without them queries still work, but scan whole tables.
+
+        Returns:
+            bool: True if all indexes exist.
+        """
+        return not self._missing_indexes(self.connection)
+
+    def __enter__(self) -> 'TraceQuery':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        self.connection.close()
+
+    def sql(self, query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        Run an arbitrary SQL query.
+
+        Args:
+            query (str): The SQL query.
+            params (Sequence[Any]): Parameters of the query.
+
+        Returns:
+            List[Dict[str, Any]]: The result rows.
+        """
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def call_span(self, call_id: int) -> Tuple[int, Optional[int]]:
+        """
+        Get the range of events covered by a call.
+
+        Args:
+            call_id (int): Id of the call.
+
+        Returns:
+            Tuple[int, Optional[int]]: Sequence numbers of the run and end events, the end is None
+            if the call did not return.
+        """
+        row = self.connection.execute('SELECT start_seq, end_seq FROM calls WHERE id = ?', (call_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No call with id {call_id}")
+        return row['start_seq'], row['end_seq']
+
+    def _select(
+        self,
+        table: str,
+        name_column: str,
+        seq_column: str,
+        time_column: str,
+        name: Optional[str],
+        rank: Optional[int],
+        start_ns: Optional[int],
+        end_ns: Optional[int],
+        between: Optional[Tuple[int, int]],
+        limit: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        """
+        Select the rows of a table matching all given filters, in event order.
+
+        Args:
+            table (str): The table to select from.
+            name_column (str): Column holding the name.
+            seq_column (str): Column holding the event sequence number.
+            time_column (str): Column holding the timestamp.
+            name (Optional[str]): Exact name to match.
+            rank (Optional[int]): Process index to match.
+            start_ns (Optional[int]): Earliest timestamp in nanoseconds.
+            end_ns (Optional[int]): Latest timestamp in nanoseconds.
+            between (Optional[Tuple[int, int]]): Ids of two calls, only events from the start of the
+                first call to the end of the second call match.
+            limit (Optional[int]): Maximum number of rows.
+
+        Returns:
+            List[Dict[str, Any]]: The matching rows.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        if name is not None:
+            conditions.append(f'{name_column} = ?')
+            params.append(name)
+        if rank is not None:
+            conditions.append('rank = ?')
+            params.append(rank)
+        if start_ns is not None:
+            conditions.append(f'{time_column} >= ?')
+            params.append(start_ns)
+        if end_ns is not None:
+            conditions.append(f'{time_column} <= ?')
+            params.append(end_ns)
+        if between is not None:
+            first_seq = self.call_span(between[0])[0]
+            last_seq = self.call_span(between[1])[1]
+            conditions.append(f'{seq_column} >= ?')
+            params.append(first_seq)
+            if last_seq is not None:
+                conditions.append(f'{seq_column} <= ?')
+                params.append(last_seq)
+
+        query = f'SELECT * FROM {table}'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += f' ORDER BY {seq_column}'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return self.sql(query, params)
+
+    def calls(
+        self,
+        qualified_name: Optional[str] = None,
+        rank: Optional[int] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        between: Optional[Tuple[int, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find function calls, in the order they started.
+
+        Args:
+            qualified_name (Optional[str]): Qualified name of the function.
+            rank (Optional[int]): Process index.
+            start_ns (Optional[int]): Earliest start time in nanoseconds.
+            end_ns (Optional[int]): Latest start time in nanoseconds.
+            between (Optional[Tuple[int, int]]): Ids of two calls bounding the matching calls.
+            limit (Optional[int]): Maximum number of calls.
+
+        Returns:
+            List[Dict[str, Any]]: The matching calls.
+        """
+        return self._select(
+            'calls', 'qualified_name', 'start_seq', 'start_ns', qualified_name, rank, start_ns, end_ns, between, limit
+        )
+
+    def updates(
+        self,
+        name: Optional[str] = None,
+        rank: Optional[int] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        between: Optional[Tuple[int, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find variable updates, in the order they occurred.
+
+        Args:
+            name (Optional[str]): Name of the variable, e.g. 'Model.lr'.
+            rank (Optional[int]): Process index.
+            start_ns (Optional[int]): Earliest time in nanoseconds.
+            end_ns (Optional[int]): Latest time in nanoseconds.
+            between (Optional[Tuple[int, int]]): Ids of two calls bounding the matching updates.
+            limit (Optional[int]): Maximum number of updates.
+
+        Returns:
+            List[Dict[str, Any]]: The matching updates.
+        """
+        return self._select('updates', 'name', 'seq', 'ts', name, rank, start_ns, end_ns, between, limit)
+
+    def collection_changes(
+        self,
+        name: Optional[str] = None,
+        rank: Optional[int] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        between: Optional[Tuple[int, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find elements added to or removed from collections, in the order they occurred.
+
+        Args:
+            name (Optional[str]): Name of the collection, e.g. 'Model.history'.
+            rank (Optional[int]): Process index.
+            start_ns (Optional[int]): Earliest time in nanoseconds.
+            end_ns (Optional[int]): Latest time in nanoseconds.
+            between (Optional[Tuple[int, int]]): Ids of two calls bounding the matching changes.
+            limit (Optional[int]): Maximum number of changes.
+
+        Returns:
+            List[Dict[str, Any]]: The matching changes.
+        """
+        return self._select('collection_changes', 'name', 'seq', 'ts', name, rank, start_ns, end_ns, between, limit)
+
+
+def main() -> None:
+    """
+    Query a SQLite trace database from the command line and print the matching rows.
+    """
+    parser = argparse.ArgumentParser(description='Query an ObjWatch SQLite trace database')
+    parser.add_argument('database', help='Path to the SQLite trace database')
+    parser.add_argument('table', choices=['calls', 'updates', 'collection_changes', 'sql'], help='What to query')
+    parser.add_argument('-n', '--name', help='Qualified name of the function or name of the variable')
+    parser.add_argument('-r', '--rank', type=int, help='Process index')
+    parser.add_argument('--start-ns', type=int, help='Earliest time in nanoseconds')
+    parser.add_argument('--end-ns', type=int, help='Latest time in nanoseconds')
+    parser.add_argument('--between', type=int, nargs=2, metavar=('FIRST_CALL', 'LAST_CALL'), help='Bounding call ids')
+    parser.add_argument('-l', '--limit', type=int, help='Maximum number of rows')
+    parser.add_argument('-q', '--query', help='SQL query, for the sql table choice')
+    parser.add_argument(
+        '--build-indexes', action='store_true', help='Build missing indexes, when tracing did not stop cleanly'
+    )
+    args = parser.parse_args()
+
+    with TraceQuery(args.database, build_indexes=args.build_indexes) as trace:
+        if args.table == 'sql':
+            if not args.query:
+                parser.error("--query is required for sql")
+            rows = trace.sql(args.query)
+        else:
+            between = tuple(args.between) if args.between else None
+            rows = getattr(trace, args.table)(
+                args.name, args.rank, args.start_ns, args.end_ns, between, args.limit
+            )
+    for row in rows:
+        print('\t'.join(str(value) for value in row.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,60 @@
 # MIT License
 # Copyright (c) 2025 aeeeeeep
 
+import os
 import sys
-from functools import lru_cache
-from types import FrameType
-from typing import Optional, Any, Dict, Set
+import weakref
+from dataclasses import replace
+from functools import partial, wraps
+from types import CodeType, FrameType
+from typing import Optional, Any, Callable, Dict, Iterable, List, Set, Tuple, TypeVar
 
 from .constants import Constants
 from .config import ObjWatchConfig
-from .targets import Targets
+from .targets import Targets, TargetsType, merge_targets, subtract_targets
 from .wrappers import ABCWrapper
-from .events import EventType
+from .events import EventType, FunctionInfo
 from .event_handls import EventHandls
+from .fingerprint import fingerprint
+from .frame_state import FrameState
+from .object_state import ObjectStates
+from .profiler import StageProfiler
+from .snapshots import Snapshot, is_same_value, snapshot_value
 from .mp_handls import MPHandls
-from .utils.weak import WeakIdKeyDictionary
-from .utils.logger import log_info, log_error
+from .trigger import Trigger, TraceWindow
+from .sinks import CollectorSink, ChromeTraceSink, RingBufferSink, SQLiteSink
+from .utils.util import per_process_path
+from .utils.logger import log_info, log_warn, log_error, redirect_file_handler
 from .runtime_info import runtime_info
 
 
+CheckType = TypeVar('CheckType', bound=Callable[..., bool])
+
+
+def cached_check(check: CheckType) -> CheckType:
+    """
+    Cache the results of a target check per tracer instance. Unlike a shared lru_cache, entries
+    can be dropped selectively when the targets change, see Tracer._invalidate_checks.
+
+    Args:
+        check (CheckType): The check method, its first argument is a module name or a filename.
+
+    Returns:
+        CheckType: The caching method.
+    """
+    name = check.__name__
+
+    @wraps(check)
+    def cached(self, *args):
+        cache = self.check_caches[name]
+        result = cache.get(args)
+        if result is None:
+            result = cache[args] = check(self, *args)
+        return result
+
+    return cached  # type: ignore[return-value]
+
+
 class Tracer:
     """
     Tracer class to monitor and trace function calls, returns, and variable updates
@@ -37,12 +74,8 @@ class Tracer:
 
         self.config = config
 
-        if self.config.with_locals:
-            self.tracked_locals: Dict[FrameType, dict] = {}
-            self.tracked_locals_lens: Dict[FrameType, Dict[str, int]] = {}
-
         if self.config.with_globals:
-            self.tracked_globals: Dict[FrameType, dict] = {}
+            self.tracked_globals: Dict[str, Dict[str, Snapshot]] = {}
             self.tracked_globals_lens: Dict[FrameType, Dict[str, int]] = {}
             # List of Python built-in fields to exclude from tracking
             self.builtin_fields = set(dir(__builtins__)) | {
@@ -56,6 +89,23 @@ class Tracer:
                 '__cached__',
             }
 
+        # Results of the target checks, by check method and arguments
+        self.check_caches: Dict[str, Dict[tuple, bool]] = {
+            name: {}
+            for name in (
+                '_should_trace_module',
+                '_should_trace_class',
+                '_should_trace_method',
+                '_should_trace_attribute',
+                '_should_trace_function',
+                '_should_trace_global',
+                '_filename_endswith',
+            )
+        }
+
+        # Information about the traced functions, by code object and class name, see _get_function_info
+        self.function_infos: Dict[Tuple[CodeType, Optional[str]], FunctionInfo] = {}
+
         # Process and determine the set of target files to monitor
         targets_cls = Targets(self.config.targets, self.config.exclude_targets)
         self.filename_targets: Set = targets_cls.get_filename_targets()
@@ -67,6 +117,10 @@ class Tracer:
 
         # Load the function wrapper if provided
         self.abc_wrapper: Optional[ABCWrapper] = self.load_wrapper(self.config.wrapper)
+        # Formats the values of tracked variables that their snapshots do not keep
+        self.snapshot_formatter: Callable[[Any], str] = (
+            self.abc_wrapper._format_value if self.abc_wrapper is not None else EventHandls._format_value
+        )
 
         # Initialize multi-process handler with the specified framework
         self.mp_handlers: MPHandls = MPHandls(framework=self.config.framework)
@@ -74,6 +128,16 @@ class Tracer:
         self.current_index: Optional[int] = None
         self.indexes: Set[int] = set(self.config.indexes if self.config.indexes is not None else [0])
 
+        # Whether tracing was started, and whether the trace function is currently installed
+        self.is_started: bool = False
+        self.is_tracing: bool = False
+        # Ids of frames inherited from the parent process across a fork
+        self.forked_frames: Set[int] = set()
+        # Profiler of the stages of event processing with self_profile, created when tracing starts
+        self.profiler: Optional[StageProfiler] = None
+        if self.config.fork_safe:
+            self._register_at_fork()
+
     def _initialize_tracking_state(self) -> None:
         """
         Initialize all tracking state including dictionaries, handlers, and counters.
@@ -81,16 +145,166 @@ class Tracer:
         # Initialize event handlers with optional JSON output
         self.event_handlers: EventHandls = EventHandls(config=self.config)
 
-        # Initialize tracking dictionaries for objects
-        self.tracked_objects: WeakIdKeyDictionary = WeakIdKeyDictionary()
-        self.tracked_objects_lens: WeakIdKeyDictionary = WeakIdKeyDictionary()
+        # Send events to a central trace collector instead of the logger
+        if self.config.collector:
+            self.event_handlers.add_sink(CollectorSink(self.mp_handlers, self.config.collector))
+
+        # Write events to a ring buffer drained by an external reader
+        if self.config.ring_buffer:
+            self.event_handlers.add_sink(RingBufferSink(self.config.ring_buffer, self.config.ring_buffer_size))
+
+        # Stream events to a timeline viewer compatible trace
+        if self.config.chrome_trace:
+            self.event_handlers.add_sink(ChromeTraceSink(self.config.chrome_trace))
 
-        # Initialize last line numbers dictionary for tracking previous line in line events
-        self.last_linenos: Dict[FrameType, int] = {}
+        # Store events in a database for ad-hoc queries
+        if self.config.output_sqlite:
+            self.event_handlers.add_sink(SQLiteSink(self.config.output_sqlite))
+
+        # Initialize tracking states for objects, holding the snapshots, lengths and fingerprints of their attributes
+        self.tracked_objects: ObjectStates = ObjectStates()
+
+        # Memory fingerprints of the buffers among the tracked variables, to detect in-place modifications
+        self.detect_buffer_changes: bool = self.config.detect_buffer_changes
+        self.tracked_globals_fingerprints: Dict[str, Dict[str, int]] = {}
 
         # Initialize call depth tracker
         self._call_depth: int = 0
 
+        # Call depth from which calls are not traced, lowered within the subtrees limited by max_subtree_depth
+        self.depth_limit: int = self.config.max_depth if self.config.max_depth is not None else sys.maxsize
+        self.subtree_depths: Dict[str, int] = dict(self.config.max_subtree_depth or {})
+        # Limits to restore when the calls that lowered them return: (call depth, previous limit)
+        self.depth_limits: List[Tuple[int, int]] = []
+        # Number of calls that were not traced below the calls in progress, by the depth of those calls
+        self.elided_calls: Dict[int, int] = {}
+
+        # Number of calls of the trigger function, and the window of calls traced once it has fired
+        self.trigger_calls: int = 0
+        self.trace_window: Optional[TraceWindow] = None
+        self.window_closed: bool = False
+
+        # Time spent per stage of event processing, measured only with self-profiling
+        self.profiler = None
+        if self.config.self_profile:
+            self.profiler = StageProfiler()
+            self._instrument(self.profiler)
+
+        # Values are formatted with the limits of this configuration, other tracers keep their own
+        if self.abc_wrapper is not None:
+            self.abc_wrapper.format_limits = self.event_handlers.format_limits
+            self.snapshot_formatter = self.abc_wrapper._format_value
+        else:
+            self.snapshot_formatter = partial(self.event_handlers._format_value, limits=self.event_handlers.format_limits)
+
+    def _instrument(self, profiler: StageProfiler) -> None:
+        """
+        Time the stages of event processing of the tracer, the event handlers and the wrapper.
+
+        Args:
+            profiler (StageProfiler): The profiler accumulating the time of the stages.
+        """
+        profiler.instrument(self, '_should_trace_frame', 'targets')
+        for name in ('_update_objects_lens', '_track_object_change', '_track_locals_change', '_track_globals_change'):
+            profiler.instrument(self, name, 'changes')
+
+        handlers = self.event_handlers
+        profiler.instrument(handlers, '_format_value', 'format')
+        profiler.instrument(handlers, '_log_event', 'log')
+        profiler.instrument(handlers, '_emit_record', 'sinks')
+        for name in ('_add_json_run', '_add_json_end', '_add_json_update', '_add_json_collection_change'):
+            profiler.instrument(handlers, name, 'json')
+        for event_type in ('run', 'end', 'upd', 'apd', 'pop'):
+            profiler.instrument(handlers, f'handle_{event_type}', f'event:{event_type}')
+
+        if self.abc_wrapper is not None:
+            profiler.instrument(self.abc_wrapper, '_format_value', 'format')
+            for name in ('wrap_call', 'wrap_return', 'wrap_upd'):
+                profiler.instrument(self.abc_wrapper, name, 'wrapper')
+
+    def _register_at_fork(self) -> None:
+        """
+        Register a hook that resets the tracing state in forked child processes.
+        Only a weak reference to the tracer is kept so that it can still be garbage collected.
+        """
+        if not hasattr(os, 'register_at_fork'):
+            log_warn("os.register_at_fork is not available on this platform, fork_safe is ignored.")
+            return
+
+        tracer_ref = weakref.ref(self)
+
+        def before() -> None:
+            # Buffered sink output would otherwise be written again by the child
+            tracer = tracer_ref()
+            if tracer is not None and tracer.is_tracing:
+                tracer.event_handlers.flush_sinks()
+
+        def after_in_child() -> None:
+            tracer = tracer_ref()
+            if tracer is not None and tracer.is_tracing:
+                tracer._reset_after_fork()
+
+        os.register_at_fork(before=before, after_in_child=after_in_child)
+
+    def _reset_after_fork(self) -> None:
+        """
+        Reset the per-process tracing state in a forked child process and redirect its outputs
+        to per-process files. The parsed targets and their lookup indexes are reused as they are.
+        """
+        pid = os.getpid()
+
+        # The parent's handlers are inherited through atexit and signals, keep them from writing its outputs
+        self.event_handlers.abandon()
+
+        self.config = replace(
+            self.config,
+            output=per_process_path(self.config.output, pid) if self.config.output else None,
+            output_json=per_process_path(self.config.output_json, pid) if self.config.output_json else None,
+            ring_buffer=per_process_path(self.config.ring_buffer, pid) if self.config.ring_buffer else None,
+            chrome_trace=per_process_path(self.config.chrome_trace, pid) if self.config.chrome_trace else None,
+            output_sqlite=per_process_path(self.config.output_sqlite, pid) if self.config.output_sqlite else None,
+        )
+        if self.config.output:
+            redirect_file_handler(self.config.output)
+
+        # The process index is detected again once the child process is bootstrapped
+        self.mp_handlers.reset()
+        self.current_index = None
+        self.index_info = ""
+
+        if self.config.with_globals:
+            self.tracked_globals = {}
+            self.tracked_globals_lens = {}
+        self._initialize_tracking_state()
+
+        # Frames entered before the fork will return in this process without a matching call event
+        self.forked_frames = set()
+        frame: Optional[FrameType] = sys._getframe()
+        while frame is not None:
+            self.forked_frames.add(id(frame))
+            frame = frame.f_back
+
+        # multiprocessing children leave through os._exit, which skips atexit
+        if 'multiprocessing' in sys.modules:
+            from multiprocessing import util
+
+            util.register_after_fork(self, Tracer._register_exit_save)
+
+    def _register_exit_save(self) -> None:
+        """
+        Save the outputs when a multiprocessing child process exits.
+        """
+        from multiprocessing import util
+
+        util.Finalize(self, self._save_outputs, exitpriority=0)
+
+    def _save_outputs(self) -> None:
+        """
+        Save the JSON output and close the output sinks.
+        """
+        self.event_handlers.save_json()
+        self.event_handlers.close_sinks()
+
     @property
     def call_depth(self) -> int:
         return self._call_depth
@@ -108,7 +322,7 @@ class Tracer:
 
     def _build_target_index(self):
         """Build fast lookup indexes for monitoring targets."""
-        self.module_index = set(self.targets.keys())
+        self.module_index = set()
         self.class_index = {}
         self.method_index = {}
         self.attribute_index = {}
@@ -116,8 +330,31 @@ class Tracer:
         self.global_index = {}
         self.class_info = {}  # Store class info for track_all checking
 
-        # Build indexes for track_all scenarios
-        for module, details in self.targets.items():
+        self.index_map = {
+            'class': self.class_index,
+            'method': self.method_index,
+            'attribute': self.attribute_index,
+            'function': self.function_index,
+            'global': self.global_index,
+        }
+        self._index_targets(self.targets)
+
+    def _index_targets(self, modules: Iterable[str]) -> None:
+        """Build the index entries of some modules of the monitoring targets, replacing their current entries.
+
+        Args:
+            modules (Iterable[str]): Names of the modules to index
+        """
+        for module in modules:
+            self.module_index.discard(module)
+            self.class_info.pop(module, None)
+            for index in self.index_map.values():
+                index.pop(module, None)
+            details = self.targets.get(module)
+            if details is None:
+                continue
+            self.module_index.add(module)
+
             # Process classes
             classes = details.get('classes', {})
             for cls_name, cls_info in classes.items():
@@ -149,17 +386,9 @@ class Tracer:
             for gvar in details.get('globals', []):
                 self.global_index.setdefault(module, set()).add(gvar)
 
-        self.index_map = {
-            'class': self.class_index,
-            'method': self.method_index,
-            'attribute': self.attribute_index,
-            'function': self.function_index,
-            'global': self.global_index,
-        }
-
     def _build_exclude_target_index(self):
         """Build fast lookup indexes for exclusion targets."""
-        self.exclude_module_index = set(self.exclude_targets.keys())
+        self.exclude_module_index = set()
         self.exclude_class_index = {}
         self.exclude_method_index = {}
         self.exclude_attribute_index = {}
@@ -167,8 +396,31 @@ class Tracer:
         self.exclude_global_index = {}
         self.exclude_class_info = {}  # Store exclude class info for track_all checking
 
-        # Build indexes for exclusion targets
-        for module, details in self.exclude_targets.items():
+        self.exclude_index_map = {
+            'class': self.exclude_class_index,
+            'method': self.exclude_method_index,
+            'attribute': self.exclude_attribute_index,
+            'function': self.exclude_function_index,
+            'global': self.exclude_global_index,
+        }
+        self._index_exclude_targets(self.exclude_targets)
+
+    def _index_exclude_targets(self, modules: Iterable[str]) -> None:
+        """Build the index entries of some modules of the exclusion targets, replacing their current entries.
+
+        Args:
+            modules (Iterable[str]): Names of the modules to index
+        """
+        for module in modules:
+            self.exclude_module_index.discard(module)
+            self.exclude_class_info.pop(module, None)
+            for index in self.exclude_index_map.values():
+                index.pop(module, None)
+            details = self.exclude_targets.get(module)
+            if details is None:
+                continue
+            self.exclude_module_index.add(module)
+
             # Process excluded classes
             classes = details.get('classes', {})
             for cls_name, cls_info in classes.items():
@@ -198,13 +450,84 @@ class Tracer:
             for gvar in details.get('globals', []):
                 self.exclude_global_index.setdefault(module, set()).add(gvar)
 
-        self.exclude_index_map = {
-            'class': self.exclude_class_index,
-            'method': self.exclude_method_index,
-            'attribute': self.exclude_attribute_index,
-            'function': self.exclude_function_index,
-            'global': self.exclude_global_index,
-        }
+    def add_targets(self, targets: TargetsType, exclude_targets: Optional[TargetsType] = None) -> None:
+        """Add monitoring and exclusion targets, also while tracing.
+
+        Only the index entries of the affected modules and the check results
+        depending on them are rebuilt.
+
+        Args:
+            targets (TargetsType): Monitoring targets to add, in the formats of `targets`
+            exclude_targets (Optional[TargetsType]): Exclusion targets to add
+        """
+        update = Targets(targets, exclude_targets)
+        modules = merge_targets(self.targets, update.get_targets())
+        exclude_modules = merge_targets(self.exclude_targets, update.get_exclude_targets())
+        filenames = update.get_filename_targets() | update.get_exclude_filename_targets()
+        self.filename_targets |= update.get_filename_targets()
+        self.exclude_filename_targets |= update.get_exclude_filename_targets()
+        self._apply_target_changes(modules, exclude_modules, filenames)
+        log_info(f"Added targets: {targets}, exclude targets: {exclude_targets}")
+
+    def remove_targets(self, targets: TargetsType, exclude_targets: Optional[TargetsType] = None) -> None:
+        """Remove monitoring and exclusion targets, also while tracing.
+
+        Only the index entries of the affected modules and the check results
+        depending on them are rebuilt.
+
+        Args:
+            targets (TargetsType): Monitoring targets to remove, in the formats of `targets`
+            exclude_targets (Optional[TargetsType]): Exclusion targets to remove
+        """
+        removal = Targets(targets, exclude_targets)
+        modules = subtract_targets(self.targets, removal.get_targets())
+        exclude_modules = subtract_targets(self.exclude_targets, removal.get_exclude_targets())
+        filenames = removal.get_filename_targets() | removal.get_exclude_filename_targets()
+        self.filename_targets -= removal.get_filename_targets()
+        self.exclude_filename_targets -= removal.get_exclude_filename_targets()
+        self._apply_target_changes(modules, exclude_modules, filenames)
+        log_info(f"Removed targets: {targets}, exclude targets: {exclude_targets}")
+
+    def _apply_target_changes(self, modules: Set[str], exclude_modules: Set[str], filenames: Set[str]) -> None:
+        """Rebuild the indexes of changed modules, then drop the check results depending on them.
+
+        Args:
+            modules (Set[str]): Modules whose monitoring targets changed
+            exclude_modules (Set[str]): Modules whose exclusion targets changed
+            filenames (Set[str]): Filename targets added or removed
+        """
+        had_globals = bool(self.global_index)
+        self._index_targets(modules)
+        self._index_exclude_targets(exclude_modules)
+        # Without any global target, all globals of all modules are traced
+        self._invalidate_checks(modules | exclude_modules, filenames, had_globals != bool(self.global_index))
+
+    def _invalidate_checks(self, modules: Set[str], filenames: Set[str], all_globals: bool = False) -> None:
+        """Drop the cached check results that depend on changed targets.
+
+        The trace function keeps running meanwhile, so the caches are iterated over snapshots of their keys.
+
+        Args:
+            modules (Set[str]): Modules whose targets changed
+            filenames (Set[str]): Filename targets that changed
+            all_globals (bool): Drop all results of the global variable check
+        """
+        # The symbol types of the functions depend on the checks
+        self.function_infos.clear()
+        suffixes = tuple(filenames)
+        for name, cache in self.check_caches.items():
+            if name == '_filename_endswith':
+                if not suffixes:
+                    continue
+                for key in list(cache):
+                    if key[0].endswith(suffixes):
+                        cache.pop(key, None)
+            elif name == '_should_trace_global' and all_globals:
+                cache.clear()
+            elif modules:
+                for key in list(cache):
+                    if key[0] in modules:
+                        cache.pop(key, None)
 
     def load_wrapper(self, wrapper):
         """
@@ -223,7 +546,7 @@ class Tracer:
             raise ValueError(f"wrapper '{wrapper.__name__}' is not a subclass of ABCWrapper")
         return None
 
-    @lru_cache(maxsize=sys.maxsize)
+    @cached_check
     def _should_trace_module(self, module: str) -> bool:
         """Check if a module is within monitoring scope.
 
@@ -235,7 +558,7 @@ class Tracer:
         """
         return module in self.module_index and module not in self.exclude_module_index
 
-    @lru_cache(maxsize=sys.maxsize)
+    @cached_check
     def _should_trace_class(self, module: str, class_name: str) -> bool:
         """Check if a specific class should be traced.
 
@@ -250,7 +573,7 @@ class Tracer:
             module, set()
         )
 
-    @lru_cache(maxsize=sys.maxsize)
+    @cached_check
     def _should_trace_method(self, module: str, class_name: str, method_name: str) -> bool:
         """Check if a specific method should be traced.
 
@@ -271,7 +594,7 @@ class Tracer:
 
         return method_name in self.method_index.get(module, {}).get(class_name, set())
 
-    @lru_cache(maxsize=sys.maxsize)
+    @cached_check
     def _should_trace_attribute(self, module: str, class_name: str, attr_name: str) -> bool:
         """Check if a specific attribute should be traced.
 
@@ -292,7 +615,7 @@ class Tracer:
 
         return attr_name in self.attribute_index.get(module, {}).get(class_name, set())
 
-    @lru_cache(maxsize=sys.maxsize)
+    @cached_check
     def _should_trace_function(self, module: str, func_name: str) -> bool:
         """Check if a specific function should be traced.
 
@@ -307,7 +630,7 @@ class Tracer:
             module, set()
         )
 
-    @lru_cache(maxsize=sys.maxsize)
+    @cached_check
     def _should_trace_global(self, module: str, global_name: str) -> bool:
         """Check if a specific global variable should be traced.
 
@@ -328,7 +651,7 @@ class Tracer:
             module, set()
         )
 
-    @lru_cache(maxsize=sys.maxsize)
+    @cached_check
     def _filename_endswith(self, filename: str) -> bool:
         """
         Check if the filename does not end with any of the target extensions.
@@ -427,46 +750,139 @@ class Tracer:
         if 'self' in frame.f_locals:
             obj = frame.f_locals['self']
 
-            if hasattr(obj, '__dict__') and hasattr(obj.__class__, '__weakref__'):
+            if hasattr(obj, '__dict__'):
                 attrs: dict = {k: v for k, v in obj.__dict__.items() if not callable(v)}
-                if obj not in self.tracked_objects:
-                    self.tracked_objects[obj] = attrs
-                if obj not in self.tracked_objects_lens:
-                    self.tracked_objects_lens[obj] = {}
+                state = self.tracked_objects.get(obj)
+                if state is None:
+                    state = self.tracked_objects.add(obj)
+                    state.attrs = self._take_snapshots(attrs)
                 for k, v in attrs.items():
                     if isinstance(v, Constants.LOG_SEQUENCE_TYPES):
-                        self.tracked_objects_lens[obj][k] = len(v)
+                        state.attrs_lens[k] = len(v)
+                if self.detect_buffer_changes:
+                    self._record_fingerprints(state.attrs_fingerprints, attrs)
+
+    def _take_snapshots(self, values: dict) -> Dict[str, Snapshot]:
+        """
+        Take the snapshots of the values of tracked variables.
+
+        Args:
+            values (dict): Current values of the variables, by name.
+
+        Returns:
+            Dict[str, Snapshot]: Snapshots of the values, by name.
+        """
+        return {key: Snapshot(value, self.snapshot_formatter) for key, value in values.items()}
+
+    def _update_snapshot(
+        self, snapshots: Dict[str, Snapshot], key: str, value: Any, old_len: Optional[int], changed: bool
+    ) -> None:
+        """
+        Take a new snapshot of a variable if it refers to another object, or if its object was modified in place.
+
+        Args:
+            snapshots (Dict[str, Snapshot]): Snapshots of the variables of the same scope, by name.
+            key (str): The key (variable or attribute) being tracked.
+            value (Any): The current value of the variable or attribute.
+            old_len (Optional[int]): The tracked length of the value, if it is a sequence.
+            changed (bool): Whether the buffer of the value was modified in place.
+        """
+        snapshot = snapshots.get(key)
+        if (
+            changed
+            or not is_same_value(snapshot, value)
+            or (old_len is not None and isinstance(value, Constants.LOG_SEQUENCE_TYPES) and len(value) != old_len)
+        ):
+            snapshots[key] = Snapshot(value, self.snapshot_formatter)
+
+    @staticmethod
+    def _record_fingerprints(fingerprints: Dict[str, int], values: dict) -> None:
+        """
+        Record the memory fingerprints of the buffers among tracked variables.
+
+        Args:
+            fingerprints (Dict[str, int]): Fingerprints of the variables, by name.
+            values (dict): Current values of the variables, by name.
+        """
+        for key, value in values.items():
+            value_fingerprint = fingerprint(value)
+            if value_fingerprint is not None:
+                fingerprints[key] = value_fingerprint
+
+    def _track_buffer_change(
+        self,
+        fingerprints: Dict[str, int],
+        lineno: int,
+        class_name: str,
+        key: str,
+        old_value: Optional[Snapshot],
+        current_value: Any,
+    ) -> bool:
+        """
+        Emit an update for a buffer modified in place, whose memory fingerprint changed while the
+        variable kept referring to it.
+
+        Args:
+            fingerprints (Dict[str, int]): Fingerprints of the variables of the same scope, by name.
+            lineno (int): Line number where the change occurred.
+            class_name (str): Class name if the change relates to an object attribute.
+            key (str): The key (variable or attribute) being tracked.
+            old_value (Optional[Snapshot]): The snapshot of the old value of the variable or attribute.
+            current_value (Any): The current value of the variable or attribute.
+
+        Returns:
+            bool: True if the buffer was modified in place.
+        """
+        current_fingerprint = fingerprint(current_value)
+        if current_fingerprint is None:
+            fingerprints.pop(key, None)
+            return False
+        old_fingerprint = fingerprints.get(key)
+        fingerprints[key] = current_fingerprint
+        changed = old_fingerprint is not None and old_fingerprint != current_fingerprint
+        if changed and is_same_value(old_value, current_value):
+            self.event_handlers.handle_upd(
+                lineno,
+                class_name,
+                key,
+                snapshot_value(old_value),
+                current_value,
+                self.call_depth,
+                self.index_info,
+                self.abc_wrapper,
+            )
+        return changed
 
-    def _get_function_info(self, frame: FrameType) -> dict:
+    def _get_function_info(self, frame: FrameType) -> FunctionInfo:
         """
         Extract information about the currently executing function.
+        The information is built once per code object and class, and shared by all run and end events.
 
         Args:
             frame (FrameType): The current stack frame.
 
         Returns:
-            dict: Dictionary containing function information.
+            FunctionInfo: The names of the function.
         """
-        func_info = {}
-        module = frame.f_globals.get('__name__', '')
+        f_locals = frame.f_locals
+        cls = f_locals['self'].__class__.__name__ if 'self' in f_locals else None
+        key = (frame.f_code, cls)
+        func_info = self.function_infos.get(key)
+        if func_info is not None:
+            return func_info
 
-        if 'self' in frame.f_locals:
-            cls = frame.f_locals['self'].__class__.__name__
+        module = frame.f_globals.get('__name__', '')
+        if cls is not None:
             func_name = f"{cls}.{frame.f_code.co_name}"
             symbol_type = 'method' if self._should_trace_method(module, cls, func_name) else None
         else:
             func_name = frame.f_code.co_name
             symbol_type = 'function' if self._should_trace_function(module, func_name) else None
 
-        func_info.update(
-            {
-                'module': module,
-                'symbol': func_name,
-                'symbol_type': symbol_type,
-                'qualified_name': f"{module}.{func_name}" if module else func_name,
-                'frame': frame,
-            }
-        )
+        func_info = FunctionInfo(module, func_name, symbol_type)
+        if len(self.function_infos) >= Constants.FUNCTION_INFO_CACHE_SIZE:
+            self.function_infos.clear()
+        self.function_infos[key] = func_info
         return func_info
 
     def _handle_change_type(
@@ -474,7 +890,7 @@ class Tracer:
         lineno: int,
         class_name: str,
         key: str,
-        old_value: Optional[Any],
+        old_value: Optional[Snapshot],
         current_value: Any,
         old_value_len: Optional[int],
         current_value_len: Optional[int],
@@ -486,7 +902,7 @@ class Tracer:
             lineno (int): Line number where the change occurred.
             class_name (str): Class name if the change relates to an object attribute.
             key (str): The key (variable or attribute) being tracked.
-            old_value (Optional[Any]): The old value of the variable or attribute.
+            old_value (Optional[Snapshot]): The snapshot of the old value of the variable or attribute.
             current_value (Any): The current value of the variable or attribute.
             old_value_len (Optional[int]): The length of the old value (if applicable).
             current_value_len (Optional[int]): The length of the current value (if applicable).
@@ -500,7 +916,7 @@ class Tracer:
         else:
             change_type = EventType.UPD
 
-        if id(old_value) == id(current_value):
+        if is_same_value(old_value, current_value):
             if change_type == EventType.APD:
                 self.event_handlers.handle_apd(
                     lineno,
@@ -528,7 +944,7 @@ class Tracer:
                 lineno,
                 class_name,
                 key,
-                old_value,
+                snapshot_value(old_value),
                 current_value,
                 self.call_depth,
                 self.index_info,
@@ -550,9 +966,10 @@ class Tracer:
         class_name = obj.__class__.__name__
         should_trace_all_attrs = self._filename_endswith(frame.f_code.co_filename)
 
-        if obj in self.tracked_objects:
-            old_attrs = self.tracked_objects[obj]
-            old_attrs_lens = self.tracked_objects_lens[obj]
+        state = self.tracked_objects.get(obj)
+        if state is not None:
+            old_attrs = state.attrs
+            old_attrs_lens = state.attrs_lens
             module_name = frame.f_globals.get('__name__', '')
             current_attrs = {k: v for k, v in obj.__dict__.items() if not callable(v)}
 
@@ -575,24 +992,30 @@ class Tracer:
                     current_value_len,
                 )
 
-                old_attrs[key] = current_value
+                buffer_changed = False
+                if self.detect_buffer_changes:
+                    buffer_changed = self._track_buffer_change(
+                        state.attrs_fingerprints, lineno, class_name, key, old_value, current_value
+                    )
+
+                self._update_snapshot(old_attrs, key, current_value, old_value_len, buffer_changed)
                 if is_current_seq:
-                    self.tracked_objects_lens[obj][key] = len(current_value)
+                    old_attrs_lens[key] = len(current_value)
 
-    def _track_locals_change(self, frame: FrameType, lineno: int):
+    def _track_locals_change(self, frame: FrameType, lineno: int, state: FrameState):
         """
         Handle changes in local variables and track updates.
 
         Args:
             frame (FrameType): The current stack frame.
             lineno (int): The line number where the change occurred.
+            state (FrameState): The tracking state of the frame.
         """
-        if not self.config.with_locals or frame not in self.tracked_locals:
-            return
-
-        old_locals = self.tracked_locals[frame]
+        old_locals = state.locals
         current_locals = {k: v for k, v in frame.f_locals.items() if k != 'self' and not callable(v)}
-        old_locals_lens = self.tracked_locals_lens[frame]
+        old_locals_lens = state.locals_lens
+        # Snapshots of the current locals, those of deleted locals are dropped
+        snapshots: Dict[str, Snapshot] = {}
 
         added_vars = set(current_locals.keys()) - set(old_locals.keys())
         for var in added_vars:
@@ -609,12 +1032,18 @@ class Tracer:
                 abc_wrapper=self.abc_wrapper,
             )
 
+            snapshots[var] = Snapshot(current_local, self.snapshot_formatter)
             if isinstance(current_local, Constants.LOG_SEQUENCE_TYPES):
-                self.tracked_locals_lens[frame][var] = len(current_local)
+                old_locals_lens[var] = len(current_local)
+
+        if self.detect_buffer_changes:
+            locals_fingerprints = state.locals_fingerprints
+            self._record_fingerprints(locals_fingerprints, {var: current_locals[var] for var in added_vars})
 
         common_vars = set(old_locals.keys()) & set(current_locals.keys())
         for var in common_vars:
             old_local = old_locals[var]
+            snapshots[var] = old_local
             old_local_len = old_locals_lens.get(var, None)
             current_local = current_locals[var]
             is_current_seq = isinstance(current_local, Constants.LOG_SEQUENCE_TYPES)
@@ -623,11 +1052,17 @@ class Tracer:
             self._handle_change_type(
                 lineno, Constants.HANDLE_LOCALS_SYMBOL, var, old_local, current_local, old_local_len, current_local_len
             )
+            buffer_changed = False
+            if self.detect_buffer_changes:
+                buffer_changed = self._track_buffer_change(
+                    locals_fingerprints, lineno, Constants.HANDLE_LOCALS_SYMBOL, var, old_local, current_local
+                )
 
+            self._update_snapshot(snapshots, var, current_local, old_local_len, buffer_changed)
             if is_current_seq:
-                self.tracked_locals_lens[frame][var] = len(current_local)
+                old_locals_lens[var] = len(current_local)
 
-        self.tracked_locals[frame] = current_locals
+        state.locals = snapshots
 
     def _track_globals_change(self, frame: FrameType, lineno: int):
         """
@@ -661,8 +1096,18 @@ class Tracer:
             self._handle_change_type(
                 lineno, Constants.HANDLE_GLOBALS_SYMBOL, key, old_value, current_value, old_value_len, current_value_len
             )
+            buffer_changed = False
+            if self.detect_buffer_changes:
+                buffer_changed = self._track_buffer_change(
+                    self.tracked_globals_fingerprints.setdefault(module_name, {}),
+                    lineno,
+                    Constants.HANDLE_GLOBALS_SYMBOL,
+                    key,
+                    old_value,
+                    current_value,
+                )
 
-            self.tracked_globals[module_name][key] = current_value
+            self._update_snapshot(self.tracked_globals[module_name], key, current_value, old_value_len, buffer_changed)
             if is_current_seq:
                 self.tracked_globals_lens[module_name][key] = len(current_value)
 
@@ -674,7 +1119,7 @@ class Tracer:
             The trace function.
         """
 
-        def trace_func(frame: FrameType, event: str, arg: Any):
+        def trace_func(frame: FrameType, event: str, arg: Any, state: Optional[FrameState] = None):
             """
             This function is the actual trace function used by sys.settrace. It is called
             for every event (e.g., call, return, line) during code execution.
@@ -683,12 +1128,40 @@ class Tracer:
                 frame (FrameType): The current stack frame.
                 event (str): The type of event ('call', 'return', or 'line').
                 arg (Any): The argument for the event (e.g., return value for 'return').
+                state (Optional[FrameState]): The tracking state of the frame, passed by its local trace function.
 
             Returns:
-                Returns the trace function itself to continue tracing.
+                The local trace function of the frame for call events, the trace function itself otherwise.
             """
 
-            # Skip frames that do not match the filename condition
+            if event == "return":
+                if state is None:
+                    # The frame was not traced at its call event, its local trace function is only a filter
+                    return trace_func
+                if self.forked_frames and id(frame) in self.forked_frames:
+                    # The call event of this frame was handled in the parent process
+                    self.forked_frames.discard(id(frame))
+                    return trace_func
+
+                # Handle function return event
+                lineno = frame.f_back.f_lineno if frame.f_back else frame.f_lineno
+                self.call_depth -= 1
+                if self.depth_limits and self.depth_limits[-1][0] == self.call_depth:
+                    self.depth_limit = self.depth_limits.pop()[1]
+                elided = self.elided_calls.pop(self.call_depth + 1, 0) if self.elided_calls else 0
+                func_info = self._get_function_info(frame)
+                self._update_objects_lens(frame)
+                self.event_handlers.handle_end(
+                    lineno, func_info, self.abc_wrapper, self.call_depth, self.index_info, arg, elided
+                )
+                if self.window_closed and self.call_depth == 0:
+                    # The last call in progress of the trace window has returned
+                    self._end_trace_window()
+
+                return trace_func
+
+            # Skip frames that do not match the filename condition. Whether a frame is traced is decided
+            # at its call event, its return must not be checked again since targets may have changed meanwhile.
             if not self._should_trace_frame(frame):
                 return trace_func
 
@@ -697,71 +1170,133 @@ class Tracer:
                 if self.mp_handlers.is_initialized():
                     self.current_index = self.mp_handlers.get_index()
                     self.index_info = f"[#{self.current_index}] "
+                    self.event_handlers.process_index = self.current_index or 0
+                    self.event_handlers.log_index = True
             elif self.current_index not in self.indexes:
                 # Skip tracing for processes that are not part of the tracked indexes
                 return trace_func
 
             if event == "call":
+                if self.trace_window is not None and not self.trace_window.admit():
+                    self._close_trace_window()
+                if self.call_depth >= self.depth_limit:
+                    # Count the call instead of tracing it. Without a local trace function CPython
+                    # delivers no line or return events for the frame, its callees are counted here too.
+                    self.elided_calls[self.call_depth] = self.elided_calls.get(self.call_depth, 0) + 1
+                    return None
+
                 # Handle function call event
                 lineno = frame.f_back.f_lineno if frame.f_back else frame.f_lineno
                 func_info = self._get_function_info(frame)
                 self._update_objects_lens(frame)
-                self.event_handlers.handle_run(lineno, func_info, self.abc_wrapper, self.call_depth, self.index_info)
+                self.event_handlers.handle_run(
+                    lineno, func_info, self.abc_wrapper, self.call_depth, self.index_info, frame
+                )
+                subtree_depth = self.subtree_depths.get(func_info.qualified_name)
+                if subtree_depth is not None:
+                    self.depth_limits.append((self.call_depth, self.depth_limit))
+                    self.depth_limit = min(self.depth_limit, self.call_depth + subtree_depth + 1)
                 self.call_depth += 1
 
+                # The state of the frame lives in its local trace function and is freed with the frame,
+                # including frames unwound by exceptions and abandoned generators that never return
+                frame_state = FrameState()
                 # Track local variables if needed
                 if self.config.with_locals:
                     local_vars: dict = {k: v for k, v in frame.f_locals.items() if k != 'self' and not callable(v)}
-                    self.tracked_locals[frame] = local_vars
-                    self.tracked_locals_lens[frame] = {}
+                    frame_state.locals = self._take_snapshots(local_vars)
                     for var, value in local_vars.items():
                         if isinstance(value, Constants.LOG_SEQUENCE_TYPES):
-                            self.tracked_locals_lens[frame][var] = len(value)
+                            frame_state.locals_lens[var] = len(value)
+                    if self.detect_buffer_changes:
+                        self._record_fingerprints(frame_state.locals_fingerprints, local_vars)
 
-                return trace_func
+                def local_trace(frame: FrameType, event: str, arg: Any):
+                    trace_func(frame, event, arg, frame_state)
+                    # Returned through the frame rather than by name, which would make the function
+                    # part of a reference cycle and delay freeing the state until garbage collection
+                    return frame.f_trace
 
-            elif event == "return":
-                # Handle function return event
-                lineno = frame.f_back.f_lineno if frame.f_back else frame.f_lineno
-                self.call_depth -= 1
-                func_info = self._get_function_info(frame)
-                self._update_objects_lens(frame)
-                self.event_handlers.handle_end(
-                    lineno, func_info, self.abc_wrapper, self.call_depth, self.index_info, arg
-                )
-
-                # Clean up local tracking after function return
-                if self.config.with_locals and frame in self.tracked_locals:
-                    del self.tracked_locals[frame]
-                    del self.tracked_locals_lens[frame]
-
-                # Clean up last lineno tracking
-                if frame in self.last_linenos:
-                    del self.last_linenos[frame]
-
-                return trace_func
+                return local_trace
 
             elif event == "line":
                 # Handle line event (track changes at each line of code)
                 # Get previous line number instead of current line
-                if frame in self.last_linenos:
-                    lineno = self.last_linenos[frame]
+                if state is not None and state.lineno is not None:
+                    lineno = state.lineno
                 else:
                     # First line event for this frame, use current line as fallback
                     lineno = frame.f_lineno
                 # Update last lineno for next line event
-                self.last_linenos[frame] = frame.f_lineno
+                if state is not None:
+                    state.lineno = frame.f_lineno
 
                 self._track_object_change(frame, lineno)
-                self._track_locals_change(frame, lineno)
+                if self.config.with_locals and state is not None:
+                    self._track_locals_change(frame, lineno, state)
                 self._track_globals_change(frame, lineno)
 
                 return trace_func
 
             return trace_func
 
+        if self.profiler is not None:
+            # Rebinding the name also makes the local trace functions and the returns above use the timed function
+            trace_func = self.profiler.timed_trace(trace_func)
         return trace_func
 
+    def armed_factory(self, trigger: Trigger):
+        """
+        Create the tracing function used until the trigger fires. It only looks at the calls of
+        the trigger function and sets no local trace function, so no line or return events are delivered.
+
+        Args:
+            trigger (Trigger): The trigger to watch for.
+
+        Returns:
+            The armed trace function.
+        """
+
+        def qualified_name(frame: FrameType) -> str:
+            return self._get_function_info(frame).qualified_name
+
+        def armed_func(frame: FrameType, event: str, arg: Any):
+            if not trigger.matches(frame, qualified_name):
+                return None
+            self.trigger_calls += 1
+            if not trigger.fires(frame, self.trigger_calls):
+                return None
+
+            log_info(f"Trigger fired at call {self.trigger_calls} of {trigger}.")
+            self.trace_window = TraceWindow(trigger.max_calls, trigger.max_seconds)
+            trace_func = self.trace_factory()
+            sys.settrace(trace_func)
+            # Trace the triggering call itself
+            return trace_func(frame, event, arg)
+
+        return armed_func
+
+    def _close_trace_window(self) -> None:
+        """
+        End the window of calls traced after the trigger fired: no further calls are traced, and
+        tracing stops once the calls in progress have returned.
+        """
+        log_info("Trace window closed.")
+        self.trace_window = None
+        self.window_closed = True
+        self.depth_limit = 0
+        self.depth_limits = []
+        if self.call_depth == 0:
+            self._end_trace_window()
+
+    def _end_trace_window(self) -> None:
+        """
+        Remove the trace function once the calls of the closed trace window have returned.
+        Tracing can be resumed, the trigger is then armed again.
+        """
+        sys.settrace(None)
+        self.is_tracing = False
+
     def log_metainfo_with_format(self) -> None:
         """Log metainfo in formatted view."""
 
@@ -830,12 +1365,81 @@ class Tracer:
         # Initialize tracking dictionaries
         self._initialize_tracking_state()
 
-        sys.settrace(self.trace_factory())
+        self.is_started = True
+        self._install_trace()
         self.mp_handlers.sync()
+        if self.mp_handlers.sync_time_ns is not None:
+            self.event_handlers.set_clock(self.mp_handlers.get_index(), self.mp_handlers.sync_time_ns)
+
+    def _install_trace(self) -> None:
+        """
+        Install the trace function on the current thread.
+        """
+        self.is_tracing = True
+        if self.window_closed:
+            # The trace window is over, wait for the trigger to fire again
+            self.window_closed = False
+            self.trigger_calls = 0
+            self.depth_limit = self.config.max_depth if self.config.max_depth is not None else sys.maxsize
+        if self.config.trigger is not None and self.trace_window is None:
+            # Only watch for the trigger until it fires
+            sys.settrace(self.armed_factory(self.config.trigger))
+        else:
+            sys.settrace(self.trace_factory())
 
-    def stop(self) -> None:
+    def pause(self) -> None:
+        """
+        Remove the trace function while keeping the tracking state and all outputs open, see resume.
+        The calls in progress on the current thread are ended in the trace, since their returns are no longer seen.
+        """
+        if not self.is_tracing:
+            return
+        sys.settrace(None)
+        self.is_tracing = False
+
+        frames = []
+        frame: Optional[FrameType] = sys._getframe(1)
+        while frame is not None:
+            if frame.f_trace is not None:
+                frames.append((frame, frame.f_trace))
+            frame = frame.f_back
+        # Innermost first, like the returns would have been seen
+        for frame, trace in frames:
+            if self.call_depth > 0:
+                trace(frame, 'return', None)
+            frame.f_trace = None
+
+    def resume(self) -> None:
+        """
+        Install the trace function again after pause, calls starting from now on are traced.
+        """
+        if not self.is_tracing:
+            self._install_trace()
+
+    @staticmethod
+    def _clear_frame_traces() -> None:
+        """
+        Remove the local trace functions of the frames on the current stack, freeing their tracking state
+        and keeping a later start from receiving the events of calls it has not seen.
+        """
+        frame: Optional[FrameType] = sys._getframe(1)
+        while frame is not None:
+            frame.f_trace = None
+            frame = frame.f_back
+
+    def stop(self) -> Optional[Dict[str, Dict[str, float]]]:
         """
         Stop the tracing process by removing the trace function and saving JSON logs.
+
+        Returns:
+            Optional[Dict[str, Dict[str, float]]]: The time spent per stage of event processing with `self_profile`,
+            see StageProfiler.report, None otherwise.
         """
         sys.settrace(None)
-        self.event_handlers.save_json()
+        self.is_tracing = False
+        self._clear_frame_traces()
+        self._save_outputs()
+        if self.is_started and self.profiler is not None:
+            log_info(self.profiler.format())
+            return self.profiler.report()
+        return None
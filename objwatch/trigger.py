@@ -0,0 +1,159 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import time
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any, Callable, Mapping, Optional, Union
+
+# Default for `value`, distinguishes "no attribute condition" from waiting for None
+_UNSET: Any = object()
+
+
+@dataclass(frozen=True)
+class Trigger:
+    """
+    Condition that starts tracing, for capturing a window of calls, e.g. iteration 5000 of a loop.
+
+    Until the trigger fires, only the calls of the trigger function are looked at, so the
+    overhead stays minimal. The trigger fires on the first call of the function meeting all
+    given conditions; tracing then starts with that call and stops after `max_calls` traced
+    calls or `max_seconds` seconds, once the calls in progress have returned.
+
+    Args:
+        function (Union[str, Callable]): The trigger function, as a function object or a qualified name
+            as written in the log, e.g. 'pkg.module.Class.method'.
+        nth_call (Optional[int]): Fire on the Nth call of the function, counting from 1.
+        predicate (Optional[Callable[[Mapping[str, Any]], bool]]): Fire when it returns True for the arguments
+            of a call, given by name.
+        attribute (Optional[str]): Name of an attribute of the instance a method is called on, see `value`.
+        value (Any): Fire when `attribute` is equal to this value at a call of the method.
+        max_calls (Optional[int]): Number of calls traced once the trigger has fired.
+        max_seconds (Optional[float]): Number of seconds traced once the trigger has fired.
+    """
+
+    function: Union[str, Callable]
+    nth_call: Optional[int] = None
+    predicate: Optional[Callable[[Mapping[str, Any]], bool]] = None
+    attribute: Optional[str] = None
+    value: Any = _UNSET
+    max_calls: Optional[int] = None
+    max_seconds: Optional[float] = None
+    # Calls are matched by code object identity, or by function name first when given by qualified name
+    code: Any = field(default=None, init=False, repr=False, compare=False)
+    name: str = field(default='', init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Validate the trigger conditions.
+        """
+        if isinstance(self.function, str):
+            code = None
+            name = self.function.rsplit('.', 1)[-1]
+        else:
+            code = getattr(self.function, '__code__', None)
+            if code is None:
+                raise ValueError(f"Trigger function {self.function!r} has no code object")
+            name = code.co_name
+        object.__setattr__(self, 'code', code)
+        object.__setattr__(self, 'name', name)
+
+        if self.nth_call is not None and self.nth_call <= 0:
+            raise ValueError("nth_call must be positive")
+
+        if (self.attribute is None) != (self.value is _UNSET):
+            raise ValueError("attribute and value must be specified together")
+
+        if self.max_calls is not None and self.max_calls <= 0:
+            raise ValueError("max_calls must be positive")
+
+        if self.max_seconds is not None and self.max_seconds <= 0:
+            raise ValueError("max_seconds must be positive")
+
+    def __str__(self) -> str:
+        """
+        Return a short description of the trigger, as logged with the configuration.
+        """
+        function = self.function if isinstance(self.function, str) else self.function.__qualname__
+        conditions = [f"{function}"]
+        if self.nth_call is not None:
+            conditions.append(f"nth_call={self.nth_call}")
+        if self.predicate is not None:
+            conditions.append(f"predicate={getattr(self.predicate, '__name__', self.predicate)}")
+        if self.attribute is not None:
+            conditions.append(f"{self.attribute}={self.value!r}")
+        if self.max_calls is not None:
+            conditions.append(f"max_calls={self.max_calls}")
+        if self.max_seconds is not None:
+            conditions.append(f"max_seconds={self.max_seconds}")
+        return ', '.join(conditions)
+
+    def matches(self, frame: FrameType, qualified_name: Callable[[FrameType], str]) -> bool:
+        """
+        Check whether a new frame is a call of the trigger function.
+
+        Args:
+            frame (FrameType): The frame of the call.
+            qualified_name (Callable[[FrameType], str]): Resolves the qualified name of a frame, only
+                called for frames of functions with the same name when the trigger is given by name.
+
+        Returns:
+            bool: True if the frame runs the trigger function.
+        """
+        code = frame.f_code
+        if self.code is not None:
+            return code is self.code
+        return code.co_name == self.name and qualified_name(frame) == self.function
+
+    def fires(self, frame: FrameType, call_number: int) -> bool:
+        """
+        Check the conditions of the trigger at a call of the trigger function.
+
+        Args:
+            frame (FrameType): The frame of the call.
+            call_number (int): Number of calls of the trigger function so far, including this one.
+
+        Returns:
+            bool: True if all conditions are met.
+        """
+        if self.nth_call is not None and call_number < self.nth_call:
+            return False
+        if self.predicate is not None and not self.predicate(frame.f_locals):
+            return False
+        if self.attribute is not None:
+            instance = frame.f_locals.get('self')
+            if instance is None or getattr(instance, self.attribute, _UNSET) != self.value:
+                return False
+        return True
+
+
+class TraceWindow:
+    """
+    Bounds the calls traced after a trigger has fired.
+    """
+
+    __slots__ = ('calls_left', 'deadline')
+
+    def __init__(self, max_calls: Optional[int] = None, max_seconds: Optional[float] = None) -> None:
+        """
+        Open the window.
+
+        Args:
+            max_calls (Optional[int]): Number of calls admitted, unbounded if None.
+            max_seconds (Optional[float]): Number of seconds from now during which calls are admitted, unbounded if None.
+        """
+        self.calls_left: Optional[int] = max_calls
+        self.deadline: Optional[float] = None if max_seconds is None else time.monotonic() + max_seconds
+
+    def admit(self) -> bool:
+        """
+        Admit the next call into the window.
+
+        Returns:
+            bool: False once the window has closed.
+        """
+        if self.calls_left is not None:
+            if self.calls_left <= 0:
+                return False
+            self.calls_left -= 1
+        return self.deadline is None or time.monotonic() < self.deadline
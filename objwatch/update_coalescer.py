@@ -0,0 +1,165 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .constants import Constants
+
+
+def format_summary(count: int, minimum: Any = None, maximum: Any = None) -> str:
+    """
+    Format the summary of coalesced updates, as written after the update message.
+
+    Args:
+        count (int): Number of coalesced updates.
+        minimum (Any): Smallest value the variable took, None if its values are not all numbers.
+        maximum (Any): Largest value the variable took, None if its values are not all numbers.
+
+    Returns:
+        str: The formatted summary.
+    """
+    if minimum is None or maximum is None:
+        return f"x{count}"
+    return f"x{count}, min {minimum}, max {maximum}"
+
+
+def _number(value: Any) -> bool:
+    """
+    Check whether a value takes part in the min/max of a summary.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class UpdateSummary:
+    """
+    Coalesced updates of one variable within one call.
+    """
+
+    __slots__ = ('lineno', 'class_name', 'key', 'old', 'new', 'index_info', 'count', 'minimum', 'maximum')
+
+    def __init__(
+        self, lineno: int, class_name: str, key: str, old: str, new: str, index_info: str, old_value: Any, value: Any
+    ) -> None:
+        self.lineno = lineno
+        self.class_name = class_name
+        self.key = key
+        # Formatted first old value and last new value
+        self.old = old
+        self.new = new
+        self.index_info = index_info
+        self.count: int = 1
+        self.minimum: Any = None
+        self.maximum: Any = None
+        if _number(value) and (old_value is None or _number(old_value)):
+            self.minimum = value if old_value is None else min(old_value, value)
+            self.maximum = value if old_value is None else max(old_value, value)
+
+    def add(self, lineno: int, new: str, value: Any) -> None:
+        """
+        Coalesce the next update of the variable.
+
+        Args:
+            lineno (int): The line number of the update.
+            new (str): The formatted new value.
+            value (Any): The new value.
+        """
+        self.lineno = lineno
+        self.new = new
+        self.count += 1
+        if self.minimum is not None:
+            if _number(value):
+                if value < self.minimum:
+                    self.minimum = value
+                elif value > self.maximum:
+                    self.maximum = value
+            else:
+                self.minimum = self.maximum = None
+
+    def summary(self) -> Optional[str]:
+        """
+        Get the formatted summary, None for a single update.
+        """
+        return format_summary(self.count, self.minimum, self.maximum) if self.count > 1 else None
+
+
+class UpdateCoalescer:
+    """
+    Buffers the updates of every variable within a call and coalesces them into one summary:
+    the number of updates, the first old value, the last new value and, for numbers, the
+    smallest and largest value. Summaries are written in the order the variables were first
+    updated, when the call ends or once `buffer_size` updates of the call are buffered.
+    """
+
+    def __init__(
+        self, write: Callable[[int, UpdateSummary], None], buffer_size: int = Constants.COALESCE_BUFFER_SIZE
+    ) -> None:
+        """
+        Initialize the coalescer.
+
+        Args:
+            write (Callable[[int, UpdateSummary], None]): Receives the call depth and the summary of every variable.
+            buffer_size (int): Number of updates buffered within a call before its summaries are written.
+        """
+        self.write = write
+        self.buffer_size = buffer_size
+        # Summaries and number of buffered updates of the calls, by call depth
+        self.frames: Dict[int, Dict[Tuple[str, str], UpdateSummary]] = {}
+        self.counts: Dict[int, int] = {}
+
+    def add(
+        self,
+        call_depth: int,
+        lineno: int,
+        class_name: str,
+        key: str,
+        old: str,
+        new: str,
+        index_info: str,
+        old_value: Any,
+        value: Any,
+    ) -> None:
+        """
+        Buffer an update.
+
+        Args:
+            call_depth (int): Call depth of the update.
+            lineno (int): The line number of the update.
+            class_name (str): Name of the class containing the variable.
+            key (str): Variable name.
+            old (str): The formatted old value.
+            new (str): The formatted new value.
+            index_info (str): Information about the index to track in a multi-process environment.
+            old_value (Any): The old value.
+            value (Any): The new value.
+        """
+        frame = self.frames.get(call_depth)
+        if frame is None:
+            frame = self.frames[call_depth] = {}
+            self.counts[call_depth] = 0
+        summary = frame.get((class_name, key))
+        if summary is None:
+            frame[(class_name, key)] = UpdateSummary(lineno, class_name, key, old, new, index_info, old_value, value)
+        else:
+            summary.add(lineno, new, value)
+        self.counts[call_depth] += 1
+        if self.counts[call_depth] >= self.buffer_size:
+            self._write_frame(call_depth)
+
+    def _write_frame(self, call_depth: int) -> None:
+        """
+        Write the summaries of the call at a depth.
+        """
+        frame = self.frames.pop(call_depth)
+        del self.counts[call_depth]
+        for summary in frame.values():
+            self.write(call_depth, summary)
+
+    def flush(self, call_depth: int = 0) -> None:
+        """
+        Write the summaries of the calls at or below a depth, e.g. when the enclosing call ends.
+
+        Args:
+            call_depth (int): The smallest call depth to write.
+        """
+        for depth in sorted(depth for depth in self.frames if depth >= call_depth):
+            self._write_frame(depth)
@@ -0,0 +1,299 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import re
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..constants import Constants
+from ..events import EventType, EventRecord
+from ..update_coalescer import format_summary
+
+_WHITESPACE = re.compile(r'\s*')
+# Compact non-function events, which are small enough to be decoded in one go
+_FLAT_EVENT = re.compile(r'\{"id":\d+,"type":"(?!Function")')
+_DECODER = json.JSONDecoder()
+
+
+def clock_offsets(readers: List['TraceReader'], indexes: List[int]) -> Optional[List[int]]:
+    """
+    Compute the clock offset of every trace relative to the trace with the lowest process index.
+
+    The offsets are the differences between the clock references recorded right after the
+    start barrier, which all processes leave at about the same moment.
+
+    Args:
+        readers (List[TraceReader]): Readers of the traces.
+        indexes (List[int]): Process indexes of the traces.
+
+    Returns:
+        Optional[List[int]]: The offsets in nanoseconds, None if a trace has no clock reference.
+    """
+    references: List[int] = []
+    for reader in readers:
+        reference = (reader.header.get('clock') or {}).get('sync_ns')
+        if reference is None:
+            return None
+        references.append(reference)
+    base = references[indexes.index(min(indexes))]
+    return [reference - base for reference in references]
+
+
+class TraceReader:
+    """
+    Incremental reader of ObjWatch JSON traces.
+
+    The file is read in chunks and its events are yielded one at a time, without ever holding
+    the nested event lists in memory, so that traces larger than memory can be processed.
+    Everything preceding the events (runtime info, config and clock reference) is read on
+    construction and available as `header`.
+    """
+
+    def __init__(self, path: str, chunk_size: int = Constants.JSON_STREAM_CHUNK_SIZE) -> None:
+        """
+        Open a trace and read its header.
+
+        Args:
+            path (str): Path to the JSON trace.
+            chunk_size (int): Number of characters read at a time.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.file = open(path, 'r', encoding='utf-8')
+        self.buffer: str = ''
+        self.pos: int = 0
+        self.eof: bool = False
+        self.header: Dict[str, Any] = {}
+
+        self._expect('{')
+        if self._value() != 'ObjWatch':
+            raise ValueError(f"{path} is not an ObjWatch JSON trace")
+        self._expect(':')
+        self._expect('{')
+        self.has_events: bool = self._read_members(self.header)
+
+    def __enter__(self) -> 'TraceReader':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying file.
+        """
+        self.file.close()
+
+    def _fill(self) -> bool:
+        """
+        Drop the consumed part of the buffer and append the next chunk of the file.
+
+        Returns:
+            bool: False if the end of the file was reached.
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            str: The next character, or an empty string at the end of the file.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def _expect(self, char: str) -> None:
+        """
+        Consume the next character, which must be `char`.
+
+        Args:
+            char (str): The expected character.
+        """
+        if self._peek() != char:
+            raise ValueError(f"Malformed ObjWatch JSON trace {self.path}: expected '{char}'")
+        self.pos += 1
+
+    def _value(self) -> Any:
+        """
+        Decode the next complete JSON value.
+
+        Returns:
+            Any: The decoded value.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end >= len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _read_members(self, obj: Dict[str, Any]) -> bool:
+        """
+        Read the members of an object into `obj`, up to its end or its nested events.
+
+        Args:
+            obj (Dict[str, Any]): The dictionary to fill.
+
+        Returns:
+            bool: True if reading stopped at the start of an 'events' list, False at the end of the object.
+        """
+        while True:
+            char = self._peek()
+            if char == ',':
+                self.pos += 1
+                char = self._peek()
+            if char == '}':
+                self.pos += 1
+                return False
+            key = self._value()
+            self._expect(':')
+            if key == 'events' and self._peek() == '[':
+                self.pos += 1
+                return True
+            obj[key] = self._value()
+
+    def _is_flat_event(self) -> bool:
+        """
+        Check whether the next event is a compactly written event without nested events.
+
+        Returns:
+            bool: True if the next event can be decoded in one go.
+        """
+        if len(self.buffer) - self.pos < 64:
+            self._fill()
+        return _FLAT_EVENT.match(self.buffer, self.pos) is not None
+
+    def events(self) -> Iterator[Tuple[str, Dict[str, Any], int]]:
+        """
+        Yield the events of the trace in the order they occurred. Can only be iterated once.
+
+        Functions are yielded twice: as 'run' once the fields preceding their nested events are
+        read, and as 'end' with all their fields once the nested events are done. Other events
+        are yielded once, under their type.
+
+        Yields:
+            Tuple[str, Dict[str, Any], int]: The event kind, the event fields and the nesting depth.
+        """
+        if not self.has_events:
+            return
+        self.has_events = False
+        functions: List[Dict[str, Any]] = []
+        while True:
+            char = self._peek()
+            if char == ',':
+                self.pos += 1
+                char = self._peek()
+            if char == ']':
+                self.pos += 1
+                if not functions:
+                    break
+                function = functions.pop()
+                self._read_members(function)
+                yield 'end', function, len(functions)
+                continue
+            if self._is_flat_event():
+                event = self._value()
+                yield event['type'], event, len(functions)
+                continue
+            event = {}
+            self._expect('{')
+            if self._read_members(event):
+                yield 'run', event, len(functions)
+                functions.append(event)
+            elif event['type'] == 'Function':
+                yield 'run', event, len(functions)
+                yield 'end', event, len(functions)
+            else:
+                yield event['type'], event, len(functions)
+        # Members following the events belong to the header
+        self._read_members(self.header)
+
+    def records(self, process_index: Optional[int] = None) -> Iterator[EventRecord]:
+        """
+        Yield the events of the trace as event records in the order they occurred.
+
+        Events without a timestamp, e.g. the end of a function that was still running when the
+        trace was saved, take the timestamp of the preceding event.
+
+        Args:
+            process_index (Optional[int]): Index to tag the records with, defaults to the index
+                of the clock reference in the header, or 0.
+
+        Yields:
+            EventRecord: The event records.
+        """
+        if process_index is None:
+            process_index = (self.header.get('clock') or {}).get('index') or 0
+        wrapped = (self.header.get('config') or {}).get('wrapper') is not None
+        timestamp = 0
+        for kind, event, depth in self.events():
+            if kind == 'run':
+                timestamp = event.get('ts', timestamp)
+                yield EventRecord(
+                    timestamp,
+                    process_index,
+                    EventType.RUN,
+                    event['run_line'],
+                    depth,
+                    event['qualified_name'],
+                    None,
+                    event.get('call_msg'),
+                    event.get('symbol_type'),
+                )
+            elif kind == 'end':
+                timestamp = event.get('end_ts', timestamp)
+                yield EventRecord(
+                    timestamp,
+                    process_index,
+                    EventType.END,
+                    event.get('end_line', event['run_line']),
+                    depth,
+                    event['qualified_name'],
+                    event.get('elided_calls'),
+                    event.get('return_msg') if wrapped else None,
+                    event.get('symbol_type'),
+                )
+            elif kind == EventType.UPD.label:
+                timestamp = event.get('ts', timestamp)
+                yield EventRecord(
+                    timestamp,
+                    process_index,
+                    EventType.UPD,
+                    event['line'],
+                    event.get('call_depth', depth),
+                    event['name'],
+                    event['old'],
+                    event['new'],
+                    format_summary(event['count'], event.get('min'), event.get('max')) if 'count' in event else None,
+                )
+            elif kind in (EventType.APD.label, EventType.POP.label):
+                timestamp = event.get('ts', timestamp)
+                yield EventRecord(
+                    timestamp,
+                    process_index,
+                    EventType.APD if kind == EventType.APD.label else EventType.POP,
+                    event['line'],
+                    event.get('call_depth', depth),
+                    event['name'],
+                    event['old'].get('len'),
+                    event['new'].get('len'),
+                    event['old'].get('type'),
+                )
@@ -0,0 +1,436 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import mmap
+import struct
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..constants import Constants
+
+# Index file layout: a header followed by one fixed-size entry per call, in the order the calls started
+HEADER = struct.Struct('<4sHH8x')
+MAGIC = b'OWLX'
+VERSION = 1
+# Byte offsets of the run and end lines, id of the qualified name, call depth and number of the calling call
+ENTRY = struct.Struct('<QQIIq')
+# End offset of calls that have not returned
+UNFINISHED = 2**64 - 1
+
+
+def index_paths(log_path: str) -> Tuple[str, str]:
+    """
+    Get the paths of the sidecar index files of a log file.
+
+    Args:
+        log_path (str): Path to the .objwatch log file.
+
+    Returns:
+        Tuple[str, str]: Paths of the call index and of the qualified name table.
+    """
+    return f"{log_path}.idx", f"{log_path}.names"
+
+
+class IndexedFileHandler(logging.FileHandler):
+    """
+    File handler that writes a sidecar index of the function calls in the log.
+
+    Log records of run and end events carry an `objwatch_call` attribute (label, call depth and
+    qualified name), set through the `extra` argument of the logger. For each call the handler
+    records the byte offsets of its run and end lines and an id of its qualified name. Entries are
+    appended in the order the calls started, so a reader can binary search them by offset. The end
+    offset is filled in once the call returns. Entries and names are written in batches, and on
+    flush_index.
+    """
+
+    def __init__(self, filename: str, batch_size: int = Constants.LOG_INDEX_BATCH_SIZE) -> None:
+        """
+        Open the log file and create its index files, replacing existing ones.
+
+        Args:
+            filename (str): Path to the log file.
+            batch_size (int): Number of index entries buffered before they are written.
+        """
+        super().__init__(filename, encoding='utf-8')
+        # The log is appended to, offsets are absolute positions in the file
+        self.offset: int = os.path.getsize(self.baseFilename)
+        self.batch_size = batch_size
+        index_path, names_path = index_paths(self.baseFilename)
+        self.index_fd: int = os.open(index_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.write(self.index_fd, HEADER.pack(MAGIC, VERSION, ENTRY.size))
+        self.names_fd: int = os.open(names_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self.name_ids: Dict[str, int] = {}
+        # Names and entries not written yet, the number of written entries and the open calls of every thread
+        self.pending_names: List[str] = []
+        self.pending = bytearray()
+        self.written: int = 0
+        self.count: int = 0
+        self.open_calls: Dict[int, List[int]] = {}
+
+    def _open(self) -> Any:
+        """
+        Open the log file without newline translation, so that offsets match the written text.
+        """
+        return open(self.baseFilename, self.mode, encoding=self.encoding, newline='')
+
+    def _name_id(self, name: str) -> int:
+        """
+        Get the id of a qualified name, adding it to the name table on first use.
+
+        Args:
+            name (str): The qualified name.
+
+        Returns:
+            int: The id of the name, its line number in the name table.
+        """
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.name_ids)
+            self.pending_names.append(name.replace('\n', ' ') + '\n')
+        return name_id
+
+    def _set_end(self, entry: int, offset: int) -> None:
+        """
+        Fill in the end offset of a call.
+
+        Args:
+            entry (int): Number of the index entry of the call.
+            offset (int): Byte offset of the end line.
+        """
+        data = struct.pack('<Q', offset)
+        if entry >= self.written:
+            position = (entry - self.written) * ENTRY.size + 8
+            self.pending[position:position + 8] = data
+        else:
+            os.pwrite(self.index_fd, data, HEADER.size + entry * ENTRY.size + 8)
+
+    def _index(self, record: logging.LogRecord) -> None:
+        """
+        Add the call event of a log record to the index.
+
+        Args:
+            record (logging.LogRecord): The log record of a run or end event.
+        """
+        label, depth, name = record.objwatch_call  # type: ignore[attr-defined]
+        stack = self.open_calls.setdefault(record.thread or 0, [])
+        if label == 'run':
+            parent = stack[-1] if stack else -1
+            self.pending += ENTRY.pack(self.offset, UNFINISHED, self._name_id(name), depth, parent)
+            stack.append(self.count)
+            self.count += 1
+            if self.count - self.written >= self.batch_size:
+                self._write_index()
+        elif stack:
+            self._set_end(stack.pop(), self.offset)
+
+    def _write_index(self) -> None:
+        """
+        Write the buffered index entries, after the names they refer to.
+        """
+        if self.pending_names:
+            os.write(self.names_fd, ''.join(self.pending_names).encode('utf-8'))
+            self.pending_names = []
+        if self.pending:
+            os.pwrite(self.index_fd, bytes(self.pending), HEADER.size + self.written * ENTRY.size)
+            self.pending = bytearray()
+            self.written = self.count
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write a log record and index it if it is a call event.
+
+        Args:
+            record (logging.LogRecord): The log record.
+        """
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            if hasattr(record, 'objwatch_call'):
+                self._index(record)
+            self.stream.write(msg)
+            self.offset += len(msg) if msg.isascii() else len(msg.encode('utf-8'))
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush_index(self) -> None:
+        """
+        Write the buffered index entries, so that the index can be read while the handler stays open.
+        """
+        self.acquire()
+        try:
+            if self.index_fd >= 0:
+                self._write_index()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """
+        Write the remaining index entries and close the log and index files.
+        """
+        self.acquire()
+        try:
+            if self.index_fd >= 0:
+                self._write_index()
+                self._close_index()
+        finally:
+            self.release()
+        super().close()
+
+    def _close_index(self) -> None:
+        """
+        Close the index files.
+        """
+        os.close(self.index_fd)
+        os.close(self.names_fd)
+        self.index_fd = self.names_fd = -1
+
+    def abandon(self) -> None:
+        """
+        Close the handler without writing the buffered index entries, in a forked child process
+        whose parent still owns the log and its index.
+        """
+        self.acquire()
+        try:
+            if self.index_fd >= 0:
+                self.pending_names = []
+                self.pending = bytearray()
+                self._close_index()
+        finally:
+            self.release()
+        super().close()
+
+
+class CallEntry(NamedTuple):
+    """
+    A function call in an indexed log.
+
+    Attributes:
+        number (int): Number of the call, in the order the calls started.
+        name (str): Qualified name of the function.
+        depth (int): Call depth.
+        start (int): Byte offset of the run line.
+        end (Optional[int]): Byte offset of the end line, None if the call did not return.
+        parent (Optional[int]): Number of the calling call, None for calls outside of traced calls.
+    """
+
+    number: int
+    name: str
+    depth: int
+    start: int
+    end: Optional[int]
+    parent: Optional[int]
+
+
+class LogIndex:
+    """
+    Random access to the calls of a .objwatch log through its sidecar index.
+
+    Both the log and the index are memory-mapped, so opening is instant regardless of their size.
+    Calls are looked up by number in constant time, and by byte offset or as subtrees by binary
+    search over the index in O(log n).
+    """
+
+    def __init__(self, log_path: str) -> None:
+        """
+        Open a log file and its index.
+
+        Args:
+            log_path (str): Path to the .objwatch log file, written with `output_index=True`.
+        """
+        index_path, names_path = index_paths(log_path)
+        with open(names_path, 'r', encoding='utf-8') as f:
+            self.names: List[str] = f.read().splitlines()
+        self.log_file = open(log_path, 'rb')
+        self.index_file = open(index_path, 'rb')
+        self.log: Any = self._map(self.log_file)
+        self.index: Any = self._map(self.index_file)
+        magic, version, entry_size = HEADER.unpack_from(self.index, 0)
+        if magic != MAGIC or version != VERSION or entry_size != ENTRY.size:
+            raise ValueError(f"{index_path} is not an ObjWatch log index")
+        self.size = (len(self.index) - HEADER.size) // ENTRY.size
+        self._invocations: Optional[Dict[str, List[int]]] = None
+
+    @staticmethod
+    def _map(f: Any) -> Any:
+        """
+        Memory-map a file read-only, empty files are mapped to empty bytes.
+        """
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> 'LogIndex':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def close(self) -> None:
+        """
+        Unmap and close the log and index files.
+        """
+        for mapped in (self.log, self.index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self.log_file.close()
+        self.index_file.close()
+
+    def call(self, index: int) -> CallEntry:
+        """
+        Get a call by its number.
+
+        Args:
+            index (int): Number of the call, in the order the calls started.
+
+        Returns:
+            CallEntry: The call.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"Call {index} out of range")
+        start, end, name_id, depth, parent = ENTRY.unpack_from(self.index, HEADER.size + index * ENTRY.size)
+        return CallEntry(
+            index, self.names[name_id], depth, start, None if end == UNFINISHED else end, None if parent < 0 else parent
+        )
+
+    def _start(self, index: int) -> int:
+        """
+        Get the byte offset of the run line of a call.
+        """
+        return ENTRY.unpack_from(self.index, HEADER.size + index * ENTRY.size)[0]
+
+    def _bisect(self, offset: int) -> int:
+        """
+        Find the number of calls starting at or before a byte offset.
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self._start(middle) <= offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def call_at(self, offset: int) -> Optional[CallEntry]:
+        """
+        Find the innermost call whose lines contain a byte offset.
+
+        Args:
+            offset (int): Byte offset in the log.
+
+        Returns:
+            Optional[CallEntry]: The call, None if the offset is outside of all calls.
+        """
+        index: Optional[int] = self._bisect(offset) - 1
+        # The innermost call is the last call started before the offset or one of its callers
+        while index is not None and index >= 0:
+            call = self.call(index)
+            if offset < self._stop(call):
+                return call
+            index = call.parent
+        return None
+
+    def _stop(self, call: CallEntry) -> int:
+        """
+        Get the byte offset following the end line of a call.
+        """
+        if call.end is None:
+            return len(self.log)
+        newline = self.log.find(b'\n', call.end)
+        return len(self.log) if newline < 0 else newline + 1
+
+    def _subtree_end(self, call: CallEntry) -> int:
+        """
+        Get the number following the last call nested in a call.
+        """
+        if call.end is None:
+            # Without an end line, nested calls are the following calls at greater depths
+            index = call.number + 1
+            while index < self.size and self.call(index).depth > call.depth:
+                index += 1
+            return index
+        return self._bisect(call.end)
+
+    def subtree(self, index: int) -> List[CallEntry]:
+        """
+        Get a call and all calls nested in it.
+
+        Args:
+            index (int): Number of the call.
+
+        Returns:
+            List[CallEntry]: The calls, in the order they started.
+        """
+        call = self.call(index)
+        return [call] + [self.call(i) for i in range(index + 1, self._subtree_end(call))]
+
+    def children(self, index: int) -> List[CallEntry]:
+        """
+        Get the calls made directly by a call.
+
+        Args:
+            index (int): Number of the call.
+
+        Returns:
+            List[CallEntry]: The calls, in the order they started.
+        """
+        call = self.call(index)
+        children = []
+        child = index + 1
+        end = self._subtree_end(call)
+        while child < end:
+            entry = self.call(child)
+            children.append(entry)
+            child = self._subtree_end(entry) if entry.end is not None else child + 1
+        return children
+
+    def text(self, index: int) -> str:
+        """
+        Get the log lines of a call, from its run line to its end line.
+
+        Args:
+            index (int): Number of the call.
+
+        Returns:
+            str: The log lines.
+        """
+        call = self.call(index)
+        return self.log[call.start:self._stop(call)].decode('utf-8')
+
+    def invocations(self, name: str) -> List[int]:
+        """
+        Get the numbers of all calls of a function. The first lookup reads the whole index once.
+
+        Args:
+            name (str): Qualified name of the function.
+
+        Returns:
+            List[int]: The call numbers, in the order the calls started.
+        """
+        if self._invocations is None:
+            self._invocations = {}
+            entries = ENTRY.iter_unpack(self.index[HEADER.size:HEADER.size + self.size * ENTRY.size])
+            for index, (_, _, name_id, _, _) in enumerate(entries):
+                self._invocations.setdefault(self.names[name_id], []).append(index)
+        return self._invocations.get(name, [])
+
+    def nth(self, name: str, n: int) -> CallEntry:
+        """
+        Get the nth call of a function.
+
+        Args:
+            name (str): Qualified name of the function.
+            n (int): Zero-based number of the invocation, negative numbers count from the last one.
+
+        Returns:
+            CallEntry: The call.
+        """
+        return self.call(self.invocations(name)[n])
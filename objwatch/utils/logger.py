@@ -4,13 +4,19 @@
 import logging
 from typing import Optional, Any, Union
 
+from .log_index import IndexedFileHandler
+
 # Global flag to force print logs instead of using the logger
 global FORCE
 FORCE: bool = False
 
 
 def create_logger(
-    name: str = 'objwatch', output: Optional[str] = None, level: Union[int, str] = logging.DEBUG, simple: bool = True
+    name: str = 'objwatch',
+    output: Optional[str] = None,
+    level: Union[int, str] = logging.DEBUG,
+    simple: bool = True,
+    index: bool = False,
 ) -> None:
     """
     Create and configure a logger.
@@ -20,6 +26,7 @@ def create_logger(
         output (Optional[str]): File path for writing logs, must end with '.objwatch' for ObjWatch Log Viewer extension.
         level (Union[int, str]): Logging level (e.g., logging.DEBUG, logging.INFO, "force").
         simple (bool): Defaults to True, disable simple logging mode with the format "[{time}] [{level}] objwatch: {msg}".
+        index (bool): Write a sidecar index of the function calls next to the output file.
     """
     if level == "force":
         global FORCE  # noqa: F824
@@ -44,7 +51,7 @@ def create_logger(
 
         # If an output file is specified, create and add a file handler
         if output:
-            file_handler = logging.FileHandler(output)
+            file_handler = IndexedFileHandler(output) if index else logging.FileHandler(output)
             file_handler.setFormatter(formatter)
             logger.addHandler(file_handler)
 
@@ -52,6 +59,47 @@ def create_logger(
     logger.propagate = False
 
 
+def redirect_file_handler(output: str, name: str = 'objwatch') -> None:
+    """
+    Replace the file handlers of a logger with a new one writing to another file,
+    keeping the original formatter and index. Used to give forked child processes their own log file.
+
+    Args:
+        output (str): File path for the new file handler.
+        name (str): Name of the logger.
+    """
+    logger = logging.getLogger(name)
+    formatter: Optional[logging.Formatter] = None
+    index = False
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.FileHandler):
+            formatter = handler.formatter
+            logger.removeHandler(handler)
+            if isinstance(handler, IndexedFileHandler):
+                # The index belongs to the parent process, which keeps writing it
+                index = True
+                handler.abandon()
+            else:
+                handler.close()
+
+    file_handler = IndexedFileHandler(output) if index else logging.FileHandler(output)
+    if formatter is not None:
+        file_handler.setFormatter(formatter)
+    logger.addHandler(file_handler)
+
+
+def flush_log_index(name: str = 'objwatch') -> None:
+    """
+    Write the buffered entries of the call index of a logger's output file, if it has one.
+
+    Args:
+        name (str): Name of the logger.
+    """
+    for handler in logging.getLogger(name).handlers:
+        if isinstance(handler, IndexedFileHandler):
+            handler.flush_index()
+
+
 # Initialize the logger for 'objwatch'
 logger = logging.getLogger('objwatch')
 
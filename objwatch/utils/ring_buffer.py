@@ -0,0 +1,165 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import mmap
+import struct
+from typing import Iterator
+
+# Header layout: magic, version, capacity, write position, read position, dropped records, closed flag
+_HEADER = struct.Struct('<4sIQQQQI')
+_HEADER_SIZE = 64
+_MAGIC = b'OWRB'
+_VERSION = 1
+_WRITE_OFFSET = 16
+_READ_OFFSET = 24
+_DROPPED_OFFSET = 32
+_CLOSED_OFFSET = 40
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+# Length marking the rest of the lap as unused, the next record starts at the beginning of the data area
+_WRAP = 0xFFFFFFFF
+
+
+class RingBuffer:
+    """
+    Single-producer single-consumer ring buffer in a memory-mapped file.
+
+    Records are length-prefixed byte strings. The positions in the header count bytes written
+    and read since creation, the writer only advances the write position and the reader only
+    advances the read position, so that both sides can work concurrently without locks.
+    A record that does not fit into the free space is dropped and counted instead of blocking
+    the writer. Placing the file on a memory-backed filesystem such as /dev/shm avoids disk I/O.
+    """
+
+    def __init__(self, path: str, mm: mmap.mmap, capacity: int) -> None:
+        """
+        Wrap a mapped ring buffer file, use create() or attach() instead.
+
+        Args:
+            path (str): Path of the ring buffer file.
+            mm (mmap.mmap): The mapped file.
+            capacity (int): Size of the data area in bytes.
+        """
+        self.path = path
+        self.mm = mm
+        self.capacity = capacity
+        # Each side only ever changes its own position, so it can be cached
+        self.write_pos: int = _U64.unpack_from(mm, _WRITE_OFFSET)[0]
+        self.read_pos: int = _U64.unpack_from(mm, _READ_OFFSET)[0]
+
+    @classmethod
+    def create(cls, path: str, capacity: int) -> 'RingBuffer':
+        """
+        Create an empty ring buffer file, replacing any existing one.
+
+        Args:
+            path (str): Path of the ring buffer file.
+            capacity (int): Size of the data area in bytes.
+
+        Returns:
+            RingBuffer: The writable ring buffer.
+        """
+        with open(path, 'wb') as f:
+            f.truncate(_HEADER_SIZE + capacity)
+        with open(path, 'r+b') as f:
+            mm = mmap.mmap(f.fileno(), _HEADER_SIZE + capacity)
+        _HEADER.pack_into(mm, 0, _MAGIC, _VERSION, capacity, 0, 0, 0, 0)
+        return cls(path, mm, capacity)
+
+    @classmethod
+    def attach(cls, path: str) -> 'RingBuffer':
+        """
+        Map an existing ring buffer file.
+
+        Args:
+            path (str): Path of the ring buffer file.
+
+        Returns:
+            RingBuffer: The ring buffer.
+        """
+        with open(path, 'r+b') as f:
+            mm = mmap.mmap(f.fileno(), os.fstat(f.fileno()).st_size)
+        magic, version, capacity = _HEADER.unpack_from(mm, 0)[:3]
+        if magic != _MAGIC or version != _VERSION:
+            mm.close()
+            raise ValueError(f"{path} is not an ObjWatch ring buffer")
+        return cls(path, mm, capacity)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of records dropped because the ring buffer was full.
+        """
+        return _U64.unpack_from(self.mm, _DROPPED_OFFSET)[0]
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the writer has closed the ring buffer.
+        """
+        return _U32.unpack_from(self.mm, _CLOSED_OFFSET)[0] != 0
+
+    def write(self, payload: bytes) -> bool:
+        """
+        Append a record, or drop it if there is not enough free space.
+
+        Args:
+            payload (bytes): The record.
+
+        Returns:
+            bool: True if the record was written, False if it was dropped.
+        """
+        size = 4 + len(payload)
+        offset = self.write_pos % self.capacity
+        # Records never wrap around, a record not fitting into the rest of the lap starts the next one
+        skip = self.capacity - offset if self.capacity - offset < size else 0
+        read_pos = _U64.unpack_from(self.mm, _READ_OFFSET)[0]
+        if self.write_pos + skip + size - read_pos > self.capacity:
+            _U64.pack_into(self.mm, _DROPPED_OFFSET, self.dropped + 1)
+            return False
+
+        if skip:
+            if skip >= 4:
+                _U32.pack_into(self.mm, _HEADER_SIZE + offset, _WRAP)
+            offset = 0
+        start = _HEADER_SIZE + offset
+        _U32.pack_into(self.mm, start, len(payload))
+        self.mm[start + 4:start + size] = payload
+        # Publish the record only after it is complete
+        self.write_pos += skip + size
+        _U64.pack_into(self.mm, _WRITE_OFFSET, self.write_pos)
+        return True
+
+    def read(self) -> Iterator[bytes]:
+        """
+        Consume the records written so far.
+
+        Yields:
+            bytes: The records in the order they were written.
+        """
+        write_pos = _U64.unpack_from(self.mm, _WRITE_OFFSET)[0]
+        while self.read_pos < write_pos:
+            offset = self.read_pos % self.capacity
+            rest = self.capacity - offset
+            length = _U32.unpack_from(self.mm, _HEADER_SIZE + offset)[0] if rest >= 4 else _WRAP
+            if length == _WRAP:
+                self.read_pos += rest
+            else:
+                start = _HEADER_SIZE + offset + 4
+                payload = self.mm[start:start + length]
+                self.read_pos += 4 + length
+                yield payload
+            # Free the space for the writer
+            _U64.pack_into(self.mm, _READ_OFFSET, self.read_pos)
+
+    def close(self, mark_closed: bool = False) -> None:
+        """
+        Unmap the ring buffer file.
+
+        Args:
+            mark_closed (bool): Tell the reader that no more records will be written.
+        """
+        if mark_closed:
+            _U32.pack_into(self.mm, _CLOSED_OFFSET, 1)
+        self.mm.close()
@@ -1,6 +1,11 @@
 # MIT License
 # Copyright (c) 2025 aeeeeeep
 
+import os
+import multiprocessing
+
+from ..constants import Constants
+
 
 def target_handler(o):
     if isinstance(o, set):
@@ -8,3 +13,35 @@ def target_handler(o):
     if hasattr(o, '__dict__'):
         return o.__dict__
     return str(o)
+
+
+def per_process_path(path: str, pid: int) -> str:
+    """
+    Derive a per-process output path by inserting the process id before the extension,
+    e.g. 'trace.objwatch' -> 'trace.1234.objwatch'.
+
+    Args:
+        path (str): The original output path.
+        pid (int): The process id to embed in the path.
+
+    Returns:
+        str: The per-process output path.
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}.{pid}{ext}"
+
+
+def collector_authkey() -> bytes:
+    """
+    Get the secret authenticating the connections to the trace collector.
+
+    The secret is read from the OBJWATCH_COLLECTOR_AUTHKEY environment variable, and defaults to the
+    authentication key of the process, which processes started by multiprocessing inherit.
+
+    Returns:
+        bytes: The secret.
+    """
+    authkey = os.environ.get(Constants.COLLECTOR_AUTHKEY_ENV)
+    if authkey:
+        return authkey.encode('utf-8')
+    return bytes(multiprocessing.current_process().authkey)
@@ -4,7 +4,8 @@
 from .abc_wrapper import ABCWrapper
 from .base_wrapper import BaseWrapper
 from .cpu_memory_wrapper import CPUMemoryWrapper
+from .numpy_array_wrapper import NumpyArrayWrapper
 from .tensor_shape_wrapper import TensorShapeWrapper
 from .torch_memory_wrapper import TorchMemoryWrapper
 
-__all__ = ['ABCWrapper', 'BaseWrapper', 'CPUMemoryWrapper', 'TensorShapeWrapper', 'TorchMemoryWrapper']
+__all__ = ['ABCWrapper', 'BaseWrapper', 'CPUMemoryWrapper', 'NumpyArrayWrapper', 'TensorShapeWrapper', 'TorchMemoryWrapper']
@@ -2,11 +2,10 @@
 # Copyright (c) 2025 aeeeeeep
 
 from types import FrameType
-from typing import Any, List, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
-from ..constants import Constants
-from ..event_handls import EventHandls
+from ..formatters import FormatLimits, FormatterRegistry, format_sequence, registry
 
 
 class ABCWrapper(ABC):
@@ -14,6 +13,13 @@ class ABCWrapper(ABC):
     Abstract base class for function wrappers to extend tracing and logging functionality.
     """
 
+    # Registry formatting the logged values, subclasses can use a child registry to format some types differently
+    formatters: FormatterRegistry = registry
+    # Function processing sequence elements, also defined for subclasses that do not call __init__
+    format_sequence_func: Optional[Callable[[List[Any]], Optional[List[Any]]]] = None
+    # Bounds of the formatting of sequences, set by the tracer from its configuration, None for the default limits
+    format_limits: Optional[FormatLimits] = None
+
     def __init__(self):
         # Class attribute to specify the function for processing sequence elements
         # Subclasses can override this to provide custom sequence processing
@@ -110,24 +116,9 @@ class ABCWrapper(ABC):
         Returns:
             str: Formatted value string.
         """
-        if isinstance(value, Constants.LOG_ELEMENT_TYPES):
-            formatted = f"{value}"
-        elif isinstance(value, Constants.LOG_SEQUENCE_TYPES):
-            formatted_sequence = EventHandls.format_sequence(value, func=self.format_sequence_func)
-            if formatted_sequence:
-                formatted = f"{formatted_sequence}"
-            else:
-                formatted = f"(type){type(value).__name__}"
-        else:
-            try:
-                formatted = f"(type){value.__name__}"  # type: ignore
-            except Exception:
-                formatted = f"(type){type(value).__name__}"
-
-        if is_return:
-            if isinstance(value, Constants.LOG_SEQUENCE_TYPES) and formatted:
-                return f"[{formatted}]"
-            return f"{formatted}"
+        formatted = self.formatters.format(value, func=self.format_sequence_func, limits=self.format_limits)
+        if is_return and self.formatters.resolve(type(value)) is format_sequence:
+            return f"[{formatted}]"
         return formatted
 
     def _format_return(self, result: Any) -> str:
@@ -0,0 +1,159 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+from types import FrameType
+from typing import Any, List, Optional, Tuple
+
+from ..constants import Constants
+from ..formatters import FormatterRegistry, registry
+from .abc_wrapper import ABCWrapper
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+
+def process_array_item(seq: List[Any]) -> Optional[List[Any]]:
+    """
+    Process a sequence to extract array shapes if all items are numpy.ndarray.
+
+    Args:
+        seq (List[Any]): The sequence to process.
+
+    Returns:
+        Optional[List[Any]]: List of array shapes or None if not applicable.
+    """
+    if np is not None and all(isinstance(x, np.ndarray) for x in seq):
+        return [x.shape for x in seq]
+    else:
+        return None
+
+
+def format_array(value: Any) -> str:
+    """
+    Format a numpy.ndarray by its dtype, shape and size in bytes, followed by its statistics
+    if NumpyArrayWrapper.with_stats is set.
+    """
+    summary = f"(ndarray){value.dtype}{list(value.shape)} {value.nbytes}B"
+    if NumpyArrayWrapper.with_stats:
+        stats = array_stats(value, NumpyArrayWrapper.stats_threshold, NumpyArrayWrapper.sample_size)
+        if stats:
+            summary += ' ' + stats
+    return summary
+
+
+def array_stats(value: Any, threshold: int, sample_size: int) -> str:
+    """
+    Compute the min, max and mean of a numeric array and its NaN and Inf counts, without materializing its repr.
+
+    Arrays of more than `threshold` elements are summarized from a strided sample of `sample_size` elements,
+    so that the cost stays bounded whatever the size of the array.
+
+    Args:
+        value (numpy.ndarray): The array.
+        threshold (int): Maximum number of elements of an array whose statistics are computed over all elements.
+        sample_size (int): Number of elements sampled from larger arrays.
+
+    Returns:
+        str: The statistics, empty for arrays of other dtypes or without elements.
+    """
+    kind = value.dtype.kind
+    if kind not in 'iuf' or value.size == 0:
+        return ''
+    sampled = value.size > threshold
+    if sampled:
+        step = -(-value.size // sample_size)
+        # Indexing the flat iterator copies only the sampled elements, even for non-contiguous arrays
+        values = value.flat[::step]
+    else:
+        values = value
+
+    count = values.size
+    counts = ''
+    if kind == 'f':
+        nan = int(np.count_nonzero(np.isnan(values)))
+        inf = int(np.count_nonzero(np.isinf(values)))
+        counts = f"nan={nan} inf={inf}"
+        if nan or inf:
+            values = values[np.isfinite(values)]
+
+    stats: List[str] = []
+    if values.size:
+        stats.append(f"min={values.min():.6g} max={values.max():.6g} mean={values.mean():.6g}")
+    if counts:
+        stats.append(counts)
+    if sampled:
+        stats.append(f"(sampled {count} of {value.size})")
+    return ' '.join(stats)
+
+
+class NumpyArrayWrapper(ABCWrapper):
+    """
+    NumpyArrayWrapper extends ABCWrapper to log numpy.ndarray objects by their dtype, shape and size in bytes,
+    with optional vectorized statistics to catch numerical bugs: min, max, mean and the NaN and Inf counts.
+
+    Statistics are computed over all elements of arrays up to `stats_threshold` elements, and over a strided
+    sample of `sample_size` elements of larger arrays. They can be configured before the instantiation of
+    objwatch wrappers, e.g.:
+
+      ```python
+      from objwatch.wrappers import NumpyArrayWrapper
+      NumpyArrayWrapper.with_stats = False
+      ```
+    """
+
+    with_stats: bool = True
+    stats_threshold: int = Constants.ARRAY_STATS_THRESHOLD
+    sample_size: int = Constants.ARRAY_SAMPLE_SIZE
+
+    formatters = FormatterRegistry(parent=registry)
+    if np is not None:
+        formatters.register(np.ndarray, format_array)
+
+    def __init__(self):
+        self.format_sequence_func = process_array_item
+
+    def wrap_call(self, func_name: str, frame: FrameType) -> str:
+        """
+        Format the function call information, including array summaries if applicable.
+
+        Args:
+            func_name (str): Name of the function being called.
+            frame (FrameType): The current stack frame.
+
+        Returns:
+            str: Formatted call message.
+        """
+        args, kwargs = self._extract_args_kwargs(frame)
+        call_msg = self._format_args_kwargs(args, kwargs)
+        return call_msg
+
+    def wrap_return(self, func_name: str, result: Any) -> str:
+        """
+        Format the function return information, including array summaries if applicable.
+
+        Args:
+            func_name (str): Name of the function returning.
+            result (Any): The result returned by the function.
+
+        Returns:
+            str: Formatted return message.
+        """
+        return_msg = self._format_return(result)
+        return return_msg
+
+    def wrap_upd(self, old_value: Any, current_value: Any) -> Tuple[str, str]:
+        """
+        Format the update information of a variable, including array summaries if applicable.
+
+        Args:
+            old_value (Any): The old value of the variable.
+            current_value (Any): The new value of the variable.
+
+        Returns:
+            Tuple[str, str]: Formatted old and new values.
+        """
+        old_msg = self._format_value(old_value)
+        current_msg = self._format_value(current_value)
+        return old_msg, current_msg
@@ -4,8 +4,7 @@
 from types import FrameType
 from typing import Any, List, Optional, Tuple
 
-from ..constants import Constants
-from ..event_handls import EventHandls
+from ..formatters import FormatterRegistry, registry
 from .abc_wrapper import ABCWrapper
 
 try:
@@ -30,11 +29,22 @@ def process_tensor_item(seq: List[Any]) -> Optional[List[Any]]:
         return None
 
 
+def format_tensor_shape(value: Any) -> str:
+    """
+    Format a torch.Tensor by its shape.
+    """
+    return f"{value.shape}"
+
+
 class TensorShapeWrapper(ABCWrapper):
     """
     TensorShapeWrapper extends ABCWrapper to log the shapes of torch.Tensor objects.
     """
 
+    formatters = FormatterRegistry(parent=registry)
+    if torch is not None:
+        formatters.register(torch.Tensor, format_tensor_shape)
+
     def __init__(self):
         self.format_sequence_func = process_tensor_item
 
@@ -81,38 +91,3 @@ class TensorShapeWrapper(ABCWrapper):
         old_msg = self._format_value(old_value)
         current_msg = self._format_value(current_value)
         return old_msg, current_msg
-
-    def _format_value(self, value: Any, is_return: bool = False) -> str:
-        """
-        Format a value into a string, logging tensor shapes if applicable.
-
-        Args:
-            value (Any): The value to format.
-            is_return (bool): Flag indicating if the value is a return value.
-
-        Returns:
-            str: Formatted value string.
-        """
-        if torch is not None and isinstance(value, torch.Tensor):
-            formatted = f"{value.shape}"
-        elif isinstance(value, Constants.LOG_ELEMENT_TYPES):
-            formatted = f"{value}"
-        elif isinstance(value, Constants.LOG_SEQUENCE_TYPES):
-            formatted_sequence = EventHandls.format_sequence(value, func=self.format_sequence_func)
-            if formatted_sequence:
-                formatted = f"{formatted_sequence}"
-            else:
-                formatted = f"(type){type(value).__name__}"
-        else:
-            try:
-                formatted = f"(type){value.__name__}"
-            except Exception:
-                formatted = f"(type){type(value).__name__}"
-
-        if is_return:
-            if isinstance(value, torch.Tensor):
-                return f"{value.shape}"
-            elif isinstance(value, Constants.LOG_SEQUENCE_TYPES) and formatted:
-                return f"[{formatted}]"
-            return f"{formatted}"
-        return formatted
@@ -10,7 +10,7 @@ import logging
 from io import StringIO
 import objwatch
 from objwatch.config import ObjWatchConfig
-from objwatch.wrappers import BaseWrapper, TensorShapeWrapper, ABCWrapper
+from objwatch.wrappers import BaseWrapper, TensorShapeWrapper, NumpyArrayWrapper, ABCWrapper
 from objwatch.core import ObjWatch
 from objwatch.targets import Targets
 from objwatch.tracer import Tracer
@@ -21,6 +21,11 @@ try:
 except ImportError:
     torch = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 golden_log = """DEBUG:objwatch:   run __main__.<module>
 DEBUG:objwatch:    run __main__.TestClass
@@ -299,6 +304,49 @@ class TestTensorShapeWrapper(unittest.TestCase):
         self.assertEqual(actual_call_msg, expected_call_msg)
 
 
+@unittest.skipIf(np is None, "NumPy not installed, skipping NumpyArrayWrapper tests.")
+class TestNumpyArrayWrapper(unittest.TestCase):
+    def setUp(self):
+        self.array_logger = NumpyArrayWrapper()
+
+    def test_wrap_call_with_array(self):
+        mock_frame = MagicMock()
+        mock_frame.f_code.co_varnames = ('array_arg', 'value')
+        mock_frame.f_code.co_argcount = 2
+        mock_frame.f_locals = {'array_arg': np.arange(12.0).reshape(3, 4), 'value': 42}
+        expected_call_msg = "'0':(ndarray)float64[3, 4] 96B min=0 max=11 mean=5.5 nan=0 inf=0, '1':42"
+        actual_call_msg = self.array_logger.wrap_call('test_array_func', mock_frame)
+        self.assertEqual(actual_call_msg, expected_call_msg)
+
+    def test_wrap_return_with_non_finite(self):
+        array = np.array([1.0, np.nan, np.inf, 3.0], dtype=np.float32)
+        expected_return_msg = "(ndarray)float32[4] 16B min=1 max=3 mean=2 nan=1 inf=1"
+        self.assertEqual(self.array_logger.wrap_return('test_array_func', array), expected_return_msg)
+
+    def test_wrap_upd_without_stats(self):
+        array = np.array(['a', 'b'])
+        self.assertEqual(self.array_logger.wrap_upd(None, array), ('None', '(ndarray)<U1[2] 8B'))
+        with patch.object(NumpyArrayWrapper, 'with_stats', False):
+            self.assertEqual(self.array_logger.wrap_return('f', np.zeros(2)), '(ndarray)float64[2] 16B')
+
+    def test_sampled_stats(self):
+        array = np.arange(1000).reshape(10, 100)[:, ::2]
+        with patch.object(NumpyArrayWrapper, 'stats_threshold', 100), patch.object(NumpyArrayWrapper, 'sample_size', 50):
+            return_msg = self.array_logger.wrap_return('f', array)
+        self.assertEqual(return_msg, "(ndarray)int64[10, 50] 4000B min=0 max=980 mean=490 (sampled 50 of 500)")
+
+    def test_wrap_call_with_array_list(self):
+        mock_frame = MagicMock()
+        mock_frame.f_code.co_varnames = ('arrays',)
+        mock_frame.f_code.co_argcount = 1
+        mock_frame.f_locals = {'arrays': [np.zeros((2, 2)) for _ in range(4)]}
+        expected_call_msg = "'0':(list)[(2, 2), (2, 2), (2, 2), '... (1 more elements)']"
+        self.assertEqual(self.array_logger.wrap_call('test_array_func', mock_frame), expected_call_msg)
+
+    def test_default_output_unchanged(self):
+        self.assertEqual(BaseWrapper().wrap_return('f', np.zeros(2)), '(type)ndarray')
+
+
 class TestCustomWrapper(unittest.TestCase):
     def setUp(self):
         class CustomWrapper(ABCWrapper):
@@ -340,9 +388,10 @@ class TestCustomWrapper(unittest.TestCase):
 
         trace_func = self.obj_watch.tracer.trace_factory()
 
-        trace_func(mock_frame, 'call', None)
+        local_trace = trace_func(mock_frame, 'call', None)
 
-        trace_func(mock_frame, 'return', 'custom_result')
+        # Like CPython, deliver the return to the local trace function set at the call
+        local_trace(mock_frame, 'return', 'custom_result')
 
         self.obj_watch.stop()
 
@@ -0,0 +1,49 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import json
+import unittest
+from objwatch.bench import SCENARIOS, compare, run_suite
+
+BASELINE = 'tools/bench/baseline.json'
+
+
+class TestBench(unittest.TestCase):
+    def test_run_suite(self):
+        report = run_suite(scale=0.01, repeat=1, select=['module/wide', 'CPUMemoryWrapper'])
+        self.assertEqual(set(report['results']), {'module/wide', 'CPUMemoryWrapper/methods'})
+        result = report['results']['module/wide']
+        # The leaf function is called 50 times below the workload function
+        self.assertEqual(result['calls'], 51)
+        self.assertGreater(result['lines'], result['calls'])
+        self.assertGreater(result['overhead'], 1)
+        self.assertAlmostEqual(result['calls_per_s'] * result['traced_s'], result['calls'])
+
+    def test_compare(self):
+        baseline = {'results': {'module/wide': {'overhead': 100.0}, 'json/wide': {'overhead': 100.0}}}
+        report = {
+            'results': {
+                'module/wide': {'overhead': 140.0},
+                'json/wide': {'overhead': 160.0},
+                'class/methods': {'overhead': 500.0},
+                'TorchMemoryWrapper/methods': {'skipped': 'torch is not installed'},
+            }
+        }
+        self.assertEqual(compare(report, baseline), ['json/wide: overhead 160.0x, baseline 100.0x'])
+        self.assertEqual(len(compare(report, baseline, threshold=0.3)), 2)
+
+    def test_baseline_covers_scenarios(self):
+        with open(BASELINE, encoding='utf-8') as f:
+            baseline = json.load(f)
+        self.assertEqual(set(baseline['results']), {scenario.name for scenario in SCENARIOS})
+
+    @unittest.skipUnless(os.environ.get('OBJWATCH_BENCH'), "Set OBJWATCH_BENCH=1 to run the benchmark suite")
+    def test_no_regression(self):
+        with open(BASELINE, encoding='utf-8') as f:
+            baseline = json.load(f)
+        self.assertEqual(compare(run_suite(), baseline), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import gc
+import array
+import weakref
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.fingerprint import fingerprint, is_buffer, _buffer_types
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Packet:
+    def __init__(self):
+        self.payload = bytearray(8)
+
+    def patch(self):
+        self.payload[0] = 1
+        self.payload[0] = 1
+        return len(self.payload)
+
+
+def fill():
+    samples = array.array('i', [0, 0])
+    samples[1] = 5
+    return samples
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_small_buffer(self):
+        data = bytearray(16)
+        before = fingerprint(data)
+        data[15] = 1
+        self.assertNotEqual(fingerprint(data), before)
+        # The buffer can still be resized after being fingerprinted
+        data.extend(b'ab')
+        self.assertIsNone(fingerprint(b'immutable'))
+        self.assertIsNone(fingerprint([1, 2]))
+
+    def test_cache_does_not_keep_types_alive(self):
+        cls = type('Temporary', (bytearray,), {})
+        self.assertTrue(is_buffer(cls(4)))
+        self.assertIn(cls, _buffer_types)
+        ref = weakref.ref(cls)
+        del cls
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_sampled_buffer(self):
+        data = bytearray(1 << 20)
+        before = fingerprint(data, full_limit=1024, blocks=4)
+        data[-1] = 1
+        self.assertNotEqual(fingerprint(data, full_limit=1024, blocks=4), before)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_numpy_array(self):
+        values = np.zeros((4, 4))
+        before = fingerprint(values)
+        values[2, 2] = 1.0
+        self.assertNotEqual(fingerprint(values), before)
+        self.assertIsNone(fingerprint(values[:, ::2]))
+
+
+class TestBufferChanges(unittest.TestCase):
+    def trace(self, **kwargs):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_buffer_changes.py'], with_locals=True, **kwargs))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                Packet().patch()
+                fill()
+            finally:
+                tracer.stop()
+        return [line.split(':', 2)[-1].strip() for line in logs.output if ' upd ' in line]
+
+    def test_in_place_changes(self):
+        updates = self.trace(detect_buffer_changes=True)
+        payload = [line for line in updates if 'Packet.payload' in line]
+        # Assigning the same byte again leaves the fingerprint unchanged
+        self.assertEqual(len(payload), 2)
+        samples = [line for line in updates if ' _.samples ' in line]
+        self.assertEqual(len(samples), 2)
+
+    def test_disabled(self):
+        updates = self.trace()
+        self.assertEqual(len([line for line in updates if 'Packet.payload' in line]), 1)
+        self.assertEqual(len([line for line in updates if ' _.samples ' in line]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
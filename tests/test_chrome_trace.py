@@ -0,0 +1,105 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import json
+import tempfile
+import unittest
+import importlib.util
+from unittest.mock import patch
+from objwatch import ObjWatch
+from objwatch.events import EventRecord, EventType
+from objwatch.sinks import ChromeTraceSink
+from objwatch.wrappers import BaseWrapper
+
+
+def load_chrome_trace():
+    spec = importlib.util.spec_from_file_location('chrome_trace', 'tools/chrome_trace/chrome_trace.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Model:
+    def __init__(self):
+        self.lr = 0.1
+        self.name = 'model'
+        self.history = []
+
+    def step(self):
+        self.history.append(self.lr)
+        self.lr = self.lr / 2
+        self.name = 'stepped'
+
+
+class TestChromeTrace(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.chrome_trace = os.path.join(self.tmp_dir.name, 'trace.trace.json')
+        self.output_json = os.path.join(self.tmp_dir.name, 'trace.json')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def check_trace(self, events):
+        phases = [event['ph'] for event in events]
+        self.assertEqual(phases.count('B'), phases.count('E'))
+        self.assertTrue(all(isinstance(event['ts'], float) for event in events))
+        begins = [event['name'] for event in events if event['ph'] == 'B']
+        self.assertIn('tests.test_chrome_trace.Model.step', begins)
+        counters = {event['name']: event['args'] for event in events if event['ph'] == 'C'}
+        self.assertEqual(counters['Model.lr'], {'value': 0.05})
+        self.assertEqual(counters['Model.history'], {'len': 1})
+        instants = [event['args'] for event in events if event['ph'] == 'i' and event['name'] == 'Model.name']
+        self.assertIn({'old': 'None', 'new': 'model'}, instants)
+
+    @patch('objwatch.utils.logger.get_logger')
+    def test_live_and_offline_export(self, mock_logger):
+        mock_logger.return_value = unittest.mock.Mock()
+        obj_watch = ObjWatch(
+            ['tests/test_chrome_trace.py'],
+            chrome_trace=self.chrome_trace,
+            output_json=self.output_json,
+            with_timestamps=True,
+            wrapper=BaseWrapper,
+        )
+        obj_watch.start()
+        try:
+            model = Model()
+            model.step()
+        finally:
+            obj_watch.stop()
+
+        with open(self.chrome_trace, 'r', encoding='utf-8') as f:
+            live_events = json.load(f)
+        self.check_trace(live_events)
+        self.assertIn('call_msg', live_events[0]['args'])
+
+        offline_trace = os.path.join(self.tmp_dir.name, 'offline.trace.json')
+        load_chrome_trace().ChromeTraceExporter([self.output_json]).export(offline_trace)
+        with open(offline_trace, 'r', encoding='utf-8') as f:
+            offline_events = json.load(f)
+        self.check_trace(offline_events)
+        self.assertEqual(
+            [(event['ph'], event['name']) for event in offline_events],
+            [(event['ph'], event['name']) for event in live_events],
+        )
+
+    def test_non_finite_values(self):
+        sink = ChromeTraceSink(self.chrome_trace, tid=0)
+        values = [(0.5, float('nan')), (float('nan'), 'inf'), ('inf', float('-inf')), (None, '-inf')]
+        for old, new in values:
+            sink.emit(EventRecord(0, 0, EventType.UPD, 1, 0, 'Model.lr', old, new, None))
+        sink.close()
+
+        with open(self.chrome_trace, 'r', encoding='utf-8') as f:
+            text = f.read()
+        # NaN and Infinity are not valid JSON, strict parsers reject the whole file
+        events = json.loads(text, parse_constant=lambda constant: self.fail(f'invalid JSON constant {constant}'))
+        self.assertEqual([event['ph'] for event in events], ['i'] * len(values))
+        self.assertEqual(events[0]['args'], {'old': 0.5, 'new': 'nan'})
+        self.assertEqual(events[1]['args'], {'old': 'nan', 'new': 'inf'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import io
+import os
+import time
+import runpy
+import marshal
+import tempfile
+import unittest
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from unittest.mock import patch
+from objwatch import ObjWatch
+from objwatch.collector import TraceCollector
+from objwatch.events import EventType, EventRecord
+from objwatch.sinks.collector_sink import CollectorSink
+
+
+class TestCollectorMerge(unittest.TestCase):
+    def test_merge_orders_by_timestamp(self):
+        collector = TraceCollector('unused.sock', 'unused.objwatch')
+        for conn_id in (0, 1):
+            collector.pending[conn_id] = deque()
+            collector.starved += 1
+
+        def batch(index, timestamps):
+            return [
+                EventRecord(ts, index, EventType.UPD, 10, 1, 'Sample.value', ts - 1, ts, None).pack() for ts in timestamps
+            ]
+
+        collector._receive(0, batch(0, [1, 4, 6]))
+        output = io.StringIO()
+        # Connection 1 has sent nothing yet, so nothing can be written before the deadline
+        collector._merge(output, 0, {0, 1})
+        self.assertEqual(output.getvalue(), '')
+
+        collector._receive(1, batch(1, [2, 3, 7]))
+        collector._merge(output, 0, {0, 1})
+        collector._merge(output, None, set())
+        lines = output.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ['[#0]', '[#1]', '[#1]', '[#0]', '[#0]', '[#1]'])
+        self.assertEqual(lines[0], '[#0]    10   upd Sample.value 0 -> 1')
+
+
+class TestCollectorSink(unittest.TestCase):
+    def test_flush_idle_batch(self):
+        mp_handlers = unittest.mock.Mock()
+        sink = CollectorSink(mp_handlers, 'unused.sock', flush_interval_ns=50_000_000)
+        try:
+            sink.emit(EventRecord(1, 0, EventType.UPD, 10, 1, 'Sample.value', 0, 1, None))
+            # No further event arrives, the batch is sent anyway
+            deadline = time.monotonic() + 5
+            while not mp_handlers.send_events.called and time.monotonic() < deadline:
+                time.sleep(0.01)
+            mp_handlers.send_events.assert_called_once()
+            self.assertEqual(len(marshal.loads(mp_handlers.send_events.call_args[0][0])), 1)
+        finally:
+            sink.close()
+        self.assertTrue(sink.closed.is_set())
+        mp_handlers.close_collector.assert_called_once()
+
+
+class TestCollectorProcesses(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.tmp_dir.name, 'objwatch.sock')
+        self.output = os.path.join(self.tmp_dir.name, 'merged.objwatch')
+        self.test_script = 'tests/test_collector_script.py'
+        with open(self.test_script, 'w') as f:
+            f.write(
+                """
+import multiprocessing
+
+
+def child_work(value):
+    total = value
+    return total
+
+
+def main():
+    ctx = multiprocessing.get_context('fork')
+    processes = [ctx.Process(target=child_work, args=(i,)) for i in range(2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    main()
+"""
+            )
+
+    def tearDown(self):
+        os.remove(self.test_script)
+        self.tmp_dir.cleanup()
+
+    @patch('objwatch.utils.logger.get_logger')
+    def test_collect_from_forked_processes(self, mock_logger):
+        mock_logger.return_value = unittest.mock.Mock()
+        collector = TraceCollector(self.address, self.output)
+        collector.start()
+
+        obj_watch = ObjWatch([self.test_script], collector=self.address, fork_safe=True)
+        obj_watch.start()
+        try:
+            runpy.run_path(self.test_script, run_name="__main__")
+        finally:
+            obj_watch.stop()
+            collector.stop(timeout=10)
+
+        with open(self.output, 'r') as f:
+            merged = f.read()
+        self.assertEqual(merged.count('run __main__.child_work'), 2)
+        self.assertEqual(merged.count('end __main__.child_work'), 2)
+        self.assertIn('run __main__.main', merged)
+        self.assertIn('end __main__.main', merged)
+
+    @patch('objwatch.utils.logger.get_logger')
+    def test_reject_unauthenticated_connections(self, mock_logger):
+        mock_logger.return_value = unittest.mock.Mock()
+        collector = TraceCollector(self.address, self.output)
+        collector.start()
+        try:
+            with self.assertRaises(AuthenticationError):
+                Client(self.address, authkey=b'not the secret')
+            with patch.dict(os.environ, {'OBJWATCH_COLLECTOR_AUTHKEY': 'not the secret either'}):
+                with self.assertRaises(AuthenticationError):
+                    ObjWatch([self.test_script], collector=self.address).start()
+        finally:
+            # The collector keeps accepting authenticated connections
+            collector.stop(timeout=10)
+        self.assertEqual(collector.process.exitcode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import sys
+import json
+import signal
+import socket
+import tempfile
+import unittest
+from unittest.mock import patch
+from objwatch.constants import Constants
+from objwatch.core import ObjWatch
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.control import send_command
+
+
+def work(n):
+    total = 0
+    for i in range(n):
+        total += step(i)
+    return total
+
+
+def step(i):
+    return i * 2
+
+
+def pause_inside(tracer):
+    step(1)
+    tracer.pause()
+    return step(2)
+
+
+@unittest.skipUnless(hasattr(signal, 'SIGUSR1') and hasattr(socket, 'AF_UNIX'), 'POSIX only')
+class TestControlChannel(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.previous_trace = sys.gettrace()
+        sys.settrace(None)
+
+    def tearDown(self):
+        sys.settrace(self.previous_trace)
+        self.tmpdir.cleanup()
+
+    def test_socket(self):
+        path = os.path.join(self.tmpdir.name, 'control.sock')
+        json_path = os.path.join(self.tmpdir.name, 'trace.json')
+        obj_watch = ObjWatch(['tests/test_control.py'], control_socket=path, output_json=json_path)
+        try:
+            self.assertEqual(send_command(path, 'status'), 'ok idle')
+            self.assertIsNone(sys.gettrace())
+            with self.assertLogs('objwatch', level='DEBUG') as logs:
+                work(2)
+                self.assertEqual(send_command(path, 'start'), 'ok tracing')
+                # The JSON output no longer takes over the signals of the control channel
+                self.assertEqual(signal.getsignal(signal.SIGUSR1), obj_watch.control._signal_handler)
+                work(2)
+                self.assertEqual(send_command(path, 'stop'), 'ok paused')
+                self.assertIsNone(sys.gettrace())
+                work(2)
+                self.assertEqual(send_command(path, 'flush'), 'ok paused')
+                self.assertEqual(send_command(path, 'start'), 'ok tracing')
+                work(1)
+                self.assertEqual(send_command(path, 'jump'), 'error unknown command: jump')
+                self.assertEqual(send_command(path, 'remove tests/test_control.py'), 'ok tracing')
+                work(1)
+            runs = [line for line in logs.output if ' run ' in line]
+            self.assertEqual(len(runs), 5)
+
+            # Snapshot written by the flush command
+            with open(json_path) as f:
+                events = json.load(f)['ObjWatch']['events']
+            self.assertEqual([event['qualified_name'] for event in events], ['tests.test_control.work'])
+        finally:
+            obj_watch.stop()
+        with open(json_path) as f:
+            events = json.load(f)['ObjWatch']['events']
+        self.assertEqual([event['qualified_name'] for event in events], ['tests.test_control.work'] * 2)
+        self.assertFalse(os.path.exists(path))
+        self.assertNotEqual(signal.getsignal(signal.SIGUSR1), obj_watch.control._signal_handler)
+
+    def test_socket_permissions(self):
+        path = os.path.join(self.tmpdir.name, 'control.sock')
+        obj_watch = ObjWatch(['tests/test_control.py'], control_socket=path)
+        try:
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+        finally:
+            obj_watch.control.close()
+
+    def test_timed_out_command_is_dropped(self):
+        path = os.path.join(self.tmpdir.name, 'control.sock')
+        obj_watch = ObjWatch(['tests/test_control.py'], control_socket=path)
+        try:
+            # The main thread does not handle the command before the timeout
+            signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGUSR1})
+            try:
+                with patch.object(Constants, 'CONTROL_TIMEOUT', 0.2):
+                    reply = send_command(path, 'start')
+            finally:
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGUSR1})
+            self.assertTrue(reply.startswith('error'))
+            self.assertTrue(obj_watch.control.requests.empty())
+            self.assertEqual(obj_watch.control.status(), 'idle')
+            self.assertEqual(send_command(path, 'status'), 'ok idle')
+        finally:
+            obj_watch.control.close()
+
+    def test_command_file(self):
+        command_file = os.path.join(self.tmpdir.name, 'commands')
+        with open(command_file, 'w') as f:
+            f.write('start\n')
+        obj_watch = ObjWatch(['tests/test_control.py'], control_file=command_file)
+        try:
+            with self.assertLogs('objwatch', level='DEBUG') as logs:
+                os.kill(os.getpid(), signal.SIGUSR1)
+                self.assertEqual(obj_watch.control.status(), 'tracing')
+                work(1)
+                os.kill(os.getpid(), signal.SIGUSR2)
+                self.assertEqual(obj_watch.control.status(), 'paused')
+                work(1)
+            self.assertEqual(len([line for line in logs.output if ' run ' in line]), 2)
+        finally:
+            obj_watch.stop()
+
+
+class TestPause(unittest.TestCase):
+    def test_pause_ends_open_calls(self):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_control.py']))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                pause_inside(tracer)
+                self.assertEqual(tracer.call_depth, 0)
+                tracer.resume()
+                step(3)
+            finally:
+                tracer.stop()
+        events = [line.split(':', 2)[-1].split(None, 1)[-1].strip() for line in logs.output]
+        calls = [event for event in events if event.startswith(('run ', 'end '))]
+        self.assertEqual(
+            calls,
+            [
+                'run tests.test_control.pause_inside',
+                'run tests.test_control.step',
+                'end tests.test_control.step',
+                'end tests.test_control.pause_inside',
+                'run tests.test_control.step',
+                'end tests.test_control.step',
+            ],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
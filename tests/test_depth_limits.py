@@ -0,0 +1,80 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+
+
+def leaf(n):
+    return n
+
+
+def recurse(n):
+    if n == 0:
+        return leaf(0)
+    return recurse(n - 1) + 1
+
+
+def outer():
+    return recurse(5) + recurse(1)
+
+
+class TestDepthLimits(unittest.TestCase):
+    def trace(self, **kwargs):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_depth_limits.py'], **kwargs))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                result = outer()
+            finally:
+                tracer.stop()
+        self.assertEqual(result, 6)
+        return tracer, [line.split(':', 2)[-1].strip() for line in logs.output if ' run ' in line or ' end ' in line]
+
+    def test_max_depth(self):
+        tracer, events = self.trace(max_depth=3)
+        runs = [line for line in events if ' run ' in line]
+        self.assertEqual(len(runs), 5)
+        self.assertTrue(any(line.endswith('end tests.test_depth_limits.recurse [5 calls elided]') for line in events))
+        self.assertTrue(any(line.endswith('end tests.test_depth_limits.recurse [1 calls elided]') for line in events))
+        self.assertEqual(tracer.elided_calls, {})
+
+    def test_max_subtree_depth(self):
+        tracer, events = self.trace(max_subtree_depth={'tests.test_depth_limits.recurse': 0})
+        runs = [line for line in events if ' run ' in line]
+        self.assertEqual(len(runs), 3)
+        self.assertTrue(any(line.endswith('end tests.test_depth_limits.recurse [6 calls elided]') for line in events))
+        self.assertTrue(any(line.endswith('end tests.test_depth_limits.recurse [2 calls elided]') for line in events))
+        self.assertEqual(tracer.depth_limits, [])
+
+    def test_outputs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = os.path.join(tmpdir, 'trace.json')
+            sqlite_path = os.path.join(tmpdir, 'trace.db')
+            self.trace(max_depth=2, output_json=json_path, output_sqlite=sqlite_path)
+
+            with open(json_path) as f:
+                calls = json.load(f)['ObjWatch']['events'][0]['events']
+            self.assertEqual([call.get('elided_calls') for call in calls], [6, 2])
+
+            connection = sqlite3.connect(sqlite_path)
+            try:
+                rows = connection.execute('SELECT depth, elided_calls FROM calls ORDER BY id').fetchall()
+            finally:
+                connection.close()
+            self.assertEqual(rows, [(0, None), (1, 6), (1, 2)])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ObjWatchConfig(targets=['tests/test_depth_limits.py'], max_depth=0)
+        with self.assertRaises(ValueError):
+            ObjWatchConfig(targets=['tests/test_depth_limits.py'], max_subtree_depth={'outer': -1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import sys
+import unittest
+from unittest.mock import patch
+from objwatch import ObjWatch
+from objwatch.config import ObjWatchConfig
+from objwatch.events import EventType, EventRecord
+from objwatch.sinks import FlightRecorderSink
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def increment(self):
+        self.value += 1
+
+
+class TestFlightRecorderSink(unittest.TestCase):
+    def test_keeps_most_recent_records(self):
+        sink = FlightRecorderSink(size=3)
+        for ts in range(5):
+            sink.emit(EventRecord(ts, 0, EventType.UPD, 1, 0, 'Counter.value', ts - 1, ts, None))
+        self.assertEqual([record.timestamp for record in sink.records()], [2, 3, 4])
+        self.assertEqual(sink.total, 5)
+
+    def test_config_validation(self):
+        with self.assertRaises(ValueError):
+            ObjWatchConfig(targets=['a.py'], mode='unknown')
+        with self.assertRaises(ValueError):
+            ObjWatchConfig(targets=['a.py'], mode='flight_recorder', output_json='trace.json')
+        with self.assertRaises(ValueError):
+            ObjWatchConfig(targets=['a.py'], mode='flight_recorder', flight_recorder_size=0)
+
+
+class TestFlightRecorderMode(unittest.TestCase):
+    def test_dump_on_request(self):
+        obj_watch = ObjWatch(['tests/test_flight_recorder.py'], mode='flight_recorder', flight_recorder_size=4)
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            obj_watch.start()
+            try:
+                counter = Counter()
+                for _ in range(10):
+                    counter.increment()
+            finally:
+                obj_watch.stop()
+        # Nothing is logged while recording
+        self.assertFalse([record for record in logs.records if record.levelname == 'DEBUG'])
+
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            obj_watch.dump_flight_recorder()
+        lines = [record.getMessage() for record in logs.records if record.levelname == 'DEBUG']
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[-1].endswith('end tests.test_flight_recorder.Counter.increment'))
+        self.assertIn('upd Counter.value 8 -> 9', lines[-2])
+
+    def test_index_of_uninitialized_framework(self):
+        obj_watch = ObjWatch(['tests/test_flight_recorder.py'], mode='flight_recorder', framework='multiprocessing')
+        with self.assertLogs('objwatch', level='DEBUG'):
+            obj_watch.start()
+            try:
+                Counter().increment()
+            finally:
+                obj_watch.stop()
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            obj_watch.dump_flight_recorder()
+        lines = [record.getMessage() for record in logs.records if record.levelname == 'DEBUG']
+        self.assertTrue(lines)
+        # The index of the process is unknown in the main process, as for the lines of the tracer
+        self.assertFalse([line for line in lines if line.startswith('[#')])
+
+    def test_dump_on_uncaught_exception(self):
+        previous_hook = unittest.mock.Mock()
+        with patch.object(sys, 'excepthook', previous_hook), self.assertLogs('objwatch', level='DEBUG') as logs:
+            obj_watch = ObjWatch(['tests/test_flight_recorder.py'], mode='flight_recorder')
+            obj_watch.start()
+            try:
+                Counter().increment()
+                sys.excepthook(RuntimeError, RuntimeError('boom'), None)
+            finally:
+                obj_watch.stop()
+            self.assertIs(sys.excepthook, previous_hook)
+
+        previous_hook.assert_called_once()
+        output = '\n'.join(logs.output)
+        self.assertIn('Flight recorder dump (uncaught RuntimeError)', output)
+        self.assertIn('upd Counter.value', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import json
+import runpy
+import unittest
+from unittest.mock import patch
+from objwatch import ObjWatch
+from objwatch.utils.util import per_process_path
+
+
+def collect_qualified_names(events):
+    names = []
+    for event in events:
+        if event['type'] == 'Function':
+            names.append(event['qualified_name'])
+            names.extend(collect_qualified_names(event['events']))
+    return names
+
+
+class TestForkSafe(unittest.TestCase):
+    def setUp(self):
+        self.test_script = 'tests/test_fork_script.py'
+        self.test_output = 'test_fork.json'
+        with open(self.test_script, 'w') as f:
+            f.write(
+                """
+import multiprocessing
+
+
+def child_work():
+    total = 0
+    for i in range(3):
+        total += i
+    return total
+
+
+def parent_work():
+    return 1
+
+
+def main():
+    ctx = multiprocessing.get_context('fork')
+    process = ctx.Process(target=child_work)
+    process.start()
+    process.join()
+    parent_work()
+    return process.pid
+
+
+if __name__ == '__main__':
+    child_pid = main()
+"""
+            )
+
+    def tearDown(self):
+        os.remove(self.test_script)
+        if os.path.exists(self.test_output):
+            os.remove(self.test_output)
+
+    @patch('objwatch.utils.logger.get_logger')
+    def test_fork_child_writes_own_json(self, mock_logger):
+        mock_logger.return_value = unittest.mock.Mock()
+        obj_watch = ObjWatch([self.test_script], output_json=self.test_output, fork_safe=True)
+        obj_watch.start()
+        try:
+            script_globals = runpy.run_path(self.test_script, run_name="__main__")
+        finally:
+            obj_watch.stop()
+
+        child_output = per_process_path(self.test_output, script_globals['child_pid'])
+        self.addCleanup(lambda: os.path.exists(child_output) and os.remove(child_output))
+        self.assertTrue(os.path.exists(child_output), "Forked child did not write its own JSON trace.")
+
+        with open(child_output, 'r') as f:
+            child_names = collect_qualified_names(json.load(f)['ObjWatch']['events'])
+        with open(self.test_output, 'r') as f:
+            parent_names = collect_qualified_names(json.load(f)['ObjWatch']['events'])
+
+        self.assertIn('__main__.child_work', child_names)
+        self.assertNotIn('__main__.parent_work', child_names)
+        self.assertIn('__main__.parent_work', parent_names)
+        self.assertNotIn('__main__.child_work', parent_names)
+
+    def test_per_process_path(self):
+        self.assertEqual(per_process_path('logs/trace.objwatch', 42), 'logs/trace.42.objwatch')
+        self.assertEqual(per_process_path('trace.json', 7), 'trace.7.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
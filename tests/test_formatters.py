@@ -0,0 +1,159 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import gc
+import weakref
+import unittest
+from collections import OrderedDict
+from enum import Enum
+from objwatch.config import ObjWatchConfig
+from objwatch.event_handls import EventHandls
+from objwatch.formatters import (
+    FormatLimits,
+    FormatterRegistry,
+    format_fallback,
+    format_sequence,
+    registry,
+    register_formatter,
+    unregister_formatter,
+)
+from objwatch.tracer import Tracer
+from objwatch.wrappers import BaseWrapper
+
+
+class Color(Enum):
+    RED = 1
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Point3D(Point):
+    pass
+
+
+def format_point(value):
+    return f"(Point){value.x},{value.y}"
+
+
+class TestFormatterRegistry(unittest.TestCase):
+    def tearDown(self):
+        unregister_formatter(Point)
+
+    def test_default_formatting(self):
+        self.assertEqual(EventHandls._format_value(3), '3')
+        self.assertEqual(EventHandls._format_value(None), 'None')
+        self.assertEqual(EventHandls._format_value(Color.RED), 'Color.RED')
+        self.assertEqual(EventHandls._format_value([1, 2]), '(list)[1, 2]')
+        self.assertEqual(EventHandls._format_value(OrderedDict(a=1)), "(OrderedDict)[('a', 1)]")
+        self.assertEqual(EventHandls._format_value(Point), '(type)Point')
+        self.assertEqual(EventHandls._format_value(len), '(type)len')
+        self.assertEqual(EventHandls._format_value(Point(1, 2)), '(type)Point')
+
+    def test_register(self):
+        point = Point3D(1, 2)
+        self.assertEqual(EventHandls._format_value(point), '(type)Point3D')
+        self.assertIs(registry.dispatch[Point3D], format_fallback)
+
+        register_formatter(Point, format_point)
+        # Subclasses resolve to the formatter of their closest registered base
+        self.assertEqual(EventHandls._format_value(point), '(Point)1,2')
+        self.assertEqual(BaseWrapper()._format_value(point), '(Point)1,2')
+
+        unregister_formatter(Point)
+        self.assertEqual(EventHandls._format_value(point), '(type)Point3D')
+
+    def test_child_registry(self):
+        child = FormatterRegistry(parent=registry)
+        child.register(int, lambda value: f"(int){value}")
+        self.assertEqual(child.format(True), '(int)True')
+        self.assertEqual(child.format('a'), 'a')
+
+        # Registrations in the parent reach the cached dispatch of the child
+        self.assertEqual(child.format(Point(1, 2)), '(type)Point')
+        register_formatter(Point, format_point)
+        self.assertEqual(child.format(Point(1, 2)), '(Point)1,2')
+
+    def test_return_value(self):
+        wrapper = BaseWrapper()
+        self.assertEqual(wrapper._format_return([1]), '[(list)[1]]')
+        self.assertEqual(wrapper._format_return(1), '1')
+
+    def test_dispatch_does_not_keep_types_alive(self):
+        local = FormatterRegistry(parent=registry)
+        cls = type('Temporary', (), {})
+        self.assertEqual(local.format(cls()), '(type)Temporary')
+        self.assertIn(cls, local.dispatch)
+        self.assertIn(cls, registry.dispatch)
+        ref = weakref.ref(cls)
+        del cls
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(local.dispatch), 0)
+        # Builtin types are never freed and are cached in a plain dict
+        self.assertEqual(local.format(1), '1')
+        self.assertIn(int, local.static_dispatch)
+        self.assertNotIn(int, local.dispatch)
+
+
+class CountingList(list):
+    """List counting the elements visited by iteration."""
+
+    visited = 0
+
+    def __iter__(self):
+        for x in super().__iter__():
+            CountingList.visited += 1
+            yield x
+
+
+class TestBoundedFormatting(unittest.TestCase):
+    def test_default_output(self):
+        self.assertEqual(format_sequence([1, 'a', None, 4]), "(list)[1, 'a', None, '... (1 more elements)']")
+        self.assertEqual(format_sequence({'a': 1, 'b': 2}), "(dict)[('a', 1), ('b', 2)]")
+        self.assertEqual(format_sequence((1, [2])), '(tuple)[2 elements]')
+        self.assertEqual(format_sequence({'a': [1]}, func=lambda values: [len(v) for v in values]), "(dict)[('a', 1)]")
+        # Strings are not cut by default
+        self.assertEqual(format_sequence(['x' * 5000]), f"(list)['{'x' * 5000}']")
+
+    def test_visits_displayed_elements(self):
+        CountingList.visited = 0
+        seq = CountingList(range(100000))
+        self.assertEqual(format_sequence(seq), "(CountingList)[0, 1, 2, '... (99997 more elements)']")
+        self.assertEqual(CountingList.visited, 3)
+        big = dict.fromkeys(range(100000), 0)
+        self.assertEqual(format_sequence(big, max_elements=1), "(dict)[(0, 0), '... (99999 more elements)']")
+
+    def test_character_budget(self):
+        self.assertEqual(format_sequence(['abc', 'def', 'ghi'], max_chars=12), "(list)['abc', 'def', '... (1 more elements)']")
+        self.assertEqual(format_sequence(['x' * 100], max_chars=4), "(list)['xxxx'...]")
+
+    def test_nesting(self):
+        value = {'a': [1, (2, [3])]}
+        self.assertEqual(format_sequence(value), '(dict)[1 elements]')
+        self.assertEqual(format_sequence(value, max_nesting=2), "(dict)[('a', (list)[2 elements])]")
+        self.assertEqual(format_sequence(value, max_nesting=3), "(dict)[('a', (list)[1, (tuple)[2 elements]])]")
+
+    def test_limits_per_tracer(self):
+        value = ['abc', 'def', 'ghi', 'jkl']
+        limited = Tracer(ObjWatchConfig(targets=['tests/test_formatters.py'], max_elements=1, max_chars=2))
+        wrapped = Tracer(ObjWatchConfig(targets=['tests/test_formatters.py'], max_elements=2, wrapper=BaseWrapper))
+        limited.start()
+        limited.stop()
+        wrapped.start()
+        wrapped.stop()
+
+        self.assertEqual(limited.snapshot_formatter(value), "(list)['ab'..., '... (3 more elements)']")
+        self.assertEqual(wrapped.snapshot_formatter(value), "(list)['abc', 'def', '... (2 more elements)']")
+        # Neither changes the formatting of other tracers or of the module functions
+        self.assertEqual(EventHandls._format_value(value), "(list)['abc', 'def', 'ghi', '... (1 more elements)']")
+        self.assertEqual(BaseWrapper()._format_value(value), "(list)['abc', 'def', 'ghi', '... (1 more elements)']")
+        limits = FormatLimits(max_elements=2)
+        self.assertEqual(EventHandls._format_value(value, limits), "(list)['abc', 'def', '... (2 more elements)']")
+
+
+if __name__ == '__main__':
+    unittest.main()
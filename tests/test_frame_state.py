@@ -0,0 +1,72 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import gc
+import sys
+import weakref
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+
+
+class Blob:
+    pass
+
+
+def produce(refs):
+    blob = Blob()
+    refs.append(weakref.ref(blob))
+    values = [1]
+    while True:
+        values.append(len(values))
+        yield values
+
+
+def stop_within(tracer, refs):
+    blob = Blob()
+    refs.append(weakref.ref(blob))
+    traced = sys._getframe().f_trace is not None
+    tracer.stop()
+    return traced, sys._getframe().f_trace is None
+
+
+class TestFrameState(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer(ObjWatchConfig(targets=['tests/test_frame_state.py'], with_locals=True))
+        # Frames must be freed by reference counting alone
+        gc.disable()
+
+    def tearDown(self):
+        gc.enable()
+
+    def test_abandoned_generator(self):
+        refs: list = []
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            self.tracer.start()
+            try:
+                generator = produce(refs)
+                next(generator)
+                next(generator)
+                del generator
+            finally:
+                self.tracer.stop()
+        self.assertIsNone(refs[0]())
+        updates = [line.split(':', 2)[-1].strip() for line in logs.output if ' upd ' in line]
+        self.assertTrue(any(line.endswith('upd _.values None -> (list)[1]') for line in updates))
+
+    def test_frames_alive_at_stop(self):
+        refs: list = []
+        with self.assertLogs('objwatch', level='DEBUG'):
+            self.tracer.start()
+            try:
+                traced, cleared = stop_within(self.tracer, refs)
+            finally:
+                self.tracer.stop()
+        self.assertTrue(traced)
+        self.assertTrue(cleared)
+        # The return of the frame was not seen, its locals are freed all the same
+        self.assertIsNone(refs[0]())
+
+
+if __name__ == '__main__':
+    unittest.main()
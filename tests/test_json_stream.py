@@ -0,0 +1,142 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import json
+import tempfile
+import unittest
+import importlib.util
+from unittest.mock import patch
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.wrappers import BaseWrapper
+from objwatch.events import EventType
+from objwatch.utils.json_stream import TraceReader
+
+
+def load_merge_traces():
+    spec = importlib.util.spec_from_file_location('merge_traces', 'tools/merge_traces/merge_traces.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def flatten(events, depth=0):
+    flat = []
+    for event in events:
+        if event['type'] == 'Function':
+            flat.append(('run', event['qualified_name'], depth))
+            flat.extend(flatten(event['events'], depth + 1))
+            flat.append(('end', event['qualified_name'], depth))
+        else:
+            flat.append((event['type'], event['name'], depth))
+    return flat
+
+
+class Sample:
+    def __init__(self):
+        self.values = []
+
+    def fill(self, n):
+        for i in range(n):
+            self.values.append(i)
+        self.total = self.count()
+        return self.total
+
+    def count(self):
+        return len(self.values)
+
+
+class TestTraceReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.test_output = os.path.join(self.tmp_dir.name, 'trace.json')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @patch('objwatch.utils.logger.get_logger')
+    def test_stream_matches_loaded_trace(self, mock_logger):
+        mock_logger.return_value = unittest.mock.Mock()
+        config = ObjWatchConfig(
+            targets='tests/test_json_stream.py', output_json=self.test_output, wrapper=BaseWrapper, with_timestamps=True
+        )
+        tracer = Tracer(config=config)
+        tracer.start()
+        tracer.event_handlers.set_clock(0, 42)
+        try:
+            Sample().fill(3)
+        finally:
+            tracer.stop()
+
+        with open(self.test_output, 'r', encoding='utf-8') as f:
+            expected = flatten(json.load(f)['ObjWatch']['events'])
+
+        # A tiny chunk size splits values across chunk boundaries
+        for chunk_size in (3, 64, 65536):
+            with TraceReader(self.test_output, chunk_size=chunk_size) as reader:
+                self.assertEqual(reader.header['clock'], {'index': 0, 'sync_ns': 42})
+                events = [
+                    (kind, event.get('qualified_name', event.get('name')), depth) for kind, event, depth in reader.events()
+                ]
+            self.assertEqual(events, expected)
+
+        with TraceReader(self.test_output) as reader:
+            records = list(reader.records())
+        self.assertEqual(records[0].event_type, EventType.RUN)
+        self.assertEqual(records[0].name, 'tests.test_json_stream.Sample.__init__')
+        self.assertTrue(records[0].new.startswith("'0':"))
+        timestamps = [record.timestamp for record in records]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertGreater(timestamps[0], 0)
+
+
+class TestMergeTraces(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_trace(self, index, sync_ns, timestamps):
+        events = [
+            {
+                'id': i + 1,
+                'type': 'upd',
+                'name': 'Sample.value',
+                'line': 10,
+                'old': i,
+                'new': i + 1,
+                'call_depth': 0,
+                'ts': ts,
+            }
+            for i, ts in enumerate(timestamps)
+        ]
+        trace = {
+            'ObjWatch': {
+                'runtime_info': {},
+                'config': {'with_timestamps': True, 'wrapper': None},
+                'clock': {'index': index, 'sync_ns': sync_ns},
+                'events': events,
+            }
+        }
+        path = os.path.join(self.tmp_dir.name, f'trace.{index}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, separators=(',', ':'))
+        return path
+
+    def test_merge_aligns_clocks(self):
+        merge_traces = load_merge_traces()
+        # The clock of process 1 runs 1000ns ahead of the clock of process 0
+        paths = [self.write_trace(1, 2000, [1100, 1400]), self.write_trace(0, 1000, [200, 300, 500])]
+        output = os.path.join(self.tmp_dir.name, 'merged.objwatch')
+        merge_traces.TraceMerger(paths, chunk_size=16).merge(output)
+
+        with open(output, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ['[#1]', '[#0]', '[#0]', '[#1]', '[#0]'])
+        self.assertEqual(lines[0], '[#1]    10 upd Sample.value 0 -> 1')
+
+
+if __name__ == '__main__':
+    unittest.main()
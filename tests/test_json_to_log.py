@@ -0,0 +1,165 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+import importlib.util
+
+
+def load_json_to_log():
+    spec = importlib.util.spec_from_file_location('json_to_log', 'tools/json_to_log/json_to_log.py')
+    module = importlib.util.module_from_spec(spec)
+    # Registered so that worker processes can unpickle the converter
+    sys.modules['json_to_log'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+HEADER = {
+    'runtime_info': {'version': '0.0.0', 'start_time': 'now', 'system_info': 'test', 'python_version': '3'},
+    'config': {'targets': ['sample.py'], 'with_locals': False},
+}
+
+
+def write_nested_trace(path, depth):
+    """Write a trace whose functions are nested `depth` levels deep, as json.dump would write it."""
+    header = json.dumps(HEADER, separators=(',', ':'))[1:-1]
+    inner = [
+        {'id': depth, 'type': 'upd', 'name': 'Sample.x', 'line': 11, 'old': 'None', 'new': '1'},
+        {
+            'id': depth + 1,
+            'type': 'apd',
+            'name': 'Sample.values',
+            'line': 11,
+            'old': {'type': 'int', 'len': 0},
+            'new': {'type': 'int', 'len': 1},
+        },
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"ObjWatch":{' + header + ',"events":[')
+        for level in range(depth):
+            f.write(
+                f'{{"id":{level},"type":"Function","module":"sample","symbol":"rec","symbol_type":"function",'
+                f'"qualified_name":"sample.rec","run_line":10,"call_msg":"\'0\':{level}","events":['
+            )
+        f.write(','.join(json.dumps(event, separators=(',', ':')) for event in inner))
+        for level in reversed(range(depth)):
+            f.write(f'],"end_line":12,"return_msg":"{level}"}}')
+        f.write(']}}')
+
+
+def legacy_function(symbol, run_line, events, index):
+    """Function event in the key order of traces written before call messages preceded the nested events."""
+    return {
+        'id': index,
+        'type': 'Function',
+        'module': '__main__',
+        'symbol': symbol,
+        'symbol_type': 'function',
+        'run_line': run_line,
+        'qualified_name': f'__main__.{symbol}',
+        'events': events,
+        'call_msg': f"'0':{index}, '1':{index + 1}",
+        'end_line': run_line + 2,
+        'return_msg': str(index),
+    }
+
+
+class TestJSONToLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.module = load_json_to_log()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_lines(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().split('\n')
+
+    def test_convert_format(self):
+        json_path = os.path.join(self.tmp_dir.name, 'trace.json')
+        log_path = os.path.join(self.tmp_dir.name, 'trace.objwatch')
+        write_nested_trace(json_path, 2)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['ObjWatch']['config'], HEADER['config'])
+
+        count = self.module.JSONToLogConverter(chunk_size=64).convert(json_path, log_path)
+
+        lines = self.read_lines(log_path)
+        self.assertEqual(count, 6)
+        self.assertEqual(lines[0], '=' * 80)
+        self.assertIn('* targets:', lines)
+        self.assertIn('  - sample.py', lines)
+        self.assertEqual(
+            lines[-6:],
+            [
+                "   10 run sample.rec <- '0':0",
+                "   10   run sample.rec <- '0':1",
+                "   11     upd Sample.x None -> 1",
+                "   11     apd Sample.values (int)(len)0 -> 1",
+                "   12   end sample.rec -> 1",
+                "   12 end sample.rec -> 0",
+            ],
+        )
+
+    def test_convert_legacy_key_order(self):
+        json_path = os.path.join(self.tmp_dir.name, 'legacy.json')
+        log_path = os.path.join(self.tmp_dir.name, 'legacy.objwatch')
+        inner = legacy_function('g', 20, [{'id': 2, 'type': 'upd', 'name': '_.x', 'line': 21, 'old': 'None', 'new': '1'}], 1)
+        events = [legacy_function('f', 10, [inner, legacy_function('h', 30, [], 3)], 0)]
+        config = dict(HEADER['config'], wrapper='BaseWrapper')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'ObjWatch': {'runtime_info': HEADER['runtime_info'], 'config': config, 'events': events}}, f)
+
+        count = self.module.JSONToLogConverter(chunk_size=64).convert(json_path, log_path)
+
+        lines = self.read_lines(log_path)
+        self.assertEqual(count, 7)
+        self.assertEqual(
+            lines[-7:],
+            [
+                "   10 run __main__.f <- '0':0, '1':1",
+                "   20   run __main__.g <- '0':1, '1':2",
+                "   21     upd _.x None -> 1",
+                "   22   end __main__.g -> 1",
+                "   30   run __main__.h <- '0':3, '1':4",
+                "   32   end __main__.h -> 3",
+                "   12 end __main__.f -> 0",
+            ],
+        )
+
+    def test_convert_deep_trace(self):
+        depth = sys.getrecursionlimit() * 2
+        json_path = os.path.join(self.tmp_dir.name, 'deep.json')
+        log_path = os.path.join(self.tmp_dir.name, 'deep.objwatch')
+        write_nested_trace(json_path, depth)
+
+        count = self.module.JSONToLogConverter().convert(json_path, log_path)
+
+        lines = self.read_lines(log_path)
+        self.assertEqual(count, depth * 2 + 2)
+        self.assertEqual(lines[-1], "   12 end sample.rec -> 0")
+        self.assertTrue(lines[-depth - 2].startswith(f"   11 {'  ' * depth}upd Sample.x"))
+
+    def test_convert_many_in_parallel(self):
+        jobs = []
+        for rank in range(3):
+            json_path = os.path.join(self.tmp_dir.name, f'trace_{rank}.json')
+            write_nested_trace(json_path, rank + 1)
+            jobs.append((json_path, os.path.join(self.tmp_dir.name, f'trace_{rank}.objwatch')))
+
+        count = self.module.JSONToLogConverter().convert_many(jobs, processes=2)
+
+        self.assertEqual(count, sum((rank + 1) * 2 + 2 for rank in range(3)))
+        for rank, (_, log_path) in enumerate(jobs):
+            lines = self.read_lines(log_path)
+            self.assertEqual(lines[-1], "   12 end sample.rec -> 0")
+            self.assertEqual(sum(1 for line in lines if ' run sample.rec' in line), rank + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
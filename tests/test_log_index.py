@@ -0,0 +1,101 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import logging
+import tempfile
+import unittest
+from objwatch import ObjWatch
+from objwatch.utils.log_index import LogIndex
+
+
+class Tree:
+    def __init__(self):
+        self.visited = []
+
+    def walk(self, depth):
+        self.visited.append(depth)
+        if depth:
+            self.leaf()
+            self.walk(depth - 1)
+        return depth
+
+    def leaf(self):
+        return 'λ'
+
+
+class TestLogIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp_dir.name, 'trace.objwatch')
+        with open(self.output, 'w', encoding='utf-8') as f:
+            f.write('header written before tracing\n')
+        # The logger only gets the indexed file handler if neither it nor its ancestors have handlers
+        self.logger = logging.getLogger('objwatch')
+        self.level = self.logger.level
+        self.propagate = self.logger.propagate
+        self.logger.propagate = False
+        self.handlers = self.logger.handlers[:]
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+
+    def tearDown(self):
+        for handler in self.logger.handlers[:]:
+            handler.close()
+            self.logger.removeHandler(handler)
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+        self.logger.setLevel(self.level)
+        self.logger.propagate = self.propagate
+        self.tmp_dir.cleanup()
+
+    def test_index_calls(self):
+        obj_watch = ObjWatch(['tests/test_log_index.py'], output=self.output, output_index=True, level=logging.DEBUG)
+        obj_watch.start()
+        try:
+            tree = Tree()
+            # Buffered entries are written on flush while tracing goes on
+            obj_watch.flush()
+            with LogIndex(self.output) as index:
+                self.assertEqual(len(index), 1)
+                self.assertEqual(index.call(0).name, 'tests.test_log_index.Tree.__init__')
+                self.assertIsNotNone(index.call(0).end)
+            tree.walk(3)
+        finally:
+            obj_watch.stop()
+
+        # The index is complete once tracing stops, while the log file stays open
+        with LogIndex(self.output) as index:
+            self.assertEqual(len(index), 8)
+            walks = index.invocations('tests.test_log_index.Tree.walk')
+            self.assertEqual(len(walks), 4)
+            self.assertEqual(len(index.invocations('tests.test_log_index.Tree.leaf')), 3)
+
+            second = index.nth('tests.test_log_index.Tree.walk', 1)
+            text = index.text(second.number)
+            lines = text.splitlines()
+            self.assertIn('run tests.test_log_index.Tree.walk', lines[0])
+            self.assertIn('end tests.test_log_index.Tree.walk', lines[-1])
+            self.assertEqual(sum('run ' in line for line in lines), 5)
+            self.assertEqual(sum('end ' in line for line in lines), 5)
+
+            subtree = index.subtree(second.number)
+            self.assertEqual([call.number for call in subtree], list(range(second.number, 8)))
+            children = index.children(second.number)
+            self.assertEqual(
+                [call.name for call in children],
+                ['tests.test_log_index.Tree.leaf', 'tests.test_log_index.Tree.walk'],
+            )
+            self.assertTrue(all(child.parent == second.number for child in children))
+            self.assertTrue(all(child.depth == second.depth + 1 for child in children))
+
+            leaf = children[0]
+            self.assertEqual(index.call_at(leaf.start + 1), leaf)
+            self.assertEqual(index.call_at(leaf.end + 1), leaf)
+            self.assertEqual(index.call_at(leaf.start - 1), second)
+            self.assertIsNone(index.call_at(0))
+            self.assertEqual(index.nth('tests.test_log_index.Tree.walk', -1).number, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
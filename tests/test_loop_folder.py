@@ -0,0 +1,147 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.events import EventType, EventRecord
+from objwatch.loop_folder import LoopFolder
+from objwatch.tracer import Tracer
+
+
+def record(event_type, name, depth, lineno=1, old=None, new=None):
+    return EventRecord(0, 0, event_type, lineno, depth, name, old, new, None)
+
+
+def call(name, depth, body=(), lineno=1):
+    return [record(EventType.RUN, name, depth, lineno), *body, record(EventType.END, name, depth, lineno)]
+
+
+def increment(depth, value):
+    return call('Counter.increment', depth, [record(EventType.UPD, 'Counter.value', depth + 1, 5, value - 1, value)])
+
+
+def summary(records):
+    return [
+        (r.event_type.label, r.name, r.call_depth, r.new if r.event_type in (EventType.UPD, EventType.FLD) else None)
+        for r in records
+    ]
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def increment(self):
+        self.value += 1
+        return self.value
+
+    def run(self, n):
+        for _ in range(n):
+            self.increment()
+        return self.value
+
+
+class TestLoopFolder(unittest.TestCase):
+    def fold(self, records, window=1000):
+        written = []
+        folder = LoopFolder(written.append, window)
+        for r in records:
+            folder.emit(r)
+        folder.flush()
+        return written
+
+    def test_fold_repeated_calls(self):
+        records = call('main', 0, [r for value in range(1, 101) for r in increment(1, value)])
+        written = self.fold(records)
+        self.assertEqual(
+            summary(written),
+            [
+                ('run', 'main', 0, None),
+                ('run', 'Counter.increment', 1, None),
+                ('upd', 'Counter.value', 2, 1),
+                ('end', 'Counter.increment', 1, None),
+                ('fld', 'Counter.increment', 1, 98),
+                ('run', 'Counter.increment', 1, None),
+                ('upd', 'Counter.value', 2, 100),
+                ('end', 'Counter.increment', 1, None),
+                ('end', 'main', 0, None),
+            ],
+        )
+        self.assertEqual(written[4].log_line(False), "    1   fld Counter.increment x98 folded")
+
+    def test_different_shapes_are_kept(self):
+        records = increment(0, 1) + increment(0, 2) + call('Counter.reset', 0) + increment(0, 3)
+        self.assertEqual(summary(self.fold(records)), summary(records))
+
+    def test_fold_nested_loops(self):
+        epoch = lambda: call('train', 1, [r for value in range(1, 11) for r in increment(2, value)])  # noqa: E731
+        records = call('main', 0, [r for _ in range(5) for r in epoch()])
+        written = self.fold(records)
+        folds = [(r.call_depth, r.new) for r in written if r.event_type is EventType.FLD]
+        # Each written epoch folds its increments, the epochs in between are folded as a whole
+        self.assertEqual(folds, [(2, 8), (1, 3), (2, 8)])
+        self.assertEqual(len(written), 2 + 2 * (1 + 3 + 1 + 3 + 1) + 1)
+
+    def test_window_bounds_collected_events(self):
+        written = []
+        folder = LoopFolder(written.append, window=10)
+        folder.emit(record(EventType.RUN, 'main', 0))
+        for name in ('load', 'parse', 'check'):
+            for r in call(name, 1, [record(EventType.UPD, 'Counter.value', 2, 5, 0, 1)] * 3):
+                folder.emit(r)
+        # main outgrew the window, so it is written out while running instead of collected
+        self.assertEqual(len(written), 11)
+        self.assertEqual(written[0].name, 'main')
+        for value in range(1, 5):
+            for r in increment(1, value):
+                folder.emit(r)
+        folder.emit(record(EventType.END, 'main', 0))
+        folder.flush()
+        # Calls inside it are still folded
+        self.assertEqual([r.new for r in written if r.event_type is EventType.FLD], [2])
+        self.assertEqual(len(written), 1 + 3 * 5 + 3 + 1 + 3 + 1)
+        self.assertEqual(written[-1].event_type, EventType.END)
+
+    def test_flush_open_calls(self):
+        written = []
+        folder = LoopFolder(written.append)
+        records = call('main', 0, increment(1, 1) + increment(1, 2) + increment(1, 3))[:-1]
+        for r in records:
+            folder.emit(r)
+        self.assertEqual(written, [])
+        folder.flush()
+        fold = record(EventType.FLD, 'Counter.increment', 1, new=1)
+        self.assertEqual(summary(written), summary(records[:4] + [fold] + records[-3:]))
+
+
+class TestLoopFolding(unittest.TestCase):
+    def test_fold_traced_loop(self):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_loop_folder.py'], fold_loops=True))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                Counter().run(1000)
+            finally:
+                tracer.stop()
+        events = [line for line in logs.output if 'Counter.' in line]
+        self.assertLess(len(events), 20)
+        self.assertTrue(any('fld tests.test_loop_folder.Counter.increment x998 folded' in line for line in events))
+        self.assertTrue(any('upd Counter.value 999 -> 1000' in line for line in events))
+
+    def test_index_of_uninitialized_framework(self):
+        config = ObjWatchConfig(targets=['tests/test_loop_folder.py'], fold_loops=True, framework='multiprocessing')
+        tracer = Tracer(config)
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                Counter().run(10)
+            finally:
+                tracer.stop()
+        events = [line.split(':', 2)[-1] for line in logs.output if 'Counter.' in line]
+        self.assertTrue(any('folded' in line for line in events))
+        # The index of the process is unknown in the main process, as for the lines of the tracer
+        self.assertFalse([line for line in events if line.startswith('[#')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import gc
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.object_state import ObjectStates
+
+
+class Node:
+    pass
+
+
+class SlottedNode:
+    __slots__ = ('__dict__',)
+
+    def __init__(self):
+        self.value = 0
+
+    def bump(self):
+        self.value += 1
+        return self.value
+
+
+class TestObjectStates(unittest.TestCase):
+    def test_weakly_referenced(self):
+        states = ObjectStates()
+        node = Node()
+        self.assertIsNone(states.get(node))
+        state = states.add(node)
+        self.assertIs(states.get(node), state)
+        self.assertIsNone(states.get(Node()))
+        del node
+        gc.collect()
+        self.assertEqual(len(states), 0)
+
+    def test_unreferenceable(self):
+        states = ObjectStates(max_unreferenceable=2)
+        nodes = [SlottedNode() for _ in range(3)]
+        for node in nodes:
+            states.add(node)
+        # The oldest state is dropped
+        self.assertIsNone(states.get(nodes[0]))
+        self.assertIsNotNone(states.get(nodes[1]))
+        self.assertIsNotNone(states.get(nodes[2]))
+        self.assertEqual(len(states), 2)
+
+
+class TestObjectTracking(unittest.TestCase):
+    def test_unreferenceable_objects_are_tracked(self):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_object_state.py']))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                SlottedNode().bump()
+            finally:
+                tracer.stop()
+        updates = [line.split(':', 2)[-1].strip() for line in logs.output if ' upd ' in line]
+        self.assertTrue(any(line.endswith('upd SlottedNode.value 0 -> 1') for line in updates))
+
+
+if __name__ == '__main__':
+    unittest.main()
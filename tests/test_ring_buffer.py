@@ -0,0 +1,78 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import tempfile
+import unittest
+import importlib.util
+from objwatch import ObjWatch
+from objwatch.utils.ring_buffer import RingBuffer
+
+
+def load_ring_reader():
+    spec = importlib.util.spec_from_file_location('ring_reader', 'tools/ring_reader/ring_reader.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def increment(self):
+        self.value += 1
+
+
+class TestRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'objwatch.ring')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_wrap_around_and_drop(self):
+        writer = RingBuffer.create(self.path, capacity=32)
+        reader = RingBuffer.attach(self.path)
+
+        self.assertTrue(writer.write(b'a' * 10))
+        self.assertTrue(writer.write(b'b' * 10))
+        # Full until the reader catches up
+        self.assertFalse(writer.write(b'c' * 10))
+        self.assertEqual(writer.dropped, 1)
+        self.assertEqual(list(reader.read()), [b'a' * 10, b'b' * 10])
+
+        # Does not fit into the rest of the lap and starts the next one
+        self.assertTrue(writer.write(b'd' * 10))
+        self.assertTrue(writer.write(b'e' * 10))
+        self.assertEqual(list(reader.read()), [b'd' * 10, b'e' * 10])
+        self.assertFalse(reader.closed)
+
+        writer.close(mark_closed=True)
+        self.assertTrue(reader.closed)
+        reader.close()
+
+    def test_drain_traced_events(self):
+        obj_watch = ObjWatch(['tests/test_ring_buffer.py'], ring_buffer=self.path, ring_buffer_size=4096)
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            obj_watch.start()
+            try:
+                counter = Counter()
+                counter.increment()
+            finally:
+                obj_watch.stop()
+        # The traced process does not log the events itself
+        self.assertFalse([record for record in logs.records if record.levelname == 'DEBUG'])
+
+        output = os.path.join(self.tmp_dir.name, 'drained.objwatch')
+        count = load_ring_reader().RingReader(self.path).drain(output)
+        with open(output, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(count, len(lines))
+        self.assertEqual(lines[0].split()[1:], ['run', 'tests.test_ring_buffer.Counter.__init__'])
+        self.assertIn('run tests.test_ring_buffer.Counter.increment', '\n'.join(lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
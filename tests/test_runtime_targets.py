@@ -0,0 +1,141 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import sys
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.targets import merge_targets, subtract_targets
+from tests.utils import example_module
+
+MODULE = 'tests.utils.example_module'
+
+
+def current_frame():
+    return sys._getframe()
+
+
+def running(change):
+    change()
+    return 1
+
+
+class TestTargetMerging(unittest.TestCase):
+    def test_merge_keeps_track_all(self):
+        targets = {MODULE: {'classes': {'A': {'methods': [], 'attributes': [], 'track_all': True}}}}
+        update = {
+            MODULE: {
+                'classes': {'A': {'methods': ['run'], 'attributes': [], 'track_all': False}},
+                'functions': ['f'],
+                'globals': [],
+            }
+        }
+        self.assertEqual(merge_targets(targets, update), {MODULE})
+        self.assertTrue(targets[MODULE]['classes']['A']['track_all'])
+        self.assertEqual(targets[MODULE]['classes']['A']['methods'], ['run'])
+        self.assertEqual(targets[MODULE]['functions'], ['f'])
+
+    def test_subtract_drops_empty(self):
+        targets = {
+            MODULE: {
+                'classes': {'A': {'methods': ['run', 'stop'], 'attributes': [], 'track_all': False}},
+                'functions': ['f'],
+                'globals': [],
+            }
+        }
+        removal = {MODULE: {'classes': {'A': {'methods': ['run'], 'attributes': []}}, 'functions': ['f']}}
+        self.assertEqual(subtract_targets(targets, removal), {MODULE})
+        self.assertEqual(targets[MODULE]['classes']['A']['methods'], ['stop'])
+        removal = {MODULE: {'classes': {'A': {'methods': ['stop'], 'attributes': []}}}}
+        subtract_targets(targets, removal)
+        self.assertEqual(targets, {})
+        self.assertEqual(subtract_targets(targets, removal), set())
+
+
+class TestRuntimeTargets(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer(ObjWatchConfig(targets=[f'{MODULE}:SampleClass.increment()']))
+
+    def test_add_and_remove(self):
+        tracer = self.tracer
+        self.assertTrue(tracer._should_trace_method(MODULE, 'SampleClass', 'increment'))
+        self.assertFalse(tracer._should_trace_method(MODULE, 'SampleClass', 'decrement'))
+        self.assertFalse(tracer._should_trace_function(MODULE, 'test_func'))
+        self.assertFalse(tracer._filename_endswith('/src/tests/utils/example_module.py'))
+        tracer._should_trace_function('other.module', 'test_func')
+
+        tracer.add_targets([f'{MODULE}:SampleClass.decrement()', f'{MODULE}:test_func()'])
+        self.assertTrue(tracer._should_trace_method(MODULE, 'SampleClass', 'decrement'))
+        self.assertTrue(tracer._should_trace_function(MODULE, 'test_func'))
+        # Entries of other modules are kept
+        self.assertIn(('other.module', 'test_func'), tracer.check_caches['_should_trace_function'])
+
+        tracer.remove_targets([f'{MODULE}:SampleClass.increment()'])
+        self.assertFalse(tracer._should_trace_method(MODULE, 'SampleClass', 'increment'))
+        self.assertTrue(tracer._should_trace_method(MODULE, 'SampleClass', 'decrement'))
+
+        tracer.add_targets(['utils/example_module.py'])
+        self.assertTrue(tracer._filename_endswith('/src/tests/utils/example_module.py'))
+        tracer.remove_targets(['utils/example_module.py'])
+        self.assertFalse(tracer._filename_endswith('/src/tests/utils/example_module.py'))
+
+    def test_exclude(self):
+        tracer = self.tracer
+        tracer.add_targets([f'{MODULE}:SampleClass'], exclude_targets=[f'{MODULE}:SampleClass.decrement()'])
+        self.assertTrue(tracer._should_trace_method(MODULE, 'SampleClass', 'increment'))
+        self.assertFalse(tracer._should_trace_method(MODULE, 'SampleClass', 'decrement'))
+        tracer.remove_targets([], exclude_targets=[f'{MODULE}:SampleClass.decrement()'])
+        self.assertTrue(tracer._should_trace_method(MODULE, 'SampleClass', 'decrement'))
+
+    def test_function_info(self):
+        tracer = self.tracer
+        frame = current_frame()
+        func_info = tracer._get_function_info(frame)
+        self.assertEqual(func_info.qualified_name, f'{__name__}.current_frame')
+        self.assertIsNone(func_info.symbol_type)
+        # The information is shared by the events of the function until the targets change
+        self.assertIs(tracer._get_function_info(frame), func_info)
+        tracer.add_targets([f'{__name__}:current_frame()'])
+        self.assertEqual(tracer._get_function_info(frame).symbol_type, 'function')
+
+    def test_while_tracing(self):
+        tracer = self.tracer
+        sample = example_module.SampleClass(0)
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                sample.decrement()
+                example_module.test_func()
+                tracer.add_targets([f'{MODULE}:SampleClass.decrement()', f'{MODULE}:test_func()'])
+                sample.decrement()
+                example_module.test_func()
+                tracer.remove_targets([f'{MODULE}:test_func()'])
+                example_module.test_func()
+            finally:
+                tracer.stop()
+        runs = [line.split(':', 2)[-1].strip() for line in logs.output if ' run ' in line]
+        self.assertEqual(
+            [line.split(' run ')[-1] for line in runs],
+            [f'{MODULE}.SampleClass.decrement', f'{MODULE}.test_func'],
+        )
+
+    def test_change_while_running(self):
+        tracer = self.tracer
+        target = f'{__name__}:running()'
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                # The call event of the frame was not traced, its return is not either
+                running(lambda: tracer.add_targets([target]))
+                self.assertEqual(tracer.call_depth, 0)
+                # The call event of the frame was traced, its return is too
+                running(lambda: tracer.remove_targets([target]))
+                self.assertEqual(tracer.call_depth, 0)
+            finally:
+                tracer.stop()
+        events = [line.split()[2:4] for line in logs.output if ' run ' in line or ' end ' in line]
+        self.assertEqual(events, [['run', f'{__name__}.running'], ['end', f'{__name__}.running']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import tempfile
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.profiler import StageProfiler
+from objwatch.wrappers import BaseWrapper
+
+
+class Account:
+    def __init__(self):
+        self.balance = 0
+        self.entries = []
+
+    def deposit(self, amount):
+        self.balance += amount
+        self.entries.append(amount)
+        return self.balance
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_instrument(self):
+        profiler = StageProfiler()
+        account = Account()
+        profiler.instrument(account, 'deposit', 'changes')
+        # Instrumenting again replaces the timed method instead of timing it twice
+        profiler.instrument(account, 'deposit', 'changes')
+        account.deposit(5)
+        report = profiler.report()
+        self.assertEqual(list(report), ['changes'])
+        self.assertEqual(report['changes']['count'], 1)
+        self.assertEqual(report['changes']['share'], 0.0)
+
+
+class TestSelfProfile(unittest.TestCase):
+    def trace(self, **kwargs):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_self_profile.py'], **kwargs))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                account = Account()
+                for amount in range(3):
+                    account.deposit(amount)
+            finally:
+                profile = tracer.stop()
+        return profile, logs.output
+
+    def test_breakdown(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profile, output = self.trace(
+                self_profile=True, wrapper=BaseWrapper, output_json=os.path.join(directory, 'trace.json')
+            )
+        self.assertEqual(profile['event:run']['count'], 4)
+        self.assertEqual(profile['event:end']['count'], 4)
+        self.assertEqual(profile['event:apd']['count'], 3)
+        self.assertGreaterEqual(profile['targets']['count'], profile['trace:call']['count'])
+        for stage in ('changes', 'format', 'wrapper', 'log', 'json'):
+            self.assertGreater(profile[stage]['total_ms'], 0, stage)
+        self.assertLess(profile['json']['share'], 1.0)
+        self.assertTrue(any('ObjWatch self-profile' in line for line in output))
+
+    def test_disabled(self):
+        profile, output = self.trace()
+        self.assertIsNone(profile)
+        self.assertFalse(any('ObjWatch self-profile' in line for line in output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import gc
+import weakref
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.event_handls import EventHandls
+from objwatch.snapshots import FormattedValue, Snapshot
+from objwatch.wrappers import CPUMemoryWrapper
+
+
+class Blob:
+    pass
+
+
+class Holder:
+    def __init__(self):
+        self.blob = Blob()
+        self.items = [1, 2]
+
+    def replace(self, refs):
+        refs.append(weakref.ref(self.blob))
+        self.blob = Blob()
+        self.items = None
+        gc.collect()
+        return refs[0]() is None
+
+
+def replace_local(refs):
+    blob = Blob()
+    refs.append(weakref.ref(blob))
+    blob = None
+    gc.collect()
+    return refs[0]() is None
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_kept_values(self):
+        snapshot = Snapshot(3, EventHandls._format_value)
+        self.assertEqual(snapshot.old_value(), 3)
+        self.assertTrue(snapshot.is_value(3))
+        self.assertIsNone(snapshot.text)
+
+    def test_formatted_values(self):
+        items = [1, 2, 3, 4]
+        snapshot = Snapshot(items, EventHandls._format_value)
+        self.assertIsNone(snapshot.value)
+        self.assertTrue(snapshot.is_value(items))
+        self.assertFalse(snapshot.is_value(list(items)))
+        old_value = snapshot.old_value()
+        self.assertIsInstance(old_value, FormattedValue)
+        # The preformatted text is logged as it is
+        self.assertEqual(EventHandls._format_value(old_value), "(list)[1, 2, 3, '... (1 more elements)']")
+
+    def test_weak_reference(self):
+        blob = Blob()
+        snapshot = Snapshot(blob, EventHandls._format_value)
+        ref = weakref.ref(blob)
+        del blob
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(snapshot.old_value(), '(type)Blob')
+
+
+class TestSnapshotTracking(unittest.TestCase):
+    def test_replaced_values_are_freed(self):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_snapshots.py'], with_locals=True))
+        holder = Holder()
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                attribute_freed = holder.replace([])
+                local_freed = replace_local([])
+            finally:
+                tracer.stop()
+        self.assertTrue(attribute_freed)
+        self.assertTrue(local_freed)
+
+        updates = [line.split(':', 2)[-1].strip() for line in logs.output if ' upd ' in line]
+        self.assertTrue(any(line.endswith('upd Holder.blob (type)Blob -> (type)Blob') for line in updates))
+        self.assertTrue(any(line.endswith('upd Holder.items (list)[1, 2] -> None') for line in updates))
+        self.assertTrue(any(line.endswith('upd _.blob (type)Blob -> None') for line in updates))
+
+    def test_wrapper_without_base_init(self):
+        # CPUMemoryWrapper does not call ABCWrapper.__init__, snapshots must still be formatted through it
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_snapshots.py'], wrapper=CPUMemoryWrapper))
+        holder = Holder()
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                holder.replace([])
+            finally:
+                tracer.stop()
+
+        updates = [line.split(':', 2)[-1].strip() for line in logs.output if ' upd ' in line]
+        self.assertTrue(any('upd Holder.items' in line and 'percent:' in line for line in updates))
+
+
+if __name__ == '__main__':
+    unittest.main()
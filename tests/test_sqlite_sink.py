@@ -0,0 +1,114 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from objwatch import ObjWatch
+from objwatch.trace_query import TraceQuery
+
+
+class Optimizer:
+    def __init__(self):
+        self.lr = 1.0
+        self.steps = []
+
+    def step(self):
+        self.steps.append(self.lr)
+        self.lr = self.lr / 2
+        return self.lr
+
+    def run(self, n):
+        for _ in range(n):
+            self.step()
+        return self.lr
+
+
+class TestSQLiteSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.tmp_dir.name, 'trace.db')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @patch('objwatch.utils.logger.get_logger')
+    def test_store_and_query(self, mock_logger):
+        mock_logger.return_value = unittest.mock.Mock()
+        obj_watch = ObjWatch(['tests/test_sqlite_sink.py'], output_sqlite=self.database)
+        obj_watch.start()
+        try:
+            Optimizer().run(4)
+        finally:
+            obj_watch.stop()
+
+        with TraceQuery(self.database) as trace:
+            steps = trace.calls('tests.test_sqlite_sink.Optimizer.step')
+            self.assertEqual(len(steps), 4)
+            run = trace.calls('tests.test_sqlite_sink.Optimizer.run')[0]
+            self.assertTrue(all(step['parent_id'] == run['id'] for step in steps))
+            self.assertTrue(all(step['end_seq'] > step['start_seq'] for step in steps))
+
+            updates = trace.updates('Optimizer.lr')
+            self.assertEqual([update['new'] for update in updates], ['1.0', '0.5', '0.25', '0.125', '0.0625'])
+            between = trace.updates('Optimizer.lr', between=(steps[1]['id'], steps[2]['id']))
+            self.assertEqual([update['new'] for update in between], ['0.25', '0.125'])
+            self.assertEqual(trace.updates('Optimizer.lr', rank=1), [])
+
+            changes = trace.collection_changes('Optimizer.steps')
+            self.assertEqual([change['new_len'] for change in changes], [1, 2, 3, 4])
+            self.assertTrue(all(change['kind'] == 'apd' for change in changes))
+
+            indexes = trace.sql("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'updates'")
+            self.assertIn({'name': 'idx_updates_name'}, indexes)
+            plan = trace.sql("EXPLAIN QUERY PLAN SELECT * FROM updates WHERE name = ? ORDER BY seq", ['Optimizer.lr'])
+            self.assertIn('idx_updates_name', plan[0]['detail'])
+
+    @patch('objwatch.utils.logger.get_logger')
+    def test_query_while_tracing(self, mock_logger):
+        mock_logger.return_value = unittest.mock.Mock()
+        obj_watch = ObjWatch(['tests/test_sqlite_sink.py'], output_sqlite=self.database)
+        obj_watch.start()
+        try:
+            Optimizer().run(2)
+            obj_watch.flush()
+            trace = TraceQuery(self.database)
+            # Opening the database does not write to it, the traced process keeps writing
+            self.assertFalse(trace.has_indexes())
+            self.assertEqual(len(trace.calls('tests.test_sqlite_sink.Optimizer.step')), 2)
+            with self.assertRaises(sqlite3.OperationalError):
+                trace.sql('CREATE INDEX idx_test ON calls (line)')
+            Optimizer().run(3)
+        finally:
+            obj_watch.stop()
+        try:
+            self.assertEqual(len(trace.calls('tests.test_sqlite_sink.Optimizer.step')), 5)
+        finally:
+            trace.close()
+
+        with TraceQuery(self.database) as trace:
+            self.assertTrue(trace.has_indexes())
+
+    def test_build_missing_indexes(self):
+        obj_watch = ObjWatch(['tests/test_sqlite_sink.py'], output_sqlite=self.database)
+        obj_watch.start()
+        try:
+            Optimizer().run(2)
+        finally:
+            obj_watch.stop()
+        # As if tracing did not stop cleanly
+        connection = sqlite3.connect(self.database)
+        connection.execute('DROP INDEX idx_updates_name')
+        connection.close()
+
+        with TraceQuery(self.database) as trace:
+            self.assertFalse(trace.has_indexes())
+        with TraceQuery(self.database, build_indexes=True) as trace:
+            self.assertTrue(trace.has_indexes())
+            self.assertEqual(len(trace.updates('Optimizer.lr')), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
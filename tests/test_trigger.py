@@ -0,0 +1,108 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import sys
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.trigger import Trigger, TraceWindow
+
+
+class Loop:
+    def __init__(self):
+        self.step = 0
+
+    def inner(self, i):
+        return i * 2
+
+    def iterate(self, i):
+        self.step = i
+        return self.inner(i)
+
+
+def run(n):
+    loop = Loop()
+    for i in range(n):
+        loop.iterate(i)
+    return loop.step
+
+
+class TestTrigger(unittest.TestCase):
+    def trace(self, trigger):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_trigger.py'], trigger=trigger))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                self.assertEqual(run(100), 99)
+                armed = sys.gettrace()
+            finally:
+                tracer.stop()
+        return tracer, armed, [line.split(':', 2)[-1].strip() for line in logs.output]
+
+    def test_nth_call(self):
+        tracer, armed, lines = self.trace(Trigger('tests.test_trigger.Loop.iterate', nth_call=50, max_calls=4))
+        runs = [line for line in lines if ' run ' in line]
+        self.assertEqual(len(runs), 4)
+        self.assertTrue(any(line.endswith('upd Loop.step 48 -> 49') for line in lines))
+        self.assertIn('Trace window closed.', lines)
+        # Tracing stopped once the window was over
+        self.assertIsNone(armed)
+        self.assertEqual(tracer.trigger_calls, 50)
+
+    def test_resume_after_window(self):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_trigger.py'], trigger=Trigger(run, nth_call=2, max_calls=3)))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                run(10)
+                run(10)
+                self.assertFalse(tracer.is_tracing)
+                self.assertIsNone(sys.gettrace())
+                tracer.resume()
+                self.assertTrue(tracer.is_tracing)
+                for _ in range(3):
+                    run(10)
+                # Nothing but the trigger function is looked at once the trigger is armed again
+                self.assertEqual(tracer.elided_calls, {})
+            finally:
+                tracer.stop()
+        runs = [line for line in logs.output if ' run ' in line]
+        self.assertEqual(len(runs), 6)
+        self.assertEqual(logs.output.count('INFO:objwatch:Trigger fired at call 2 of ' + str(tracer.config.trigger) + '.'), 2)
+
+    def test_predicate(self):
+        trigger = Trigger(Loop.iterate, predicate=lambda args: args['i'] == 90)
+        tracer, armed, lines = self.trace(trigger)
+        runs = [line for line in lines if ' run ' in line]
+        # Without a window bound, tracing goes on until stopped
+        self.assertEqual(len(runs), 20)
+        self.assertIsNotNone(armed)
+        self.assertEqual(tracer.trigger_calls, 91)
+
+    def test_attribute(self):
+        trigger = Trigger(Loop.iterate, attribute='step', value=70, max_calls=2)
+        _, _, lines = self.trace(trigger)
+        self.assertTrue(any(line.startswith('Trigger fired at call 72') for line in lines))
+        self.assertEqual(len([line for line in lines if ' run ' in line]), 2)
+
+    def test_not_fired(self):
+        _, armed, lines = self.trace(Trigger('tests.test_trigger.Loop.iterate', nth_call=1000))
+        self.assertFalse(any(' run ' in line for line in lines))
+        self.assertIsNotNone(armed)
+
+    def test_window(self):
+        window = TraceWindow(max_calls=2)
+        self.assertEqual([window.admit() for _ in range(4)], [True, True, False, False])
+        self.assertTrue(TraceWindow(max_seconds=60).admit())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Trigger('run', nth_call=0)
+        with self.assertRaises(ValueError):
+            Trigger('run', attribute='step')
+        with self.assertRaises(ValueError):
+            Trigger(len)
+
+
+if __name__ == '__main__':
+    unittest.main()
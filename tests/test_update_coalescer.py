@@ -0,0 +1,110 @@
+# MIT License
+# Copyright (c) 2025 aeeeeeep
+
+import os
+import json
+import tempfile
+import unittest
+from objwatch.config import ObjWatchConfig
+from objwatch.tracer import Tracer
+from objwatch.update_coalescer import UpdateCoalescer, format_summary
+
+
+class Accumulator:
+    def __init__(self):
+        self.total = 0
+        self.name = 'acc'
+
+    def run(self, n):
+        for i in range(n):
+            self.total += i
+            self.name = f'acc{i}'
+        return self.total
+
+    def twice(self):
+        self.run(3)
+        self.run(3)
+        return self.total
+
+
+class TestUpdateCoalescer(unittest.TestCase):
+    def test_coalesce_within_call(self):
+        written = []
+        coalescer = UpdateCoalescer(lambda depth, summary: written.append((depth, summary)), buffer_size=100)
+        for i in range(10):
+            coalescer.add(2, 5, 'A', 'x', str(i), str(i + 1), '', i, i + 1)
+            coalescer.add(2, 6, 'A', 'label', f"'{i}'", f"'{i + 1}'", '', str(i), str(i + 1))
+        coalescer.add(1, 9, 'A', 'x', '0', '3', '', 0, 3)
+        self.assertEqual(written, [])
+
+        coalescer.flush(2)
+        self.assertEqual(
+            [(depth, s.key, s.old, s.new, s.lineno, s.summary()) for depth, s in written],
+            [
+                (2, 'x', '0', '10', 5, 'x10, min 0, max 10'),
+                (2, 'label', "'0'", "'10'", 6, 'x10'),
+            ],
+        )
+        coalescer.flush()
+        self.assertEqual(written[-1][1].summary(), None)
+        self.assertEqual(coalescer.frames, {})
+
+    def test_buffer_size(self):
+        written = []
+        coalescer = UpdateCoalescer(lambda depth, summary: written.append(summary), buffer_size=4)
+        for i in range(10):
+            coalescer.add(1, 5, 'A', 'x', str(i), str(i + 1), '', i, i + 1)
+        self.assertEqual([s.count for s in written], [4, 4])
+        self.assertEqual(written[1].old, '4')
+        coalescer.flush()
+        self.assertEqual([s.count for s in written], [4, 4, 2])
+
+    def test_format_summary(self):
+        self.assertEqual(format_summary(3), 'x3')
+        self.assertEqual(format_summary(3, 0.5, 2), 'x3, min 0.5, max 2')
+
+
+class TestUpdateCoalescing(unittest.TestCase):
+    def test_coalesce_traced_loop(self):
+        tracer = Tracer(ObjWatchConfig(targets=['tests/test_update_coalescer.py'], coalesce_updates=True))
+        with self.assertLogs('objwatch', level='DEBUG') as logs:
+            tracer.start()
+            try:
+                Accumulator().twice()
+            finally:
+                tracer.stop()
+        events = [line.split(':', 2)[-1] for line in logs.output if 'Accumulator.' in line]
+        updates = [line.strip() for line in events if ' upd ' in line]
+        self.assertTrue(any(line.endswith('upd Accumulator.total 0 -> 3 (x2, min 0, max 3)') for line in updates))
+        self.assertTrue(any(line.endswith('upd Accumulator.total 3 -> 6 (x2, min 3, max 6)') for line in updates))
+        self.assertTrue(any(line.endswith('upd Accumulator.name acc -> acc2 (x3)') for line in updates))
+        # Summaries are written before the end of their call, the run/end structure is unchanged
+        self.assertEqual(sum(' run ' in line for line in events), 4)
+        self.assertEqual(sum(' end ' in line for line in events), 4)
+        ends = [i for i, line in enumerate(events) if 'end tests.test_update_coalescer.Accumulator.run' in line]
+        self.assertIn('upd Accumulator.name', events[ends[0] - 2])
+        self.assertIn('upd Accumulator.total', events[ends[0] - 1])
+
+    def test_coalesced_json(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_json = os.path.join(tmp_dir, 'trace.json')
+            config = ObjWatchConfig(
+                targets=['tests/test_update_coalescer.py'], output_json=output_json, coalesce_updates=True
+            )
+            tracer = Tracer(config)
+            with self.assertLogs('objwatch', level='DEBUG'):
+                tracer.start()
+                try:
+                    Accumulator().run(5)
+                finally:
+                    tracer.stop()
+            with open(output_json, 'r', encoding='utf-8') as f:
+                events = json.load(f)['ObjWatch']['events']
+        run = [event for event in events if event.get('qualified_name', '').endswith('Accumulator.run')][0]
+        total = [event for event in run['events'] if event['name'] == 'Accumulator.total'][0]
+        self.assertEqual((total['old'], total['new'], total['count']), ('0', '10', 4))
+        self.assertEqual((total['min'], total['max']), (0, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
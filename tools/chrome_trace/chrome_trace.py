@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chrome Trace Exporter for ObjWatch
+
+This script converts ObjWatch JSON output files to the Chrome Trace Event format,
+which can be opened in timeline viewers such as Perfetto or chrome://tracing.
+"""
+
+import os
+import argparse
+from typing import List
+
+from objwatch.constants import Constants
+from objwatch.sinks import ChromeTraceSink
+from objwatch.utils.json_stream import TraceReader, clock_offsets
+
+
+class ChromeTraceExporter:
+    """
+    Streams ObjWatch JSON traces into a single Chrome Trace file.
+
+    Every trace is read incrementally and its events are written as they are read, so that
+    traces with millions of events can be exported in bounded memory. The traces must have been
+    recorded with `with_timestamps=True`. Each trace becomes its own process in the timeline,
+    and the clocks of multi-process traces are aligned using their clock references.
+    """
+
+    def __init__(self, paths: List[str], align: bool = True, chunk_size: int = Constants.JSON_STREAM_CHUNK_SIZE):
+        """
+        Initialize the exporter.
+
+        Args:
+            paths (List[str]): Paths to the JSON traces.
+            align (bool): Align the clocks of the traces using their clock references.
+            chunk_size (int): Number of characters read from each trace at a time.
+        """
+        self.paths = paths
+        self.align = align
+        self.chunk_size = chunk_size
+
+    def export(self, output_path: str) -> None:
+        """
+        Export the traces into a Chrome Trace file.
+
+        Args:
+            output_path (str): Path to the Chrome Trace JSON file.
+        """
+        readers = [TraceReader(path, self.chunk_size) for path in self.paths]
+        sink = ChromeTraceSink(output_path, tid=0)
+        count = 0
+        try:
+            for reader in readers:
+                if not (reader.header.get('config') or {}).get('with_timestamps'):
+                    raise ValueError(f"{reader.path} was recorded without timestamps, enable with_timestamps")
+
+            # Traces without a recorded process index are numbered by their position
+            indexes: List[int] = []
+            for position, reader in enumerate(readers):
+                index = (reader.header.get('clock') or {}).get('index')
+                indexes.append(position if index is None else index)
+            offsets = clock_offsets(readers, indexes) if self.align else None
+            if offsets is None:
+                if self.align and len(readers) > 1:
+                    print("Warning: not all traces have a clock reference, exporting without clock alignment.")
+                offsets = [0] * len(readers)
+
+            for reader, index, offset in zip(readers, indexes, offsets):
+                for record in reader.records(index):
+                    sink.emit(record._replace(timestamp=record.timestamp - offset) if offset else record)
+                    count += 1
+        finally:
+            sink.close()
+            for reader in readers:
+                reader.close()
+
+        print(f"Exported {count} events from {len(readers)} traces. Chrome Trace saved to: {output_path}")
+
+
+def main():
+    """
+    Main function to handle command-line arguments and run the exporter.
+    """
+    parser = argparse.ArgumentParser(description='Convert ObjWatch JSON traces to the Chrome Trace Event format')
+    parser.add_argument('json_files', nargs='+', help='Paths to the input JSON traces')
+    parser.add_argument('-o', '--output', help='Path to the Chrome Trace JSON file', default=None)
+    parser.add_argument('--no-align', action='store_true', help='Do not align the clocks of multiple traces')
+    args = parser.parse_args()
+
+    # Determine output path
+    if args.output:
+        output_path = args.output
+    else:
+        # Default output path: replace .json extension of the first trace with .trace.json
+        base_name = os.path.splitext(args.json_files[0])[0]
+        output_path = f"{base_name}.trace.json"
+
+    # Validate input files
+    for json_file in args.json_files:
+        if not os.path.exists(json_file):
+            print(f"Error: JSON file not found: {json_file}")
+            return
+
+    exporter = ChromeTraceExporter(args.json_files, align=not args.no_align)
+    exporter.export(output_path)
+
+
+if __name__ == "__main__":
+    main()
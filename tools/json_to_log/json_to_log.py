@@ -7,9 +7,13 @@ This script converts ObjWatch JSON output files to human-readable log format.
 """
 
 import os
-import json
 import argparse
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from objwatch.constants import Constants
+from objwatch.update_coalescer import format_summary
+from objwatch.utils.json_stream import TraceReader
 
 
 class JSONToLogConverter:
@@ -17,6 +21,15 @@ class JSONToLogConverter:
     Converts ObjWatch JSON files to human-readable log format.
     """
 
+    def __init__(self, chunk_size: int = Constants.JSON_STREAM_CHUNK_SIZE) -> None:
+        """
+        Initialize the converter.
+
+        Args:
+            chunk_size (int): Number of characters read from a JSON file at a time.
+        """
+        self.chunk_size = chunk_size
+
     @staticmethod
     def _generate_prefix(lineno: int, call_depth: int) -> str:
         """
@@ -55,102 +68,172 @@ class JSONToLogConverter:
         return "\n".join(lines)
 
     @staticmethod
-    def _process_events(events: List[Dict[str, Any]], call_depth: int = 0) -> List[str]:
+    def _format_event(kind: str, event: Dict[str, Any], call_depth: int) -> Optional[str]:
         """
-        Process events recursively and generate log lines.
+        Generate the log line of an event.
 
         Args:
-            events (List[Dict[str, Any]]): List of events to process.
-            call_depth (int): Current call depth.
+            kind (str): The event kind yielded by TraceReader.events: 'run', 'end', 'upd', 'apd' or 'pop'.
+            event (Dict[str, Any]): The event fields.
+            call_depth (int): Nesting depth of the event.
 
         Returns:
-            List[str]: List of generated log lines.
-        """
-        log_lines = []
-
-        for event in events:
-            if event['type'] == 'Function':
-                # Handle function run event
-                prefix = JSONToLogConverter._generate_prefix(event['run_line'], call_depth)
-                run_msg = f"{prefix}run {event['qualified_name']}"
-                if 'call_msg' in event:
-                    run_msg += f" <- {event['call_msg']}"
-                log_lines.append(run_msg)
-
-                # Process nested events
-                if 'events' in event and event['events']:
-                    nested_lines = JSONToLogConverter._process_events(event['events'], call_depth + 1)
-                    log_lines.extend(nested_lines)
-
-                # Handle function end event
-                end_prefix = JSONToLogConverter._generate_prefix(event['end_line'] if 'end_line' in event else event['run_line'], call_depth)
-                end_msg = f"{end_prefix}end {event['qualified_name']}"
-                if 'return_msg' in event:
-                    end_msg += f" -> {event['return_msg']}"
-                log_lines.append(end_msg)
-
-            elif event['type'] == 'upd':
-                # Handle update events
-                prefix = JSONToLogConverter._generate_prefix(event['line'], event.get('call_depth', call_depth))
-                log_lines.append(f"{prefix}upd {event['name']} {event['old']} -> {event['new']}")
-
-            elif event['type'] in ['apd', 'pop']:
-                # Handle collection change events
-                prefix = JSONToLogConverter._generate_prefix(event['line'], event.get('call_depth', call_depth))
-                event_type = event['type']
-                # For apd/pop events, format the message based on available data
-                if isinstance(event['old'], dict) and isinstance(event['new'], dict):
-                    old_len = event['old'].get('len', '?')
-                    new_len = event['new'].get('len', '?')
-                    value_type = event['old'].get('type', 'Unknown')
-                    log_lines.append(f"{prefix}{event_type} {event['name']} ({value_type})(len){old_len} -> {new_len}")
-                else:
-                    log_lines.append(f"{prefix}{event_type} {event['name']}")
+            Optional[str]: The log line, or None for unknown event kinds.
+        """
+        if kind == 'run':
+            # Handle function run event
+            prefix = JSONToLogConverter._generate_prefix(event['run_line'], call_depth)
+            run_msg = f"{prefix}run {event['qualified_name']}"
+            if 'call_msg' in event:
+                run_msg += f" <- {event['call_msg']}"
+            return run_msg
+
+        if kind == 'end':
+            # Handle function end event
+            end_prefix = JSONToLogConverter._generate_prefix(event.get('end_line', event['run_line']), call_depth)
+            end_msg = f"{end_prefix}end {event['qualified_name']}"
+            if 'return_msg' in event:
+                end_msg += f" -> {event['return_msg']}"
+            if 'elided_calls' in event:
+                end_msg += f" [{event['elided_calls']} calls elided]"
+            return end_msg
+
+        if kind == 'upd':
+            # Handle update events
+            prefix = JSONToLogConverter._generate_prefix(event['line'], event.get('call_depth', call_depth))
+            upd_msg = f"{prefix}upd {event['name']} {event['old']} -> {event['new']}"
+            if 'count' in event:
+                # Summary of coalesced updates
+                upd_msg += f" ({format_summary(event['count'], event.get('min'), event.get('max'))})"
+            return upd_msg
+
+        if kind in ('apd', 'pop'):
+            # Handle collection change events
+            prefix = JSONToLogConverter._generate_prefix(event['line'], event.get('call_depth', call_depth))
+            # For apd/pop events, format the message based on available data
+            if isinstance(event['old'], dict) and isinstance(event['new'], dict):
+                old_len = event['old'].get('len', '?')
+                new_len = event['new'].get('len', '?')
+                value_type = event['old'].get('type', 'Unknown')
+                return f"{prefix}{kind} {event['name']} ({value_type})(len){old_len} -> {new_len}"
+            return f"{prefix}{kind} {event['name']}"
+
+        return None
 
-        return log_lines
+    @staticmethod
+    def _write_lines(f: Any, lines: List[Any]) -> None:
+        """
+        Write held back log lines, which are nested in lists for the nested functions.
+
+        Args:
+            f (Any): The output file.
+            lines (List[Any]): Log lines and lists of log lines, in output order.
+        """
+        stack = [iter(lines)]
+        while stack:
+            line = next(stack[-1], None)
+            if line is None:
+                stack.pop()
+            elif isinstance(line, list):
+                stack.append(iter(line))
+            else:
+                f.write("\n" + line)
 
-    def convert(self, json_path: str, output_path: str) -> None:
+    def convert(self, json_path: str, output_path: str) -> int:
         """
         Convert JSON file to log format.
 
+        The trace is parsed incrementally and every log line is written as soon as its event
+        is read, so memory use does not grow with the size or the depth of the trace. Traces
+        written by versions storing the call messages after the nested events are the exception:
+        the lines of a function are held back until its call message is read.
+
         Args:
             json_path (str): Path to the input JSON file.
             output_path (str): Path to the output log file.
+
+        Returns:
+            int: Number of written event lines.
         """
-        # Read JSON file
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        objwatch_data = data.get('ObjWatch', {})
-        runtime_info = objwatch_data.get('runtime_info', {})
-        config = objwatch_data.get('config', {})
-        events = objwatch_data.get('events', [])
-
-        # Generate log content
-        log_lines = []
-
-        log_lines.append("=" * 80)
-        log_lines.append("# ObjWatch Log")
-        log_lines.append(f"> Version:        {runtime_info.get('version', 'Unknown')}")
-        log_lines.append(f"> Start Time:     {runtime_info.get('start_time', 'Unknown')}")
-        log_lines.append(f"> System Info:    {runtime_info.get('system_info', 'Unknown')}")
-        log_lines.append(f"> Python Version: {runtime_info.get('python_version', 'Unknown')}")
-        log_lines.append("")
-        # Add config section
-        log_lines.append(self._format_config(config))
-        log_lines.append("")
-        # Skip Targets, Filename Targets, and Exclude Filename Targets sections as requested
-        log_lines.append("=" * 80)
-
-        # Process events
-        event_log_lines = self._process_events(events)
-        log_lines.extend(event_log_lines)
-
-        # Write to log file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(log_lines))
+        count = 0
+        with TraceReader(json_path, self.chunk_size) as reader, open(output_path, 'w', encoding='utf-8') as f:
+            runtime_info = reader.header.get('runtime_info', {})
+            config = reader.header.get('config', {})
+
+            header_lines = []
+            header_lines.append("=" * 80)
+            header_lines.append("# ObjWatch Log")
+            header_lines.append(f"> Version:        {runtime_info.get('version', 'Unknown')}")
+            header_lines.append(f"> Start Time:     {runtime_info.get('start_time', 'Unknown')}")
+            header_lines.append(f"> System Info:    {runtime_info.get('system_info', 'Unknown')}")
+            header_lines.append(f"> Python Version: {runtime_info.get('python_version', 'Unknown')}")
+            header_lines.append("")
+            # Add config section
+            header_lines.append(self._format_config(config))
+            header_lines.append("")
+            # Skip Targets, Filename Targets, and Exclude Filename Targets sections as requested
+            header_lines.append("=" * 80)
+            f.write("\n".join(header_lines))
+
+            # Traces written before call messages preceded the nested events have the call message
+            # of a function after them, the lines of such a function are held back until its end
+            wrapped = config.get('wrapper') is not None
+            held: List[Tuple[Dict[str, Any], List[Any]]] = []
+
+            # Process events one at a time, the reader tracks the nesting with an explicit stack
+            for kind, event, call_depth in reader.events():
+                if kind == 'run' and wrapped and 'call_msg' not in event:
+                    held.append((event, [None]))
+                    continue
+                line = self._format_event(kind, event, call_depth)
+                if line is None:
+                    continue
+                count += 1
+                if kind == 'end' and held and held[-1][0] is event:
+                    lines = held.pop()[1]
+                    lines[0] = self._format_event('run', event, call_depth)
+                    lines.append(line)
+                    count += 1
+                    if held:
+                        held[-1][1].append(lines)
+                    else:
+                        self._write_lines(f, lines)
+                elif held:
+                    held[-1][1].append(line)
+                else:
+                    f.write("\n" + line)
 
         print(f"Conversion completed. Log file saved to: {output_path}")
+        return count
+
+    def convert_many(self, jobs: List[Tuple[str, str]], processes: Optional[int] = None) -> int:
+        """
+        Convert several JSON files, e.g. the per-rank traces of a distributed run, in parallel.
+
+        Args:
+            jobs (List[Tuple[str, str]]): Pairs of input JSON path and output log path.
+            processes (Optional[int]): Number of worker processes, defaults to one per CPU.
+                Files are converted one after another in this process when set to 1.
+
+        Returns:
+            int: Total number of written event lines.
+        """
+        if processes == 1 or len(jobs) == 1:
+            return sum(self.convert(json_path, output_path) for json_path, output_path in jobs)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return sum(executor.map(self._convert_job, jobs))
+
+    def _convert_job(self, job: Tuple[str, str]) -> int:
+        """
+        Convert one pair of input and output paths, in a worker process.
+
+        Args:
+            job (Tuple[str, str]): Input JSON path and output log path.
+
+        Returns:
+            int: Number of written event lines.
+        """
+        return self.convert(*job)
 
 
 def main():
@@ -158,26 +241,37 @@ def main():
     Main function to handle command-line arguments and run the converter.
     """
     parser = argparse.ArgumentParser(description='Convert ObjWatch JSON output to human-readable log format')
-    parser.add_argument('json_file', help='Path to the input JSON file')
-    parser.add_argument('-o', '--output', help='Path to the output log file', default=None)
+    parser.add_argument('json_files', nargs='+', help='Paths to the input JSON files')
+    parser.add_argument('-o', '--output', help='Path to the output log file, for a single input file', default=None)
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None, help='Number of files converted in parallel, defaults to one per CPU'
+    )
     args = parser.parse_args()
 
-    # Determine output path
-    if args.output:
-        output_path = args.output
-    else:
-        # Default output path: replace .json extension with .objwatch
-        base_name = os.path.splitext(args.json_file)[0]
-        output_path = f"{base_name}.objwatch"
-
-    # Validate input file
-    if not os.path.exists(args.json_file):
-        print(f"Error: JSON file not found: {args.json_file}")
+    if args.output and len(args.json_files) > 1:
+        print("Error: --output can only be used with a single JSON file")
         return
 
+    # Validate input files
+    for json_file in args.json_files:
+        if not os.path.exists(json_file):
+            print(f"Error: JSON file not found: {json_file}")
+            return
+
+    # Determine output paths
+    jobs = []
+    for json_file in args.json_files:
+        if args.output:
+            output_path = args.output
+        else:
+            # Default output path: replace .json extension with .objwatch
+            base_name = os.path.splitext(json_file)[0]
+            output_path = f"{base_name}.objwatch"
+        jobs.append((json_file, output_path))
+
     # Create converter and run
     converter = JSONToLogConverter()
-    converter.convert(args.json_file, output_path)
+    converter.convert_many(jobs, processes=args.jobs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Trace Merger for ObjWatch
+
+This script merges the per-process JSON traces of a multi-process run into a single
+time-ordered log, tagging every line with the index of its process.
+"""
+
+import os
+import heapq
+import argparse
+from operator import attrgetter
+from typing import Iterator, List
+
+from objwatch.constants import Constants
+from objwatch.events import EventRecord
+from objwatch.utils.json_stream import TraceReader, clock_offsets
+
+
+class TraceMerger:
+    """
+    Merges per-process ObjWatch JSON traces by timestamp in bounded memory.
+
+    Every trace is read incrementally, and a k-way merge keeps only the next event of each
+    trace in memory. The traces must have been recorded with `with_timestamps=True`. Their
+    clocks are aligned using the time at which each process left the start barrier of
+    `MPHandls.sync()`, which all processes leave at about the same moment.
+    """
+
+    def __init__(self, paths: List[str], align: bool = True, chunk_size: int = Constants.JSON_STREAM_CHUNK_SIZE):
+        """
+        Initialize the merger.
+
+        Args:
+            paths (List[str]): Paths to the per-process JSON traces.
+            align (bool): Align the clocks of the traces using their clock references.
+            chunk_size (int): Number of characters read from each trace at a time.
+        """
+        self.paths = paths
+        self.align = align
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _aligned(records: Iterator[EventRecord], offset: int) -> Iterator[EventRecord]:
+        """
+        Shift the timestamps of records by a clock offset.
+
+        Args:
+            records (Iterator[EventRecord]): Records of one trace.
+            offset (int): Clock offset of the trace in nanoseconds.
+
+        Yields:
+            EventRecord: The records with aligned timestamps.
+        """
+        if not offset:
+            yield from records
+            return
+        for record in records:
+            yield record._replace(timestamp=record.timestamp - offset)
+
+    def merge(self, output_path: str) -> None:
+        """
+        Merge the traces into a single log file.
+
+        Args:
+            output_path (str): Path to the merged log file.
+        """
+        readers = [TraceReader(path, self.chunk_size) for path in self.paths]
+        try:
+            for reader in readers:
+                if not (reader.header.get('config') or {}).get('with_timestamps'):
+                    raise ValueError(f"{reader.path} was recorded without timestamps, enable with_timestamps")
+
+            # Traces without a recorded process index are numbered by their position
+            indexes: List[int] = []
+            for position, reader in enumerate(readers):
+                index = (reader.header.get('clock') or {}).get('index')
+                indexes.append(position if index is None else index)
+            offsets = clock_offsets(readers, indexes) if self.align else None
+            if offsets is None:
+                if self.align:
+                    print("Warning: not all traces have a clock reference, merging without clock alignment.")
+                offsets = [0] * len(readers)
+
+            streams = [
+                self._aligned(reader.records(index), offset) for reader, index, offset in zip(readers, indexes, offsets)
+            ]
+            count = 0
+            with open(output_path, 'w', encoding='utf-8') as f:
+                for record in heapq.merge(*streams, key=attrgetter('timestamp')):
+                    f.write(record.log_line() + '\n')
+                    count += 1
+        finally:
+            for reader in readers:
+                reader.close()
+
+        print(f"Merged {count} events from {len(readers)} traces. Log file saved to: {output_path}")
+
+
+def main():
+    """
+    Main function to handle command-line arguments and run the merger.
+    """
+    parser = argparse.ArgumentParser(description='Merge per-process ObjWatch JSON traces into a time-ordered log')
+    parser.add_argument('json_files', nargs='+', help='Paths to the per-process JSON traces')
+    parser.add_argument('-o', '--output', help='Path to the merged log file', default='merged.objwatch')
+    parser.add_argument('--no-align', action='store_true', help='Do not align the clocks of the traces')
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=Constants.JSON_STREAM_CHUNK_SIZE,
+        help='Number of characters read from each trace at a time',
+    )
+    args = parser.parse_args()
+
+    # Validate input files
+    for json_file in args.json_files:
+        if not os.path.exists(json_file):
+            print(f"Error: JSON file not found: {json_file}")
+            return
+
+    merger = TraceMerger(args.json_files, align=not args.no_align, chunk_size=args.chunk_size)
+    merger.merge(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ring Buffer Reader for ObjWatch
+
+This script drains the events that a traced process writes into a memory-mapped ring buffer
+and saves them as a human-readable log or as JSON lines, in a process of its own.
+"""
+
+import os
+import time
+import json
+import marshal
+import argparse
+from typing import Dict, Any
+
+from objwatch.events import EventRecord
+from objwatch.utils.ring_buffer import RingBuffer
+
+
+class RingReader:
+    """
+    Drains an ObjWatch ring buffer to a file.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.05) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            path (str): Path of the ring buffer file given as `ring_buffer` to ObjWatch.
+            poll_interval (float): Seconds to wait for new events when the ring buffer is empty.
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def _to_json(record: EventRecord) -> str:
+        """
+        Format a record as a JSON line.
+
+        Args:
+            record (EventRecord): The event record.
+
+        Returns:
+            str: The JSON line.
+        """
+        data: Dict[str, Any] = record._asdict()
+        data['event_type'] = record.event_type.label
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+    def drain(self, output_path: str, output_format: str = 'log', with_index: bool = False, follow: bool = True) -> int:
+        """
+        Drain the ring buffer into a file.
+
+        Args:
+            output_path (str): Path to the output file.
+            output_format (str): 'log' for the ObjWatch log format, 'jsonl' for one JSON object per event.
+            with_index (bool): Tag log lines with the process index.
+            follow (bool): Keep draining until the traced process stops tracing, otherwise stop once the
+                ring buffer is empty.
+
+        Returns:
+            int: Number of drained events.
+        """
+        while not os.path.exists(self.path):
+            time.sleep(self.poll_interval)
+        ring = RingBuffer.attach(self.path)
+        count = 0
+        try:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                while True:
+                    # Check before reading, so that events written before closing are still drained
+                    closed = ring.closed
+                    for payload in ring.read():
+                        record = EventRecord.unpack(marshal.loads(payload))
+                        if output_format == 'jsonl':
+                            f.write(self._to_json(record) + '\n')
+                        else:
+                            f.write(record.log_line(with_index) + '\n')
+                        count += 1
+                    if closed or not follow:
+                        break
+                    f.flush()
+                    time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Interrupted, stopped draining.")
+        finally:
+            if ring.dropped:
+                print(f"Warning: {ring.dropped} events were dropped because the ring buffer was full.")
+            ring.close()
+        return count
+
+
+def main():
+    """
+    Main function to handle command-line arguments and run the reader.
+    """
+    parser = argparse.ArgumentParser(description='Drain ObjWatch events from a ring buffer into a file')
+    parser.add_argument('ring_buffer', help='Path of the ring buffer file')
+    parser.add_argument('-o', '--output', help='Path to the output file', default=None)
+    parser.add_argument('-f', '--format', choices=['log', 'jsonl'], default='log', help='Output format')
+    parser.add_argument('--with-index', action='store_true', help='Tag log lines with the process index')
+    parser.add_argument('--once', action='store_true', help='Stop once the ring buffer is empty')
+    args = parser.parse_args()
+
+    # Determine output path
+    if args.output:
+        output_path = args.output
+    else:
+        # Default to the current directory, the ring buffer usually lives on a memory-backed filesystem
+        base_name = os.path.splitext(os.path.basename(args.ring_buffer))[0]
+        output_path = f"{base_name}.objwatch" if args.format == 'log' else f"{base_name}.jsonl"
+
+    reader = RingReader(args.ring_buffer)
+    count = reader.drain(output_path, args.format, with_index=args.with_index, follow=not args.once)
+    print(f"Drained {count} events. Output saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()